@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 29 10:21:44 2026
+
+This script creates annual draw profiles for any target year, or range of
+years. The annual profiles in AnnualProfileSF.csv and AnnualProfileMF.csv are
+fixed to the 2009 calendar used by the CEC: Jan 1 is a Thursday and the
+holidays are those of 2009, including the fixes at the top of DHWDU.txt
+(E.g. July 4 observed on Fri Jul 3). Using them for another year places
+weekend profiles on weekdays and holiday profiles on regular days.
+
+The synthesis works in two vectorized steps:
+    -Synthesize_Day_Codes - Splits the CEC sequence of an annual profile into
+        pools of weekday (D), weekend (E) and holiday (H) day codes, in their
+        original order. Each date in the target years then receives the next
+        code from the pool of its day type, restarting at the beginning of
+        each pool every year and cycling if a year has more days of a type
+        than the CEC year (E.g. leap years). With Years = 2009 this returns
+        the CEC sequence unchanged
+    -Assemble_Annual_Profile - Gathers the draws of every day in one pass and
+        calculates the hot water flows, as in Create_Hot_Profile_NoSDLM in
+        T24_Draw_Profile_Generator.py
+
+Holidays are the California holidays observed in the CEC calendar, calculated
+for any year by Calculate_Holidays. Holidays falling on a Saturday are observed
+on the Friday before, and those falling on a Sunday on the Monday after. Pass
+a list of dates as Holidays to use another calendar (E.g. from the holidays
+package).
+
+The mains water temperature of Feb 29 is that of Feb 28, since the weather
+files have 365 days.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import numpy as np
+import os
+
+import Weather_Data
+import Instrumentation
+import Daily_Profile_Catalog
+from T24_Draw_Profile_Generator import (
+    Calculate_Fraction_HotWater,
+    Calculate_FlowWater_Hot,
+    Temperature_Supply_Hot_AtFixture,
+    Temperature_Bath,
+    Temperature_Shower,
+)
+
+try:
+    root = os.path.dirname(os.path.abspath(__file__))
+except:
+    root = os.getcwd()
+
+# %%--------------------CONSTANTS------------------------
+
+CEC_Year = 2009  # The calendar year of the CEC annual profiles
+Day_Types = [
+    "D",
+    "E",
+    "H",
+]  # Weekday, weekend and holiday, the second character of each day code
+Fixed_Holidays = [(1, 1), (3, 31), (7, 4), (11, 11), (12, 25)]  # (Month, day)
+Floating_Holidays = [
+    (1, 0, 3),  # Martin Luther King Jr. Day, third Monday of January
+    (2, 0, 3),  # Presidents' Day, third Monday of February
+    (5, 0, -1),  # Memorial Day, last Monday of May
+    (9, 0, 1),  # Labor Day, first Monday of September
+    (11, 3, 4),  # Thanksgiving, fourth Thursday of November
+]  # (Month, weekday with Monday = 0, week of the month. -1 is the last)
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def _Nth_Weekday(Years, Month, Weekday, Week):
+    # Returns the dates of the Week'th Weekday of Month in each of Years
+    if Week > 0:
+        First = pd.to_datetime(pd.DataFrame({"year": Years, "month": Month, "day": 1}))
+        return First + pd.to_timedelta(
+            (Weekday - First.dt.weekday) % 7 + 7 * (Week - 1), unit="D"
+        )
+    Last = pd.to_datetime(
+        pd.DataFrame({"year": Years, "month": Month, "day": 1})
+    ) + pd.offsets.MonthEnd(0)
+    return Last - pd.to_timedelta((Last.dt.weekday - Weekday) % 7, unit="D")
+
+
+def Calculate_Holidays(Years):
+    """
+    Returns a sorted DatetimeIndex of the holidays observed in Years, a year
+    or list of years, using the holidays of the CEC calendar.
+    """
+
+    Years = np.atleast_1d(Years)
+    Dates = [
+        pd.to_datetime(pd.DataFrame({"year": Years, "month": Month, "day": Day}))
+        for Month, Day in Fixed_Holidays
+    ]
+    Dates = pd.concat(Dates)
+    Dates = Dates + pd.to_timedelta(
+        np.select([Dates.dt.weekday == 5, Dates.dt.weekday == 6], [-1, 1], 0),
+        unit="D",
+    )  # Observe Saturday holidays on Friday and Sunday holidays on Monday
+
+    Thanksgiving = _Nth_Weekday(Years, 11, 3, 4)
+    Dates = pd.concat(
+        [Dates, Thanksgiving + pd.Timedelta(days=1)]  # The day after Thanksgiving
+        + [
+            _Nth_Weekday(Years, Month, Weekday, Week)
+            for Month, Weekday, Week in Floating_Holidays
+        ]
+    )
+
+    return pd.DatetimeIndex(Dates).sort_values()
+
+
+def Calculate_Day_Types(Dates, Holidays=None):
+    # Returns an array of the day type ('D', 'E' or 'H') of each date. Holidays defaults to Calculate_Holidays
+    Dates = pd.DatetimeIndex(Dates)
+    if Holidays is None:
+        Years = np.unique(Dates.year)
+        Holidays = Calculate_Holidays(
+            np.union1d(Years, Years + 1)
+        )  # New Year's Day on a Saturday is observed on Dec 31 of the year before
+    return np.select(
+        [Dates.normalize().isin(pd.DatetimeIndex(Holidays)), Dates.weekday >= 5],
+        ["H", "E"],
+        "D",
+    )
+
+
+def Annual_Profile_Name(Building_Type, NumberBedrooms_Dwelling, Variant="a"):
+    # Returns the name of the annual profile used in CBECC-Res. E.g. 'DHW3BR', or 'DHW2BRb' in multi-family buildings
+    Name = "DHW" + str(NumberBedrooms_Dwelling) + "BR"
+    return Name + str(Variant) if Building_Type == "Multi" else Name
+
+
+@Instrumentation.Timed("Load")
+def Read_Annual_Profiles(Version, Building_Type):
+    # Reads the annual profiles of all dwellings. 2016 only has multi-family profiles
+    File = "AnnualProfileSF.csv" if Building_Type == "Single" else "AnnualProfileMF.csv"
+    return pd.read_csv(os.path.join(root, "SourceData", str(Version), File))
+
+
+def Synthesize_Day_Codes(Annual_Profile, Years, Holidays=None):
+    """
+    Returns a series of the day code of every date in Years (a year or list of
+    years), indexed by date. Annual_Profile is the CEC sequence of 365 day
+    codes of one dwelling (a column of Read_Annual_Profiles). Each date takes
+    the next code of its day type from the CEC sequence.
+    """
+
+    Annual_Profile = np.asarray(Annual_Profile, dtype=str)
+    Pool_Types = np.array([Code[1] for Code in Annual_Profile])
+
+    Years = np.atleast_1d(Years)
+    Dates = pd.date_range(
+        "{}-01-01".format(Years.min()), "{}-12-31".format(Years.max()), freq="D"
+    )
+    Dates = Dates[np.isin(Dates.year, Years)]
+    Types = Calculate_Day_Types(Dates, Holidays)
+
+    Position = (
+        pd.DataFrame({"Year": Dates.year, "Type": Types})
+        .groupby(["Year", "Type"])
+        .cumcount()
+        .to_numpy()
+    )  # The number of earlier days of the same type in the same year
+    Codes = np.empty(len(Dates), dtype=Annual_Profile.dtype)
+    for Type in Day_Types:
+        Pool = Annual_Profile[Pool_Types == Type]
+        Mask = Types == Type
+        if Mask.any() and len(Pool) == 0:
+            raise ValueError("The annual profile has no {} days".format(Type))
+        Codes[Mask] = Pool[Position[Mask] % max(len(Pool), 1)]
+
+    return pd.Series(Codes, index=Dates, name="Day")
+
+
+def Weather_Days(Dates):
+    # Returns the zero-based day of each date in the 365 day weather files. Feb 29 uses the weather of Feb 28
+    Dates = pd.DatetimeIndex(Dates)
+    return (
+        Dates.dayofyear.to_numpy() - 1 - (Dates.is_leap_year & (Dates.dayofyear > 59))
+    )
+
+
+@Instrumentation.Timed("Assemble")
+def Gather_Draws(Day_Codes, Daily_Profiles, Reduce_Clothes=True):
+    """
+    Returns the draws of a sequence of days, gathered from Daily_Profiles in
+    one pass. Day_Codes is a series of day codes indexed by date (see
+    Synthesize_Day_Codes). 'Start Time of Year (hr)' counts from midnight of
+    the first date and 'Day of Year (Day)' numbers the days from 1. If
+    Reduce_Clothes is True, CWSH draws of Daily_Profiles outside 1.5 IQR are
+    replaced with average values before gathering (see
+    Daily_Profile_Catalog.py). Pass Reduce_Clothes = False with daily profiles
+    from Daily_Profile_Catalog.Read_Clean_Daily_Profiles, which are already
+    corrected.
+    """
+
+    if Reduce_Clothes == True:
+        Daily_Profiles = Daily_Profile_Catalog.Build_Daily_Profiles(Daily_Profiles)[0]
+    Daily_Profiles = Daily_Profiles.sort_values("Day", kind="stable").reset_index(
+        drop=True
+    )
+    Codes, Code_Starts, Code_Counts = np.unique(
+        Daily_Profiles["Day"].to_numpy(dtype=str), return_index=True, return_counts=True
+    )
+    Day_Number = np.searchsorted(Codes, Day_Codes.to_numpy(dtype=str))
+    Day_Number = np.minimum(Day_Number, len(Codes) - 1)
+    Missing = Codes[Day_Number] != Day_Codes.to_numpy(dtype=str)
+
+    # Row positions of the draws of every day, in order
+    Counts = np.where(
+        Missing, 0, Code_Counts[Day_Number]
+    )  # Some annual profiles use codes missing from the daily profiles (E.g. 6D0). Those days have no draws, as in Create_Hot_Profile_NoSDLM
+    Day = np.repeat(np.arange(len(Day_Codes)), Counts)
+    Offset = np.arange(Counts.sum()) - np.repeat(np.cumsum(Counts) - Counts, Counts)
+    Rows = Code_Starts[Day_Number][Day] + Offset
+
+    Dwelling_Profile = Daily_Profiles.iloc[Rows].reset_index(drop=True)
+    Dwelling_Profile["Start Time of Year (hr)"] = (
+        Dwelling_Profile["Start time (hr)"] + 24 * Day
+    )
+    Dwelling_Profile["Day of Year (Day)"] = Day + 1
+
+    return Dwelling_Profile
+
+
+def Add_Mains_Temperature(Dwelling_Profile, Dates, ClimateZone):
+    # Adds the mains water temperature of each draw's day, before 'Start Time of Year (hr)' as in Create_Hot_Profile_NoSDLM
+    T_Mains = Weather_Data.Read_TMains(ClimateZone).to_numpy()[Weather_Days(Dates)]
+    Dwelling_Profile = Dwelling_Profile.drop(
+        columns="Mains Temperature (deg F)", errors="ignore"
+    )
+    Dwelling_Profile.insert(
+        Dwelling_Profile.columns.get_loc("Start Time of Year (hr)"),
+        "Mains Temperature (deg F)",
+        T_Mains[Dwelling_Profile["Day of Year (Day)"].to_numpy() - 1],
+    )
+    return Dwelling_Profile
+
+
+def Assemble_Annual_Profile(
+    Day_Codes,
+    Daily_Profiles,
+    ClimateZone,
+    Reduce_Clothes=True,
+    Temperature_Supply_Hot_AtFixture=Temperature_Supply_Hot_AtFixture,
+    Temperature_Bath=Temperature_Bath,
+    Temperature_Shower=Temperature_Shower,
+):
+    """
+    Returns the draw profile of a sequence of days without SDLM. The draws of
+    all days are gathered at once (see Gather_Draws), then the hot water
+    fraction and flows are calculated over the whole profile.
+    """
+
+    Dwelling_Profile = Gather_Draws(Day_Codes, Daily_Profiles, Reduce_Clothes)
+    Dwelling_Profile = Add_Mains_Temperature(
+        Dwelling_Profile, Day_Codes.index, ClimateZone
+    )
+    Dwelling_Profile = Calculate_Fraction_HotWater(
+        Temperature_Supply_Hot_AtFixture,
+        Temperature_Bath,
+        Temperature_Shower,
+        Dwelling_Profile,
+    )
+    Dwelling_Profile = Calculate_FlowWater_Hot(Dwelling_Profile)
+
+    return Dwelling_Profile
+
+
+def Synthesize_Annual_Profile(
+    Building_Type,
+    NumberBedrooms_Dwelling,
+    Variant,
+    ClimateZone,
+    Years,
+    Version=2019,
+    Holidays=None,
+    Reduce_Clothes=True,
+):
+    """
+    Returns the day codes and the draw profile (without SDLM) of one dwelling
+    for Years, a year or list of consecutive years.
+    """
+
+    Annual_Profile = Read_Annual_Profiles(Version, Building_Type)[
+        Annual_Profile_Name(Building_Type, NumberBedrooms_Dwelling, Variant)
+    ]
+    Day_Codes = Synthesize_Day_Codes(Annual_Profile, Years, Holidays)
+    Dwelling_Profile = Assemble_Annual_Profile(
+        Day_Codes,
+        Daily_Profile_Catalog.Read_Clean_Daily_Profiles(
+            Version, Building_Type, Reduce_Clothes
+        )[0],
+        ClimateZone,
+        Reduce_Clothes=False,
+    )  # The daily profiles are corrected once per process
+
+    return Day_Codes, Dwelling_Profile
@@ -0,0 +1,608 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Nov  7 09:12:55 2026
+
+This script runs batches of T24_Draw_Profile_Generator.py runs described in a
+job spec file, instead of editing the INPUTS section before every run or
+chaining %run calls in a notebook (E.g. time_saving.ipynb).
+
+A job spec is a .json, .yaml/.yml (requires the PyYAML package) or .toml file
+with a dictionary of Defaults and a list of Jobs. Each job has a Name and any
+of the parameters in Job_Defaults, which have the same names and options as
+the INPUTS of T24_Draw_Profile_Generator.py. Parameters a job doesn't state
+are taken from the Defaults of the spec, then from Job_Defaults. A job with a
+Sweep runs once for every combination of the listed values, and each run is
+named after its values. E.g.:
+
+    {
+        "Defaults": {"Building_Type": "Multi", "Water": "Hot"},
+        "Jobs": [
+            {
+                "Name": "MF_8_Units",
+                "NumberBedrooms_Dwellings": [1, 1, 2, 2, 2, 3, 3, 3],
+                "SquareFootage_Dwellings": [780, 780, 1100, 1100, 1100, 1300, 1300, 1300],
+                "Combined": "Yes",
+                "Sweep": {"ClimateZone": [1, 3, 12, 16]}
+            }
+        ]
+    }
+
+runs MF_8_Units_ClimateZone=1, MF_8_Units_ClimateZone=3, etc.
+
+Batches run in three steps:
+    -Every job is checked before anything runs, and all of the errors of all
+        of the jobs are reported at once
+    -The dwelling profiles the jobs need are created once each, even if
+        several jobs use the same dwelling. Dwellings are identified by their
+        key in the result cache (See Result_Cache.py), so identical dwellings
+        are shared between jobs, and dwellings stored by earlier runs are not
+        created again
+    -Each job then reads its dwellings from the cache, combines them if
+        requested, and saves its profiles to its Folder_Output
+
+Both the dwellings and the jobs run in a pool of Processes worker processes
+(Processes = 1 runs them in this process). Dwellings and jobs that fail are
+retried up to Retries times, each time in a new pool, so one crashed worker
+doesn't stop the batch.
+
+The state of every job is written to a run manifest (by default
+[spec file].manifest.json) after each job finishes: its parameters, status,
+attempts, error, output files and a key identifying its inputs. When
+Resume = True jobs that the manifest states are done, with the same key and
+with all of their output files present, are skipped, so an interrupted or
+partly failed batch can be run again without repeating finished jobs. Skipped
+jobs keep Status = 'Done' in the manifest, with Skipped = True, so they are
+also skipped by every later run.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import os
+import sys
+import json
+import time
+import platform
+import itertools
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import yaml
+except ImportError:  # Only needed for .yaml job specs
+    yaml = None
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11. Only needed for .toml job specs
+    tomllib = None
+
+import pandas as pd
+
+import Weather_Data
+import Result_Cache
+import Climate_Independent_Profiles
+import Instrumentation
+import Progress
+import T24_Draw_Profile_Generator
+import Profile_Generator
+
+# %%--------------------INPUTS---------------------------
+
+# Path to the job spec. Can also be given as the first command line argument
+Spec_File = None
+Processes = None  # Number of worker processes. None uses one per CPU, 1 runs the batch in this process
+Retries = 2  # Number of times a failed dwelling or job is retried
+Resume = True  # True skips jobs that the manifest states are already done
+Manifest_File = None  # Path to the run manifest. None uses [Spec_File].manifest.json
+Cache_Size = 5 * 1024**3  # Bytes. See Result_Cache.py
+
+# %%--------------------CONSTANTS------------------------
+
+Job_Defaults = {
+    "Building_Type": "Single",
+    "NumberBedrooms_Dwellings": [3],
+    "SquareFootage_Dwellings": [1897],
+    "ClimateZone": 3,
+    "Water": "Hot",
+    "SDLM": "Yes",
+    "Version": 2019,
+    "Distribution_System_Type": "Trunk and Branch",
+    "Multiplier_Clotheswasher": T24_Draw_Profile_Generator.Multiplier_Clotheswasher,
+    "Combined": "No",
+    "Combined_LargeBuilding": "No",
+    "Include_Faucet": "Yes",
+    "Include_Shower": "Yes",
+    "Include_Clothes": "Yes",
+    "Include_Dish": "Yes",
+    "Include_Bath": "Yes",
+    "Climate_Independent": "No",
+    "Output_Format": "CSV",
+    "CSV_Precision": None,
+    "Folder_Output": T24_Draw_Profile_Generator.Folder_Output,
+}
+
+Options = {
+    "Building_Type": ["Single", "Multi"],
+    "Water": ["Hot", "Mixed"],
+    "SDLM": ["Yes", "No"],
+    "Version": [2016, 2019],
+    "Distribution_System_Type": list(Profile_Generator.Distribution_System_Multipliers),
+    "Combined": ["Yes", "No"],
+    "Combined_LargeBuilding": ["Yes", "No"],
+    "Include_Faucet": ["Yes", "No"],
+    "Include_Shower": ["Yes", "No"],
+    "Include_Clothes": ["Yes", "No"],
+    "Include_Dish": ["Yes", "No"],
+    "Include_Bath": ["Yes", "No"],
+    "Climate_Independent": ["Yes", "No"],
+    "Output_Format": ["CSV", "Parquet"],
+}  # The allowed values of each parameter with a fixed set of options
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Read_Spec(Path):
+    # Reads a .json, .yaml/.yml or .toml job spec
+    Extension = os.path.splitext(Path)[1].lower()
+    if Extension in (".yaml", ".yml"):
+        if yaml is None:
+            raise ImportError("Reading .yaml job specs requires the PyYAML package")
+        with open(Path) as File:
+            return yaml.safe_load(File)
+    if Extension == ".toml":
+        if tomllib is None:
+            raise ImportError("Reading .toml job specs requires Python 3.11 or later")
+        with open(Path, "rb") as File:
+            return tomllib.load(File)
+    with open(Path) as File:
+        return json.load(File)
+
+
+def Expand_Jobs(Spec):
+    """
+    Returns the list of jobs in a spec, with the defaults filled in and each
+    Sweep expanded into one job per combination of its values.
+    """
+
+    Defaults = dict(Job_Defaults, **Spec.get("Defaults", {}))
+    Jobs = []
+    for Number, Job in enumerate(Spec.get("Jobs", [])):
+        Job = dict(Job)
+        Name = str(Job.pop("Name", "Job_{}".format(Number + 1)))
+        Sweep = Job.pop("Sweep", {})
+        for Values in itertools.product(*Sweep.values()):
+            Swept = dict(zip(Sweep.keys(), Values))
+            Jobs.append(
+                {
+                    **Defaults,
+                    **Job,
+                    **Swept,
+                    "Name": "_".join(
+                        [Name]
+                        + ["{}={}".format(Key, Value) for Key, Value in Swept.items()]
+                    ),
+                }
+            )
+    return Jobs
+
+
+def Validate_Job(Job):
+    # Returns a list of the errors in a job, using the same checks as the ERROR CHECKING section of T24_Draw_Profile_Generator.py
+    Errors = [
+        "Unknown parameter {}".format(Key)
+        for Key in Job
+        if Key not in Job_Defaults and Key != "Name"
+    ]
+    for Key, Allowed in Options.items():
+        if Job.get(Key) not in Allowed:
+            Errors.append(
+                "{} must be one of {}, not {!r}".format(Key, Allowed, Job.get(Key))
+            )
+
+    Bedrooms = Job["NumberBedrooms_Dwellings"]
+    if (
+        not isinstance(Bedrooms, list)
+        or len(Bedrooms) == 0
+        or not all(isinstance(Number, int) for Number in Bedrooms)
+    ):
+        Errors.append("NumberBedrooms_Dwellings must be a list of at least one integer")
+    elif Job["Building_Type"] == "Single" and min(Bedrooms) < 1 or max(Bedrooms) > 5:
+        Errors.append(
+            "Each NumberBedrooms_Dwellings entry must be >= 1 if single family, <= 5 regardless of building type"
+        )
+    elif not isinstance(Job["SquareFootage_Dwellings"], list) or len(
+        Job["SquareFootage_Dwellings"]
+    ) != len(Bedrooms):
+        Errors.append(
+            "NumberBedrooms_Dwellings and SquareFootage_Dwellings must have the same number of entries"
+        )
+
+    if Job["ClimateZone"] not in Weather_Data.Climate_Zones:
+        Errors.append("ClimateZone must be an integer from 1 to 16")
+    elif Job["Water"] == "Hot" and not os.path.exists(
+        os.path.join(
+            Weather_Data.Folder_WeatherData,
+            Weather_Data.Weather_File_Name(Job["ClimateZone"]),
+        )
+    ):
+        Errors.append("No weather file for climate zone {}".format(Job["ClimateZone"]))
+
+    if not isinstance(Job["Multiplier_Clotheswasher"], (int, float)):
+        Errors.append("Multiplier_Clotheswasher must be a number")
+    if Job["CSV_Precision"] is not None and not isinstance(Job["CSV_Precision"], int):
+        Errors.append("CSV_Precision must be None or an integer")
+    if Job["Climate_Independent"] == "Yes" and (
+        Job["Water"] != "Hot"
+        or Job["Combined"] == "Yes"
+        or Job["Combined_LargeBuilding"] == "Yes"
+    ):
+        Errors.append(
+            "Climate_Independent only applies to individual hot water profiles"
+        )
+    if Job["Climate_Independent"] == "Yes" and Job["Output_Format"] != "CSV":
+        Errors.append(
+            "Climate_Independent profiles are stored as .csv files. Set Output_Format to 'CSV'"
+        )
+    return Errors
+
+
+def Validate_Jobs(Jobs):
+    # Raises a ValueError listing the errors of every job, if there are any
+    Errors = []
+    Names = [Job["Name"] for Job in Jobs]
+    for Name in sorted(set(Names)):
+        if Names.count(Name) > 1:
+            Errors.append(
+                "{}: the name is used by {} jobs".format(Name, Names.count(Name))
+            )
+    for Job in Jobs:
+        Errors += ["{}: {}".format(Job["Name"], Error) for Error in Validate_Job(Job)]
+    if len(Errors) > 0:
+        raise ValueError(
+            "The job spec has {} errors:\n    ".format(len(Errors))
+            + "\n    ".join(Errors)
+        )
+
+
+def Plan_Dwellings(Job):
+    """
+    Returns a list of (Dwelling_Parameters, Variant) for each dwelling of a
+    job, assigning the multi-family variants the same way as
+    T24_Draw_Profile_Generator.py. Dwelling_Parameters are the arguments of
+    Create_Dwelling_Profile.
+    """
+
+    Dwellings = []
+    for i, (NumberBedrooms_Dwelling, Variant) in enumerate(
+        Profile_Generator.Assign_Variants(
+            Job["Building_Type"], Job["NumberBedrooms_Dwellings"]
+        )
+    ):
+        Dwellings.append(
+            (
+                [
+                    Job["Building_Type"],
+                    NumberBedrooms_Dwelling,
+                    Variant,
+                    Job["SquareFootage_Dwellings"][i],
+                    Job["ClimateZone"],
+                    Job["Water"],
+                    Job["SDLM"],
+                    Job["Include_Faucet"],
+                    Job["Include_Shower"],
+                    Job["Include_Clothes"],
+                    Job["Include_Dish"],
+                    Job["Include_Bath"],
+                    Job["Version"],
+                    Job["Distribution_System_Type"],
+                    Job["Multiplier_Clotheswasher"],
+                ],
+                Variant,
+            )
+        )
+    return Dwellings
+
+
+def _Create_Dwelling_Profile(Dwelling_Parameters):
+    # Creates a dwelling profile with the mains water temperature of its own climate zone
+    return T24_Draw_Profile_Generator.Create_Dwelling_Profile(
+        *Dwelling_Parameters,
+        T_Mains=Weather_Data.Read_TMains(Dwelling_Parameters[4]),
+    )
+
+
+def _Run_Dwelling(Key, Dwelling_Parameters, Folder_Cache, Cache_Size):
+    # Creates a dwelling profile and stores it in the cache. Runs in a worker process
+    Cache = Result_Cache.Result_Cache(Folder_Cache, Cache_Size)
+    Cache.Put(Key, _Create_Dwelling_Profile(Dwelling_Parameters))
+    return Key
+
+
+def _Run_Job(Job, Dwellings, Keys, Folder_Cache, Cache_Size):
+    # Reads the dwellings of a job from the cache, combines them if requested and saves the profiles. Returns the output paths. Runs in a worker process
+    Cache = Result_Cache.Result_Cache(Folder_Cache, Cache_Size)
+    os.makedirs(Job["Folder_Output"], exist_ok=True)
+    Save_Options = {
+        "Folder_Output": Job["Folder_Output"],
+        "Output_Format": Job["Output_Format"],
+        "CSV_Precision": Job["CSV_Precision"],
+    }
+
+    Outputs = []
+    Profiles = []
+    for (Dwelling_Parameters, Variant), Key in zip(Dwellings, Keys):
+        Dwelling_Profile, Included_Code = Cache.Get_Or_Calculate(
+            Key, _Create_Dwelling_Profile, Dwelling_Parameters
+        )  # Recreated if it was evicted from the cache since it was created
+        if Job["Combined"] == "Yes" or Job["Combined_LargeBuilding"] == "Yes":
+            Profiles.append(Dwelling_Profile)
+            continue
+
+        Profile_Parameters = {
+            "Bldg": Job["Building_Type"],
+            "CZ": Job["ClimateZone"],
+            "Wat": Job["Water"],
+            "Prof": str(Dwelling_Parameters[1])
+            + (Variant if Job["Building_Type"] == "Multi" else ""),
+            "SDLM": Job["SDLM"],
+            "CFA": Dwelling_Parameters[3],
+            "Inc": Included_Code,
+            "Ver": Job["Version"],
+        }
+        if Job["Climate_Independent"] == "Yes":
+            Outputs.append(
+                Climate_Independent_Profiles.Save_Profile(
+                    Dwelling_Profile,
+                    Job["Folder_Output"],
+                    Profile_Parameters,
+                    Precision=Job["CSV_Precision"],
+                )
+            )
+        else:
+            Outputs.append(
+                T24_Draw_Profile_Generator.Save_Profile(
+                    Dwelling_Profile, Profile_Parameters, **Save_Options
+                )
+            )
+
+    Profile_Parameters = {
+        "Bldg": Job["Building_Type"],
+        "CZ": Job["ClimateZone"],
+        "Wat": Job["Water"],
+        "Prof": str(sorted(Job["NumberBedrooms_Dwellings"])),
+        "SDLM": Job["SDLM"],
+        "CFA": str(Job["SquareFootage_Dwellings"]),
+        "Inc": Included_Code,
+        "Ver": Job["Version"],
+    }  # Describes the combined profiles
+    if Job["Combined"] == "Yes":
+        Combined_Profile = T24_Draw_Profile_Generator.Combine_Profiles(
+            Profiles, Job["Water"]
+        )[0]
+        Outputs.append(
+            T24_Draw_Profile_Generator.Save_Profile(
+                Combined_Profile, Profile_Parameters, **Save_Options
+            )
+        )
+    if Job["Combined_LargeBuilding"] == "Yes":
+        Combined_Profile = T24_Draw_Profile_Generator.Combined_Profile_LargeBuilding(
+            Profiles, Job["Water"]
+        )
+        Outputs.append(
+            T24_Draw_Profile_Generator.Save_Profile(
+                Combined_Profile, Profile_Parameters, **Save_Options
+            )
+        )
+    return Outputs
+
+
+def _Run_Tasks(Function, Tasks, Processes, Retries, Progress_Task, On_Finished):
+    """
+    Runs Function(*Arguments) for each {ID: Arguments} in Tasks, in a pool of
+    Processes worker processes. Tasks that raise an exception are retried up
+    to Retries times in a new pool. Calls On_Finished(ID, Result, Error,
+    Attempts) as each task succeeds or finally fails.
+    """
+
+    Tracker = Progress.Progress(Progress_Task, len(Tasks), "tasks")
+    Remaining = dict(Tasks)
+    for Attempt in range(1, Retries + 2):
+        Errors = {}
+        if Processes == 1:
+            for ID, Arguments in Remaining.items():
+                try:
+                    On_Finished(ID, Function(*Arguments), None, Attempt)
+                    Tracker.Update()
+                except Exception:
+                    Errors[ID] = traceback.format_exc()
+        else:
+            with ProcessPoolExecutor(max_workers=Processes) as Executor:
+                Futures = {
+                    Executor.submit(Function, *Arguments): ID
+                    for ID, Arguments in Remaining.items()
+                }
+                for Future in as_completed(Futures):
+                    try:
+                        Result = Future.result()
+                    except Exception:  # Includes workers that crashed
+                        Errors[Futures[Future]] = traceback.format_exc()
+                        continue
+                    On_Finished(Futures[Future], Result, None, Attempt)
+                    Tracker.Update()
+
+        Remaining = {ID: Remaining[ID] for ID in Errors}
+        if len(Remaining) == 0:
+            break
+        print(
+            "{}: {} tasks failed on attempt {}".format(
+                Progress_Task, len(Remaining), Attempt
+            ),
+            file=sys.stderr,
+        )
+
+    for ID, Error in Errors.items():
+        On_Finished(ID, None, Error, Attempt)
+    Tracker.Close()
+
+
+def Write_Manifest(Manifest, Path):
+    # Writes the manifest to a temporary file and renames it into place, so an interrupted write never leaves a broken manifest
+    Temporary_Path = Path + ".tmp"
+    with open(Temporary_Path, "w") as File:
+        json.dump(Manifest, File, indent=1, default=str)
+    os.replace(Temporary_Path, Path)
+
+
+def Run_Batch(
+    Spec_File,
+    Processes=Processes,
+    Retries=Retries,
+    Resume=Resume,
+    Manifest_File=Manifest_File,
+    Folder_Cache=T24_Draw_Profile_Generator.Folder_Cache,
+    Cache_Size=Cache_Size,
+):
+    """
+    Runs every job in a job spec and returns the run manifest. Raises a
+    ValueError before running anything if any job is invalid.
+    """
+
+    Jobs = Expand_Jobs(Read_Spec(Spec_File))
+    Validate_Jobs(Jobs)
+    if Manifest_File is None:
+        Manifest_File = Spec_File + ".manifest.json"
+
+    Previous = {}
+    if Resume == True and os.path.exists(Manifest_File):
+        with open(Manifest_File) as File:
+            Previous = json.load(File)["Jobs"]
+
+    Manifest = {
+        "Spec_File": os.path.abspath(Spec_File),
+        "Spec_Hash": Result_Cache.Hash_File(Spec_File),
+        "Started": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "Finished": None,
+        "Python": platform.python_version(),
+        "pandas": pd.__version__,
+        "Processes": Processes,
+        "Jobs": {},
+    }
+
+    # Identify the dwellings of every job by their key in the cache
+    Plans = {}
+    Pending = []
+    for Job in Jobs:
+        Dwellings = Plan_Dwellings(Job)
+        Keys = [
+            T24_Draw_Profile_Generator.Dwelling_Cache_Key(*Dwelling_Parameters)
+            for Dwelling_Parameters, Variant in Dwellings
+        ]
+        Job_Key = Result_Cache.Cache_Key(
+            {"Result": "Job", "Job": Job, "Dwellings": Keys},
+            Functions=[_Run_Job],
+        )
+        Plans[Job["Name"]] = (Job, Dwellings, Keys)
+
+        Entry = Previous.get(Job["Name"])
+        if (
+            Entry is not None
+            and Entry["Status"] in ["Done", "Skipped"]
+            and Entry["Key"] == Job_Key
+            and all(os.path.exists(Output) for Output in Entry["Outputs"])
+        ):  # Finished by an earlier run with the same inputs. Older manifests stored skipped jobs as Status = 'Skipped'
+            Manifest["Jobs"][Job["Name"]] = dict(Entry, Status="Done", Skipped=True)
+            continue
+        Manifest["Jobs"][Job["Name"]] = {
+            "Parameters": Job,
+            "Key": Job_Key,
+            "Status": "Pending",
+            "Skipped": False,
+            "Attempts": 0,
+            "Error": None,
+            "Outputs": [],
+            "Dwellings": len(Dwellings),
+        }
+        Pending.append(Job["Name"])
+    Write_Manifest(Manifest, Manifest_File)
+
+    Cache = Result_Cache.Result_Cache(Folder_Cache, Cache_Size)
+    Dwelling_Tasks = {}
+    for Name in Pending:
+        Job, Dwellings, Keys = Plans[Name]
+        for (Dwelling_Parameters, Variant), Key in zip(Dwellings, Keys):
+            if Key not in Dwelling_Tasks and not os.path.exists(Cache.Path(Key)):
+                Dwelling_Tasks[Key] = (
+                    Key,
+                    Dwelling_Parameters,
+                    Folder_Cache,
+                    Cache_Size,
+                )  # Each distinct dwelling is created once, however many jobs use it
+    print(
+        "{} jobs to run ({} already done), {} dwellings to create".format(
+            len(Pending), len(Jobs) - len(Pending), len(Dwelling_Tasks)
+        )
+    )
+
+    Failed_Dwellings = {}
+
+    def Dwelling_Finished(Key, Result, Error, Attempts):
+        if Error is not None:
+            Failed_Dwellings[Key] = Error
+
+    _Run_Tasks(
+        _Run_Dwelling,
+        Dwelling_Tasks,
+        Processes,
+        Retries,
+        "Batch dwellings",
+        Dwelling_Finished,
+    )
+
+    Job_Tasks = {}
+    for Name in Pending:
+        Job, Dwellings, Keys = Plans[Name]
+        Errors = [Failed_Dwellings[Key] for Key in Keys if Key in Failed_Dwellings]
+        if len(Errors) > 0:  # Don't run jobs whose dwellings couldn't be created
+            Manifest["Jobs"][Name].update(
+                Status="Failed", Error="Dwelling failed:\n" + Errors[0]
+            )
+            continue
+        Job_Tasks[Name] = (Job, Dwellings, Keys, Folder_Cache, Cache_Size)
+
+    def Job_Finished(Name, Outputs, Error, Attempts):
+        Manifest["Jobs"][Name].update(
+            Status="Done" if Error is None else "Failed",
+            Attempts=Attempts,
+            Error=Error,
+            Outputs=Outputs or [],
+            Finished=time.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+        Write_Manifest(Manifest, Manifest_File)
+
+    _Run_Tasks(_Run_Job, Job_Tasks, Processes, Retries, "Batch jobs", Job_Finished)
+
+    Manifest["Finished"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    Write_Manifest(Manifest, Manifest_File)
+
+    Statuses = [
+        "Skipped" if Entry.get("Skipped") else Entry["Status"]
+        for Entry in Manifest["Jobs"].values()
+    ]
+    print(
+        "Finished: {} done, {} skipped, {} failed. Manifest: {}".format(
+            Statuses.count("Done"),
+            Statuses.count("Skipped"),
+            Statuses.count("Failed"),
+            Manifest_File,
+        )
+    )
+    return Manifest
+
+
+# %%--------------------RUN THE BATCH-----------------------------------
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        Spec_File = sys.argv[1]
+    Run_Batch(Spec_File)
+    Instrumentation.Print_Summary()
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 15 08:46:12 2026
+
+This script stores event-based hot water draw profiles independently of the
+climate zone, and calculates the climate dependent columns when the profile is
+read.
+
+"Mains Temperature (deg F)", "Fraction Hot Water", "Hot Water Flow Rate (gpm)"
+and "Hot Water Volume (gal)" only depend on the fixture, the day of year and the
+mains water temperature of the climate zone. Every other column (including the
+SDLM and clotheswasher multiplier adjustments to "Duration (min)") is the same
+in every climate zone. Instead of storing a full copy of each profile for each
+of the 16 climate zones, this script stores one mixed water event table with
+the climate dependent columns removed, plus a small .json file holding the
+original column order. Converting to another climate zone becomes the
+ClimateZone argument of Load_Profile rather than a run of
+Convert_Profile_Climate_Zone.py.
+
+Climate-independent profiles use 'CZ=Any' in their file names, E.g.
+'Bldg=Multi_CZ=Any_Wat=Hot_Prof=1a_SDLM=Yes_CFA=780_Inc=FSCDB_Ver=2019.csv'
+
+This only applies to individual dwelling profiles. Combine_Profiles merges
+overlapping draws into rows with concatenated fixture names (E.g. 'FAUCSHWR')
+whose hot water fraction can't be recalculated from the fixture.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import os
+import json
+
+import Profile_Catalog
+import Fast_CSV_Writer
+import Weather_Data
+import Hot_Water_Calculations
+
+# %%--------------------CONSTANTS------------------------
+
+Climate_Dependent_Columns = [
+    "Mains Temperature (deg F)",
+    "Fraction Hot Water",
+    "Hot Water Flow Rate (gpm)",
+    "Hot Water Volume (gal)",
+]
+
+# Hot water temperature constants are taken from pg B-3 of the 2016 CBECC ACM reference manual
+Temperature_Shower = 105  # deg F
+Temperature_Bath = 105  # deg F
+Temperature_Supply_Hot_AtFixture = 115  # deg F. CSE assumes 115 deg F hot water at the fixture, per 1/28/2020 email with Aaron Boranian
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def _Metadata_Path(Path):
+    return Profile_Catalog._Strip_Extension(Path) + ".json"
+
+
+def Save_Profile(Profile, Folder, Parameters, Precision=None):
+    """
+    Saves a dwelling's event-based profile without its climate dependent
+    columns. Parameters describes the profile the same way as in
+    T24_Draw_Profile_Generator.py; its climate zone is ignored. Returns the
+    path of the saved profile. Precision is passed to Fast_CSV_Writer.Write_CSV.
+    """
+
+    Parameters = dict(Parameters, CZ="Any")
+    Path = os.path.join(Folder, Profile_Catalog.Create_Profile_FileName(Parameters))
+
+    Fast_CSV_Writer.Write_CSV(
+        Profile.drop(columns=Climate_Dependent_Columns, errors="ignore"),
+        Path,
+        Precision=Precision,
+    )  # Only the mixed water event table is stored
+
+    with open(_Metadata_Path(Path), "w") as Metadata_File:
+        json.dump(
+            {"Columns": list(Profile.columns), "Parameters": Parameters},
+            Metadata_File,
+            indent=4,
+            default=str,
+        )  # Record the original column order so Load_Profile returns the same layout
+
+    Profile_Catalog.Register_Profile(Path)
+
+    return Path
+
+
+def Load_Profile(
+    Path,
+    ClimateZone,
+    Temperature_Supply_Hot_AtFixture=Temperature_Supply_Hot_AtFixture,
+    Temperature_Bath=Temperature_Bath,
+    Temperature_Shower=Temperature_Shower,
+):
+    """
+    Reads a climate-independent profile and calculates its climate dependent
+    columns for ClimateZone, using the mains water temperatures in
+    Weather_Data. Returns the same columns, in the same order, as the profile
+    passed to Save_Profile.
+    """
+
+    Profile = pd.read_csv(Path)
+
+    T_Mains = Weather_Data.Read_TMains_AllZones()[int(ClimateZone) - 1]
+    Profile["Mains Temperature (deg F)"] = T_Mains[
+        Profile["Day of Year (Day)"].to_numpy().astype(int) - 1
+    ]  # look up the mains temperature of each draw by day of year
+    Profile["Fraction Hot Water"] = Hot_Water_Calculations.Calculate_Fraction_HotWater_Array(
+        Profile["Fixture"].to_numpy(),
+        Profile["Mains Temperature (deg F)"].to_numpy(),
+        Temperature_Supply_Hot_AtFixture,
+        Temperature_Bath,
+        Temperature_Shower,
+    )
+    (
+        Profile["Hot Water Flow Rate (gpm)"],
+        Profile["Hot Water Volume (gal)"],
+    ) = Hot_Water_Calculations.Calculate_FlowWater_Hot_Array(
+        Profile["Fraction Hot Water"].to_numpy(),
+        Profile["Flow Rate (gpm)"].to_numpy(),
+        Profile["Duration (min)"].to_numpy(),
+    )
+
+    if os.path.exists(_Metadata_Path(Path)):
+        with open(_Metadata_Path(Path)) as Metadata_File:
+            Columns = json.load(Metadata_File)["Columns"]
+        Profile = Profile[[Column for Column in Columns if Column in Profile.columns]]
+
+    return Profile
+
+
+def Convert_Profile(Path, Folder_Output=None):
+    """
+    Converts an existing climate zone specific hot water profile to a
+    climate-independent profile. Returns the path of the new profile.
+    """
+
+    Parameters = Profile_Catalog.Parse_Profile_FileName(Path)
+    if Parameters["Wat"] != "Hot" or Parameters["Format"] != "Event":
+        raise ValueError("Only event-based hot water profiles depend on the climate zone")
+
+    return Save_Profile(
+        pd.read_csv(Path),
+        Folder_Output if Folder_Output is not None else os.path.dirname(Path),
+        Parameters,
+    )
+
+
+# %%----------------------------------CONVERT THE ARCHIVE-----------------------------
+
+if __name__ == "__main__":
+    # Create one climate-independent profile for every group of profiles that only differ by climate zone. The zone specific copies can then be deleted
+    root = os.path.dirname(os.path.abspath(__file__))
+    Folder = os.path.join(root, "DrawProfiles")
+
+    Catalog = Profile_Catalog.Query_Catalog(
+        Profile_Catalog.Build_Catalog(Folder), Format="Event", Wat="Hot"
+    )
+    Catalog = Catalog[
+        Catalog["CZ"].notna() & Catalog["Bedrooms"].notna()
+    ]  # Skip profiles that are already climate-independent, and combined profiles
+    Converted = set()
+    for Path in Catalog["Full_Path"]:
+        Parameters = Profile_Catalog.Parse_Profile_FileName(Path)
+        Name = Profile_Catalog.Create_Profile_FileName(dict(Parameters, CZ="Any"))
+        if Name in Converted:
+            continue
+        Convert_Profile(Path)
+        Converted.add(Name)
+        print("Finished: {}".format(Name))
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:31:05 2026
+
+This script provides an optional columnar (Parquet) output backend for
+T24_Draw_Profile_Generator.py, Event_To_Timestep_Converter.py and
+Convert_Profile_Climate_Zone.py. It requires the pyarrow package, which is only
+imported when Parquet output is requested.
+
+Profiles are written as a hive partitioned dataset:
+    [Root]/Bldg=Multi/CZ=3/Wat=Hot/Ver=2019/[profile file name].parquet
+The file name is the same as the .csv file name (with a .parquet extension) so
+Profile_Catalog.py can index and query the dataset. The remaining parameters
+(Prof, SDLM, CFA, Inc) are also stored as dictionary-encoded columns so a
+whole partition can be read and filtered at once.
+
+Columns are typed rather than stored as text. Fixture and Day are dictionary
+encoded, Day of Year is an integer and the datetime index of timestep-based
+profiles is stored in a 'Timestamp' column. Read_Profile_Dataset only reads the
+requested columns and partitions, and never re-parses datetime strings.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import os
+import glob
+
+import Profile_Catalog
+import Instrumentation
+
+# %%--------------------CONSTANTS------------------------
+
+Partition_Fields = ["Bldg", "CZ", "Wat", "Ver"]
+Dwelling_Fields = [
+    "Prof",
+    "SDLM",
+    "CFA",
+    "Inc",
+]  # The file name fields stored as columns of each row. Partition_Fields are stored as directories
+Dictionary_Columns = ["Fixture", "Day"]
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def _Import_Arrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.dataset
+    except ImportError:
+        raise ImportError("Parquet output requires the pyarrow package")
+    return pyarrow
+
+
+def _Typed_Profile(Profile, Parameters, Index):
+    # Returns a copy of the profile with typed columns, ready to be converted to an Arrow table
+    Profile = Profile.copy()
+    if Index:  # Timestep-based profiles store their timestamps in the index
+        Profile.insert(0, "Timestamp", pd.to_datetime(Profile.index))
+    Profile = Profile.reset_index(drop=True)
+
+    for Column in Profile.columns:
+        if Column in Dictionary_Columns:
+            Profile[Column] = Profile[Column].astype(str).astype("category")
+        elif Column == "Day of Year (Day)":
+            Profile[Column] = Profile[Column].astype("int16")
+        elif Profile[Column].dtype == object:  # Columns created by concatenating onto an empty data frame are stored as objects even when numeric
+            try:
+                Profile[Column] = pd.to_numeric(Profile[Column])
+            except (ValueError, TypeError):
+                Profile[Column] = Profile[Column].astype(str)
+
+    for Field in Dwelling_Fields:
+        Profile[Field] = pd.Categorical([str(Parameters.get(Field, ""))] * len(Profile))
+
+    return Profile
+
+
+@Instrumentation.Timed("Write")
+def Write_Profile_Dataset(Profile, Root, Parameters, Index=False, SI=None):
+    """
+    Writes a profile into the partitioned dataset at Root and records it in
+    the dataset's catalog. Parameters describes the profile as in
+    Profile_Catalog. Index = True stores the datetime index of timestep-based
+    profiles, and SI states the units of timestep-based profiles for their
+    file name. Returns the path of the written file.
+    """
+
+    pyarrow = _Import_Arrow()
+
+    Folder = os.path.join(
+        Root,
+        *["{}={}".format(Field, Parameters[Field]) for Field in Partition_Fields]
+    )
+    os.makedirs(Folder, exist_ok=True)
+
+    if Index:
+        File = Profile_Catalog.Create_Timestep_FileName(Parameters, SI, ".parquet")
+    else:
+        File = Profile_Catalog.Create_Profile_FileName(Parameters, ".parquet")
+    Path = os.path.join(Folder, File)
+
+    Table = pyarrow.Table.from_pandas(
+        _Typed_Profile(Profile, Parameters, Index), preserve_index=False
+    )
+    pyarrow.parquet.write_table(Table, Path)
+
+    Profile_Catalog.Register_Profile(Path, Profile, Catalog=Root)
+
+    return Path
+
+
+def Read_Profile_Dataset(Root, Columns=None, **Filters):
+    """
+    Reads the profiles in the dataset at Root. Columns limits the columns that
+    are read. Filters select partitions and profiles, E.g.
+    Read_Profile_Dataset(Root, ['Timestamp', 'Hot Water Draw Volume (L)'],
+    CZ=3, Prof=['1a', '1b']). Filter values may be single values or lists.
+    Timestep-based profiles are returned with their 'Timestamp' as the index.
+    """
+
+    pyarrow = _Import_Arrow()
+
+    Dataset = pyarrow.dataset.dataset(
+        sorted(glob.glob(os.path.join(Root, "**", "*.parquet"), recursive=True)),
+        format="parquet",
+        partitioning="hive",
+        partition_base_dir=Root,
+    )  # Only the .parquet files, so the catalog stored at Root isn't read as part of the dataset
+
+    Expression = None
+    for Field, Value in Filters.items():
+        Values = list(Value) if isinstance(Value, (list, tuple, set)) else [Value]
+        Type = Dataset.schema.field(Field).type
+        Condition = pyarrow.dataset.field(Field).isin(
+            pyarrow.array(Values).cast(
+                Type.value_type if pyarrow.types.is_dictionary(Type) else Type
+            )
+        )
+        Expression = Condition if Expression is None else Expression & Condition
+
+    Profile = Dataset.to_table(columns=Columns, filter=Expression).to_pandas()
+
+    if "Timestamp" in Profile.columns:
+        Profile = Profile.set_index("Timestamp")
+        Profile.index.name = None
+
+    return Profile
+
+
+def Read_Profile_File(Path, Columns=None):
+    """
+    Reads a single profile written by Write_Profile_Dataset, E.g. a
+    'Full_Path' returned by Profile_Catalog.Query_Catalog. Returns the same
+    columns as the original profile (or only Columns), without the profile
+    parameter columns.
+    """
+
+    _Import_Arrow()
+
+    Profile = pd.read_parquet(Path, columns=Columns)
+    Profile = Profile.drop(columns=Dwelling_Fields, errors="ignore")
+
+    if "Timestamp" in Profile.columns:
+        Profile = Profile.set_index("Timestamp")
+        Profile.index.name = None
+
+    return Profile
@@ -59,21 +59,29 @@ Code block 'converting to climate zone 4 complete, it' took: 78315.12375 ms
 
 time to run both zones = 157.7960069179535 sec
 
+The row-wise .apply (and swifter) lookup of the mains temperature has since been
+replaced by indexing a (16 x 365) T_Mains array with the day of year of each
+draw. With All_Zones_One_Pass = True the hot water fraction, flow rate and
+volume are calculated for every requested zone at once as (zones x draws)
+arrays, so the conversion itself takes seconds and writing the files dominates.
+
 @author: Nathan Iltis
 """
 # %%-------------------------------IMPORT STATEMENTS--------------------------
 import pandas as pd
+import numpy as np
 import sys
 import os
-import time
 
-# import swifter
-from linetimer import CodeTimer
+import Profile_Catalog
+import Fast_CSV_Writer
+import Columnar_Output
+import Weather_Data
+import Hot_Water_Calculations
+import Result_Cache
+import Instrumentation
+import Progress
 
-# %%------------------------------TIMER--------------------------------------
-start_time = (
-    time.time()
-)  # mark the beginning of the execution time for reference back to later
 # %%------------------------------INPUTS--------------------------------------
 # Folder paths - assumes the profile has been created and is in the appropriate folder
 # file to convert to a new climate zone:
@@ -88,10 +96,16 @@ Possible_Climate_Zones = list(range(1, 17))  # list of all possible climate zone
 New_Climate_Zones = list(
     range(1, 17)
 )  # specify which climate zones to convert the file to - can be a number from 1-16, must be a list
+CSV_Precision = None  # Number of decimal places written to the .csv outputs. None writes full precision, identical to DataFrame.to_csv. A number (E.g. 6) writes faster and smaller files
+Output_Format = "CSV"  # Either 'CSV' or 'Parquet'. 'Parquet' writes the converted profiles to a partitioned dataset in DrawProfiles\Parquet. Requires the pyarrow package
+All_Zones_One_Pass = True  # True calculates every new zone in one pass using (zones x draws) arrays. False converts one zone at a time, which uses less memory for very long profiles
+Use_Cache = "No"  # Either 'Yes' or 'No'. 'Yes' stores the climate dependent columns of each converted zone in Folder_Cache and reuses them when the same profile is converted again with the same inputs. See Result_Cache.py
+Cache_Size = 5 * 1024**3  # Bytes. The least recently used results are deleted once the cache is larger than this
 # file to convert to a new climate zone:
 File = "Bldg=Single_CZ=1_Wat=Hot_Prof=5_SDLM=Yes_CFA=3500_Inc=FSCDB_Ver=2019.csv"  # mjust use double-quotations since string has singles already
-Split_Up = File.replace(".csv", "").split(sep="_")
-Specifier_Dict = {each.split(sep="=")[0]: each.split(sep="=")[1] for each in Split_Up}
+Specifier_Dict = Profile_Catalog.Parse_Profile_FileName(
+    File
+)  # Read the parameters of the profile from its file name
 
 Building_Type = Specifier_Dict[
     "Bldg"
@@ -114,6 +128,7 @@ if ClimateZone in New_Climate_Zones:
 File_Location = Folder + os.sep + "DrawProfiles" + os.sep + File  # for normal use
 # File_Location = Folder + os.sep + 'DrawProfiles' + os.sep + 'Unused Profiles' + os.sep + File #for testing
 Folder_Output = File_Location
+Folder_Cache = Folder + os.sep + "DrawProfiles" + os.sep + "Cache"
 # %%-----------------------------ERROR CHECKING-------------------------------
 # If the user has tried to convert a mixed water profile
 if Water != "Hot":  # must be a hot water draw profile
@@ -139,141 +154,138 @@ Temperature_Bath = 105  # deg F
 Temperature_Supply_Hot_AtFixture = 115  # deg F
 
 
-# %%-----------------DEFINITIONS---------------------------
-def Calculate_Fraction_HotWater(Temperature_Supply_Hot_AtFixture, Data):
-    # This function estimates the fraction of hot water at various fixtures using the assumptions in the 2016 version of CBECC. Page B-3
-
-    # Hot water fractions are taken from pg B-3 of the 2016 CBECC ACM reference manual
-    Fraction_HotWater_Faucet = 0.5
-    Fraction_HotWater_ClothesWasher = 0.22
-    Fraction_HotWater_DishWasher = 1
-
-    Data["BooleanMask"] = (
-        Data["Fixture"] == "FAUC"
-    )  # Creates a new column named BooleanMask that is True if Fixture in that row is FAUC
-    Data["Fraction Hot Water"] = (
-        Data["BooleanMask"] * Fraction_HotWater_Faucet
-    )  # Sets Fraction Hot Water for the rows where BoolenaMask = True to Fraction_HotWater_Faucet
-    Data["BooleanMask"] = (
-        Data["Fixture"] == "CWSH"
-    )  # Resets BooleanMask = True if Fixture in that row = CWSH
-    Data["Fraction Hot Water"] = (
-        Data["Fraction Hot Water"]
-        + Data["BooleanMask"] * Fraction_HotWater_ClothesWasher
-    )  # Adds BooleanMask * Fraction_HotWater_ClothesWasher to Fraction Hot Water. The column now contains the fraction of hot water for both faucet and dish washer uses
-    Data["BooleanMask"] = (
-        Data["Fixture"] == "DWSH"
-    )  # Repeates the same process for the dishwasher
-    Data["Fraction Hot Water"] = (
-        Data["Fraction Hot Water"] + Data["BooleanMask"] * Fraction_HotWater_DishWasher
-    )
-    Data["BooleanMask"] = Data["Fixture"] == "BATH"
-    Data["Fraction Hot Water"] = Data["Fraction Hot Water"] + Data["BooleanMask"] * (
-        Temperature_Bath - Data["Mains Temperature (deg F)"]
-    ) / (
-        Temperature_Supply_Hot_AtFixture - Data["Mains Temperature (deg F)"]
-    )  # Calculates the fraction of hot water in a bath based on the CBECC-Res assumed temperature for baths and the mains water temperature
-    Data["BooleanMask"] = Data["Fixture"] == "SHWR"
-    Data["Fraction Hot Water"] = Data["Fraction Hot Water"] + Data["BooleanMask"] * (
-        Temperature_Shower - Data["Mains Temperature (deg F)"]
-    ) / (
-        Temperature_Supply_Hot_AtFixture - Data["Mains Temperature (deg F)"]
-    )  # Calculates the fraction of hot water in a shower based on the CBECC-Res assumed temperature for showers and the mains water temperature
-
-    del Data[
-        "BooleanMask"
-    ]  # Delete the BoolenaMask column because it adds no value beyond this function
-
-    return Data
-
-
-def Calculate_FlowWater_Hot(DrawProfile):
-    # This function calculates the flow of hot water using the provided draw profile and fraction of hot water
-
-    DrawProfile["Hot Water Flow Rate (gpm)"] = (
-        DrawProfile["Fraction Hot Water"] * DrawProfile["Flow Rate (gpm)"]
-    )  # Calculates the flow rate using the draw profile and assumed fraction of hot water
-    DrawProfile["Hot Water Volume (gal)"] = (
-        DrawProfile["Hot Water Flow Rate (gpm)"] * DrawProfile["Duration (min)"]
-    )  # Calculates the total flow using the flow rate and duration
-
-    return DrawProfile
-
-
 # %%-----------------LOAD WEATHER DATA---------------------------
-# gather the climate zone's weaher data and create T_Mains - which only includes one temperature for each day of the year (is 365 long)
-# do this for every requested climate zone
-
-# with CodeTimer('all weather data work'): #for testing
-Zones_Dict = {}  # dictionary to store the T_mains data by climate zone
-for each in New_Climate_Zones:
-    start_text = (
-        "CTZ0" if len(str(each)) == 1 else "CTZ"
-    )  # Identifying the correct file is done differently if the climate zone number is less than 10
-    File_WeatherData = (
-        os.sep + start_text + str(each) + "S13b.CSW"
-    )  # Create a string stating the location of the weather file. Note the 0 following CTZ in climate zones < 10
-    Path_WeatherData = (
-        Folder_WeatherData + File_WeatherData
-    )  # Combine Folder and File to create a path stating the location of the weather data
-    WeatherData = pd.read_csv(
-        Path_WeatherData, header=26, usecols=["Hour", "T Ground", "31-day Avg lag DB"]
-    )  # Read the weather data, ignoring the first 25 lines of header
+# gather the mains water temperature for every climate zone as a (16 x 365) array. Row 0 is climate zone 1, column 0 is Jan 1
 
-    First_Hour = WeatherData[
-        WeatherData["Hour"] == 1
-    ]  # filter data to only include the fist hour of every day
-    First_Hour = First_Hour.set_index(
-        [pd.Index(range(365))]
-    )  # set index as zero-based day of year
-    T_Mains = (
-        0.65 * First_Hour["T Ground"] + 0.35 * First_Hour["31-day Avg lag DB"]
-    )  # Equation 10, ACM, Appendix B. Returns the mains water temperature as a function of the ground temper
-    Zones_Dict[each] = T_Mains
+T_Mains_AllZones = Weather_Data.Read_TMains_AllZones(Folder_WeatherData)
 
 # %%---------------------------GENERATE AND SAVE REQUESTED DRAW PROFILES---------
-Data = pd.read_csv(File_Location)  # Read the file to be converted
+with Instrumentation.Stage("Load") as Record:
+    Data = pd.read_csv(File_Location)  # Read the file to be converted
+    Record.Rows_Out = len(Data)
 proper_order = Data.columns.to_list()  # reference correct column order
-for each in New_Climate_Zones:  # repeat for each new zone required
-    with CodeTimer("converting to climate zone {0} complete, it".format(each)):
-        del Data["Fraction Hot Water"]  # we are going to recalculate this column
-        del Data["Hot Water Volume (gal)"]  # we are going to recalculate this column
-        del Data["Hot Water Flow Rate (gpm)"]  # we are going to recalculate this column
-        del Data["Mains Temperature (deg F)"]  # we are going to recalculate this column
 
-        Zone_T_Mains = Zones_Dict[
-            each
-        ]  # get T_Mains Temperature data from previously created dictionary
-        if (
-            len(Data) > 40000
-        ):  # use swifter module to speed up coed if it's a long file, because swifter actually slows it down if it's below this threshold
-            # with CodeTimer('swap climate data (swifter)'): #for testing
-            Data["Mains Temperature (deg F)"] = Data.swifter.apply(
-                lambda x: Zone_T_Mains[x["Day of Year (Day)"] - 1], axis=1
-            )
-        else:  # do not use swifter module to speed up code if it's a short file
-            # with CodeTimer('swap climate data (vanilla .apply)'): #for testing
-            Data["Mains Temperature (deg F)"] = Data.apply(
-                lambda x: Zone_T_Mains[x["Day of Year (Day)"] - 1], axis=1
-            )
-        # recalculate the fileds that were caluclated using the ground temperature (T_Mains):
+Day_Index = (
+    Data["Day of Year (Day)"].to_numpy().astype(int) - 1
+)  # zero-based day of year of each draw, used to index into T_Mains_AllZones
+Fixtures = Data["Fixture"].to_numpy()
+Flow_Rate = Data["Flow Rate (gpm)"].to_numpy()
+Duration = Data["Duration (min)"].to_numpy()
+
+Climate_Columns = [
+    "Mains Temperature (deg F)",
+    "Fraction Hot Water",
+    "Hot Water Flow Rate (gpm)",
+    "Hot Water Volume (gal)",
+]  # The columns that depend on the climate zone
+Stored = {}  # The climate dependent columns of the zones found in the cache
+if Use_Cache == "Yes":
+    Cache = Result_Cache.Result_Cache(Folder_Cache, Cache_Size)
+    Cache_Keys = {
+        each: Result_Cache.Cache_Key(
+            {
+                "Result": "Climate_Zone",
+                "ClimateZone": each,
+                "Temperatures": [
+                    Temperature_Supply_Hot_AtFixture,
+                    Temperature_Bath,
+                    Temperature_Shower,
+                ],
+            },
+            Files=[
+                File_Location,
+                os.path.join(Folder_WeatherData, Weather_Data.Weather_File_Name(each)),
+            ],
+            Functions=[
+                Hot_Water_Calculations.Calculate_Fraction_HotWater_Array,
+                Hot_Water_Calculations.Calculate_FlowWater_Hot_Array,
+            ],
+        )
+        for each in New_Climate_Zones
+    }
+    for each in New_Climate_Zones:
+        Columns = Cache.Get(Cache_Keys[each])
+        if Columns is not None:
+            Stored[each] = Columns
+Remaining_Zones = [
+    each for each in New_Climate_Zones if each not in Stored
+]  # The zones that need to be calculated
+
+if (
+    All_Zones_One_Pass == True and len(Remaining_Zones) > 0
+):  # calculate the hot water columns for every remaining zone at once as (zones x draws) arrays
+    with Instrumentation.Stage("Hot Fraction", len(Data), Zones=Remaining_Zones):
+        T_Mains_Draws = T_Mains_AllZones[np.array(Remaining_Zones) - 1][
+            :, Day_Index
+        ]  # mains temperature of every draw in every new zone
+        Fraction_HotWater = Hot_Water_Calculations.Calculate_Fraction_HotWater_Array(
+            Fixtures,
+            T_Mains_Draws,
+            Temperature_Supply_Hot_AtFixture,
+            Temperature_Bath,
+            Temperature_Shower,
+        )
+        Flow_Rate_Hot, Volume_Hot = Hot_Water_Calculations.Calculate_FlowWater_Hot_Array(
+            Fraction_HotWater, Flow_Rate, Duration
+        )
+
+Zone_Progress = Progress.Progress("Climate zones", len(New_Climate_Zones), "zones")
 
-        # with CodeTimer('manipulate weather dataframe'):  #for testing
-        Data = Calculate_Fraction_HotWater(
-            Temperature_Supply_Hot_AtFixture, Data
-        )  # Calculate the fraction of hot water for each draw in the draw profile
-        Data = Calculate_FlowWater_Hot(
-            Data
-        )  # Calculate the flow of hot water for each draw in the draw profile
+for each in New_Climate_Zones:  # repeat for each new zone required
+    Zone_Progress.Update(Rows=len(Data))
+    with Instrumentation.Stage("Convert", len(Data), Zone=each):
+        if each in Stored:  # use the columns stored by an earlier conversion
+            for Column in Climate_Columns:
+                Data[Column] = Stored[each][Column]
+        elif All_Zones_One_Pass == True:  # take this zone's row of the arrays calculated above
+            Zone_Number = Remaining_Zones.index(each)
+            Data["Mains Temperature (deg F)"] = T_Mains_Draws[Zone_Number]
+            Data["Fraction Hot Water"] = Fraction_HotWater[Zone_Number]
+            Data["Hot Water Flow Rate (gpm)"] = Flow_Rate_Hot[Zone_Number]
+            Data["Hot Water Volume (gal)"] = Volume_Hot[Zone_Number]
+        else:  # calculate one zone at a time, keeping memory use at a single copy of the profile
+            Data["Mains Temperature (deg F)"] = T_Mains_AllZones[each - 1][
+                Day_Index
+            ]  # look up the mains temperature of each draw by day of year
+            Data[
+                "Fraction Hot Water"
+            ] = Hot_Water_Calculations.Calculate_Fraction_HotWater_Array(
+                Fixtures,
+                Data["Mains Temperature (deg F)"].to_numpy(),
+                Temperature_Supply_Hot_AtFixture,
+                Temperature_Bath,
+                Temperature_Shower,
+            )  # recalculate the fields that were caluclated using the ground temperature (T_Mains)
+            (
+                Data["Hot Water Flow Rate (gpm)"],
+                Data["Hot Water Volume (gal)"],
+            ) = Hot_Water_Calculations.Calculate_FlowWater_Hot_Array(
+                Data["Fraction Hot Water"].to_numpy(), Flow_Rate, Duration
+            )
+        if Use_Cache == "Yes" and each not in Stored:
+            Cache.Put(Cache_Keys[each], Data[Climate_Columns].copy())
         # reorder
         Data = Data[proper_order]
 
+        if Output_Format == "Parquet":  # write the zone into its own partition of the dataset
+            Columnar_Output.Write_Profile_Dataset(
+                Data,
+                os.path.join(os.path.dirname(Folder_Output), "Parquet"),
+                dict(Specifier_Dict, CZ=each),
+            )
+            continue
+
         Output_File_Name = File.replace(
             "CZ={}".format(ClimateZone), "CZ={}".format(each)
         )  # specify new climate zone in the file name
-        with CodeTimer(
-            "csv data to file for climate zone {0}".format(each)
-        ):  # for testing
-            Data.to_csv(Folder_Output.replace(File, Output_File_Name), index=False)
-
-print("time to run = {}".format(time.time() - start_time))
+        Fast_CSV_Writer.Write_CSV(
+            Data,
+            Folder_Output.replace(File, Output_File_Name),
+            Precision=CSV_Precision,
+        )
+        Profile_Catalog.Register_Profile(
+            Folder_Output.replace(File, Output_File_Name), Data
+        )  # Record the converted profile in the catalog stored alongside the outputs
+
+Zone_Progress.Close()
+Instrumentation.Print_Summary()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 09:41:52 2026
+
+This script builds the daily profile catalog used to assemble annual draw
+profiles: the daily profiles in SourceData with the clotheswasher corrections
+applied once, instead of on every dwelling assembled from them.
+
+Two corrections are made to CWSH draws:
+    -Reduce_Clothes - Flow rates and durations above the upper bound defined
+        by 1.5 IQR (Q3 + 1.5 * (Q3 - Q1)) are replaced with the average value
+        of the CWSH draws within the bound, rounded to the precision of the
+        source data. The bounds are calculated from the CWSH draws of each
+        data set. For the 2019 data set they are the values published in the
+        Draw Analysis in Source Data (2.9615 gpm and 1.2543 gpm, 7.1675 min
+        and 1.9635 min)
+    -Multiplier_Clotheswasher - Durations are increased by the multiplier to
+        match CBECC calculations, as Create_Dwelling_Profile in
+        T24_Draw_Profile_Generator.py did after assembling each dwelling.
+        Hot water volumes calculated from the catalog include it
+
+Build_Daily_Profiles returns the corrected catalog and its metadata: the
+quartiles, bound, replacement value and number of draws replaced for each
+column, and the multiplier applied. Read_Clean_Daily_Profiles reads and builds
+the catalog of a data set once per process. The catalog it returns is shared,
+so callers must copy it before changing it.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import numpy as np
+from functools import lru_cache
+
+# %%--------------------CONSTANTS------------------------
+
+Clotheswasher_Columns = [
+    "Flow Rate (gpm)",
+    "Duration (min)",
+]  # The columns of CWSH draws corrected by Reduce_Clothes
+IQR_Factor = 1.5  # Values above Q3 + IQR_Factor * IQR are outliers
+Replacement_Decimals = 4  # The precision of the source data
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Clotheswasher_Bounds(Daily_Profiles):
+    """
+    Returns the 1.5 IQR bound of each column in Clotheswasher_Columns,
+    calculated from the CWSH draws of Daily_Profiles (uncorrected source
+    data). Each entry holds Q1, Q3, the upper bound, the replacement value and
+    the number of daily profile rows above the bound.
+    """
+
+    Clothes = Daily_Profiles[Daily_Profiles["Fixture"] == "CWSH"]
+    Bounds = {}
+    for Column in Clotheswasher_Columns:
+        Values = Clothes[Column]
+        Q1, Q3 = Values.quantile([0.25, 0.75])
+        Upper_Bound = Q3 + IQR_Factor * (Q3 - Q1)
+        Bounds[Column] = {
+            "Q1": float(Q1),
+            "Q3": float(Q3),
+            "Upper_Bound": float(Upper_Bound),
+            "Replacement": round(
+                float(Values[Values <= Upper_Bound].mean()), Replacement_Decimals
+            ),
+            "Replaced": int((Values > Upper_Bound).sum()),
+        }
+    return Bounds
+
+
+def Build_Daily_Profiles(
+    Daily_Profiles, Reduce_Clothes=True, Multiplier_Clotheswasher=1
+):
+    """
+    Returns a copy of Daily_Profiles (uncorrected source data) with the
+    clotheswasher corrections applied, and the metadata describing them.
+    """
+
+    Daily_Profiles = Daily_Profiles.copy()
+    Clothes = (Daily_Profiles["Fixture"] == "CWSH").to_numpy()
+    Metadata = {
+        "Reduce_Clothes": bool(Reduce_Clothes),
+        "Multiplier_Clotheswasher": Multiplier_Clotheswasher,
+        "Bounds": {},
+    }
+
+    if Reduce_Clothes == True:
+        Metadata["Bounds"] = Clotheswasher_Bounds(Daily_Profiles)
+        for Column, Bound in Metadata["Bounds"].items():
+            Daily_Profiles.loc[
+                Clothes & (Daily_Profiles[Column] > Bound["Upper_Bound"]), Column
+            ] = Bound["Replacement"]
+
+    Duration = Daily_Profiles["Duration (min)"].to_numpy(dtype=float)
+    Daily_Profiles["Duration (min)"] = np.where(
+        Clothes, Duration + Duration * (Multiplier_Clotheswasher - 1), Duration
+    )  # Calculated as Create_Dwelling_Profile did, so the durations are identical
+
+    return Daily_Profiles, Metadata
+
+
+@lru_cache(maxsize=None)
+def Read_Clean_Daily_Profiles(
+    Version, Building_Type="Single", Reduce_Clothes=True, Multiplier_Clotheswasher=1
+):
+    # Returns the corrected daily profiles of a version of the data set and their metadata, building them the first time. Don't modify the returned data frame
+    from SingleDay_DrawProfile_Generator import (
+        Read_Daily_Profiles,
+    )  # Imported here because SingleDay_DrawProfile_Generator imports T24_Draw_Profile_Generator, which imports this module
+
+    return Build_Daily_Profiles(
+        Read_Daily_Profiles(Version, Building_Type),
+        Reduce_Clothes,
+        Multiplier_Clotheswasher,
+    )
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Oct 22 09:26:14 2026
+
+This script creates a day index for timestep-based draw profiles: the position
+of the first and last timestep of each day. Selecting a day with
+Profile.loc[Profile.index.date == Date] creates a date object for every
+timestep (~2 million at 15 seconds) each time it is called. With a day index,
+selecting any day or range of days is a positional slice.
+
+    Days = Day_Index.Calculate_Day_Index(Profile.index)
+    Day_Profile = Profile.iloc[Day_Index.Day_Slice(Days, datetime.date(2022, 6, 1))]
+
+Event_To_Timestep_Converter.py saves the day index of each output next to the
+profile ('[profile name]_Days.json'), and TimestepBased_Compiler.py reads it
+rather than recalculating it.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import numpy as np
+import os
+import json
+
+import Profile_Catalog
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Calculate_Day_Index(Index):
+    """
+    Returns a data frame indexed by date, with the position of the first
+    timestep of each day ('Start') and the position after its last timestep
+    ('End'). Index must be a sorted datetime index.
+    """
+
+    Days = np.asarray(Index, dtype="datetime64[ns]").astype("datetime64[D]")
+    Starts = np.flatnonzero(np.r_[True, Days[1:] != Days[:-1]])[
+        : len(Days)
+    ]  # Positions where the date changes
+
+    return pd.DataFrame(
+        {"Start": Starts, "End": np.r_[Starts[1:], len(Days)].astype(int)},
+        index=pd.DatetimeIndex(Days[Starts]),
+    )
+
+
+def Day_Slice(Days, First_Date, Last_Date=None):
+    # Returns the positional slice of the timesteps from First_Date through Last_Date (inclusive). Last_Date defaults to First_Date
+    Last_Date = First_Date if Last_Date is None else Last_Date
+    return slice(
+        int(Days.at[pd.Timestamp(First_Date), "Start"]),
+        int(Days.at[pd.Timestamp(Last_Date), "End"]),
+    )
+
+
+def Day_Index_Path(Path):
+    return Profile_Catalog._Strip_Extension(Path) + "_Days.json"
+
+
+def Write_Day_Index(Days, Path):
+    # Saves the day index of the profile at Path next to it
+    with open(Day_Index_Path(Path), "w") as Index_File:
+        json.dump(
+            {
+                "Dates": Days.index.strftime("%Y-%m-%d").tolist(),
+                "Start": Days["Start"].tolist(),
+                "End": Days["End"].tolist(),
+            },
+            Index_File,
+        )
+
+    return Day_Index_Path(Path)
+
+
+def Read_Day_Index(Path, Index=None):
+    """
+    Reads the day index saved next to the profile at Path. If there isn't one,
+    calculates it from Index, the datetime index of the profile, instead.
+    """
+
+    if not os.path.exists(Day_Index_Path(Path)):
+        if Index is None:
+            raise FileNotFoundError(
+                "{} has no day index. Pass the profile index to calculate it".format(Path)
+            )
+        return Calculate_Day_Index(Index)
+
+    with open(Day_Index_Path(Path)) as Index_File:
+        Saved = json.load(Index_File)
+
+    return pd.DataFrame(
+        {"Start": Saved["Start"], "End": Saved["End"]},
+        index=pd.DatetimeIndex(Saved["Dates"]),
+    )
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 21 10:12:48 2026
+
+This script selects representative design days from compiled timestep-based
+building profiles. TimestepBased_Compiler.py previously used low, medium and
+high design days that were chosen by hand in a notebook for each building size.
+
+Select_Design_Days calculates the daily and peak hour hot water volume of every
+building at once from the (buildings x timesteps) array of building totals,
+then picks the day whose volume is closest to each requested percentile. By
+default the 10th, 50th and 90th percentile days of daily volume are used as the
+low, medium and high days. Design days can instead be ranked by peak hour
+volume, which is more relevant when sizing for storage recovery.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import numpy as np
+
+import Day_Index
+
+# %%--------------------CONSTANTS------------------------
+
+Default_Percentiles = {
+    "Low": 10,
+    "Medium": 50,
+    "High": 90,
+}  # The percentile of each design day
+Metrics = ["Daily", "Peak_Hour"]  # The volumes design days can be ranked by
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def _Hour_Starts(Index):
+    # Returns the position of the first timestep in each hour of a sorted datetime index, and the hour of each
+    Hours = np.asarray(Index, dtype="datetime64[ns]").astype("datetime64[h]")
+    Starts = np.flatnonzero(np.r_[True, Hours[1:] != Hours[:-1]])[: len(Hours)]
+    return Starts, Hours[Starts]
+
+
+def Calculate_Daily_Volumes(Index, Volumes, Days=None):
+    """
+    Returns the dates, the daily volume and the peak hour volume of each day in
+    one pass. Index is the datetime index of the profiles and Volumes is a
+    (buildings x timesteps) array. The volumes are (buildings x days) arrays.
+    Days is the day index of the profiles (see Day_Index.py), calculated from
+    Index if not provided.
+    """
+
+    Volumes = np.atleast_2d(Volumes)
+
+    if Days is None:
+        Days = Day_Index.Calculate_Day_Index(Index)
+    Day_Starts = Days["Start"].to_numpy()
+    Days = Days.index.to_numpy().astype("datetime64[D]")
+    Hour_Starts, Hours = _Hour_Starts(Index)
+
+    Daily = np.add.reduceat(Volumes, Day_Starts, axis=1)
+    Hourly = np.add.reduceat(Volumes, Hour_Starts, axis=1)
+    Hour_Day_Starts = np.searchsorted(
+        Hours.astype("datetime64[D]"), Days
+    )  # The first hour of each day
+    Peak_Hour = np.maximum.reduceat(Hourly, Hour_Day_Starts, axis=1)
+
+    return pd.to_datetime(Days).date, Daily, Peak_Hour
+
+
+def Select_Design_Days(
+    Index, Volumes, Percentiles=Default_Percentiles, Metric="Daily", Days=None
+):
+    """
+    Selects a design day for each percentile in Percentiles for each building
+    in Volumes, a (buildings x timesteps) array. The design day is the day
+    whose Metric ('Daily' or 'Peak_Hour' volume) is closest to that
+    percentile of all days. Returns a list with one dictionary of
+    {design day name: date} per building, and a data frame summarizing the
+    selected days. Days is passed to Calculate_Daily_Volumes.
+    """
+
+    if Metric not in Metrics:
+        raise ValueError("Metric must be one of {}".format(Metrics))
+
+    Dates, Daily, Peak_Hour = Calculate_Daily_Volumes(Index, Volumes, Days)
+    Ranked = Daily if Metric == "Daily" else Peak_Hour
+
+    Names = list(Percentiles.keys())
+    Targets = np.percentile(
+        Ranked, [Percentiles[Name] for Name in Names], axis=1
+    )  # (percentiles x buildings)
+    Selected = np.abs(Ranked[np.newaxis, :, :] - Targets[:, :, np.newaxis]).argmin(
+        axis=2
+    )  # The day closest to each percentile, (percentiles x buildings)
+
+    Design_Days = [
+        {Name: Dates[Selected[Number, Building]] for Number, Name in enumerate(Names)}
+        for Building in range(Ranked.shape[0])
+    ]
+
+    Buildings, Percentile_Numbers = np.meshgrid(
+        range(Ranked.shape[0]), range(len(Names)), indexing="ij"
+    )
+    Selected_Days = Selected.T.ravel()
+    Summary = pd.DataFrame(
+        {
+            "Building": Buildings.ravel(),
+            "Design Day": np.array(Names)[Percentile_Numbers.ravel()],
+            "Percentile": [Percentiles[Names[Number]] for Number in Percentile_Numbers.ravel()],
+            "Date": Dates[Selected_Days],
+            "Daily Volume": Daily[Buildings.ravel(), Selected_Days],
+            "Peak Hour Volume": Peak_Hour[Buildings.ravel(), Selected_Days],
+        }
+    )
+
+    return Design_Days, Summary
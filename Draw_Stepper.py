@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 28 09:47:15 2026
+
+This script steps through an event-based draw profile one timestep at a time,
+for simulators that ask for the draws of the next timestep only (E.g. HPWH
+controller co-simulations). They previously had to convert the whole year
+with Event_To_Timestep_Converter.py, or read a converted year from
+DrawProfiles, before running.
+
+Draw_Stepper keeps only the draws active in the current timestep, so memory
+does not grow with the number of steps, and draws continue across day (and
+timestep) boundaries. Each step returns the draw volume, the mains water
+temperature and the outdoor dry bulb temperature of the timestep:
+
+    Stepper = Draw_Stepper(Dwelling_Profile, Timestep=60, ClimateZone=3)
+    for Step in Stepper:
+        ...
+    Stepper.Seek(200 * 24 * 60)  # Jump to midnight starting day of year 200 (zero-based)
+    Step = next(Stepper)
+    Stepper.Advance(60)  # Skip the next hour
+
+Profiles can be individual dwellings or buildings. A list of profiles is
+combined by adding their draws. The volumes match those calculated by
+Bin_Draws in Event_To_Timestep_Converter.py.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import numpy as np
+from collections import namedtuple
+
+import Weather_Data
+import Conversions
+
+# %%--------------------CONSTANTS------------------------
+
+Draw_Step = namedtuple(
+    "Draw_Step",
+    ["Step", "Time", "Volume", "Mains_Temperature", "Outdoor_Temperature"],
+)  # Time is the start of the timestep in hours since midnight on Jan 1. Temperatures are deg F
+Hours_In_Year = 8760
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+class Draw_Stepper:
+    """
+    Iterates over the timesteps of an event-based draw profile. Timestep is in
+    seconds. Flow_Column is the flow rate used for the volume (E.g. 'Flow Rate
+    (gpm)' for mixed water), and Start_Column the start of each draw in hours
+    since midnight on Jan 1. Volumes are in gallons, or liters if SI = True.
+    Iteration stops after Number_Steps steps, one year by default. Times after
+    the end of the year use the weather of the same time in the year.
+    """
+
+    def __init__(
+        self,
+        Profile,
+        Timestep=15,
+        ClimateZone=3,
+        Flow_Column="Hot Water Flow Rate (gpm)",
+        Start_Column="Start Time of Year (hr)",
+        SI=False,
+        Number_Steps=None,
+    ):
+        if isinstance(Profile, list):
+            Profile = pd.concat(Profile)
+
+        Start = Profile[Start_Column].to_numpy(dtype=float)
+        Order = np.argsort(Start, kind="stable")
+        self.Start = Start[Order]
+        self.End = (
+            self.Start
+            + Profile["Duration (min)"].to_numpy(dtype=float)[Order]
+            / Conversions.minutes_in_hour
+        )
+        self.Flow_Rate = Profile[Flow_Column].to_numpy(dtype=float)[Order] * (
+            Conversions.L_in_gal if SI == True else 1
+        )  # Volume per minute
+        self.Longest = (self.End - self.Start).max() if len(self.Start) > 0 else 0
+
+        self.Timestep_Hours = Timestep / (
+            Conversions.seconds_in_minute * Conversions.minutes_in_hour
+        )
+        self.Number_Steps = (
+            int(round(Hours_In_Year / self.Timestep_Hours))
+            if Number_Steps is None
+            else Number_Steps
+        )
+        self.T_Mains = Weather_Data.Read_TMains(ClimateZone).to_numpy()
+        self.T_Outdoor = Weather_Data.Read_Outdoor_Temperature(ClimateZone)
+
+        self.Seek(0)
+
+    def Seek(self, Step):
+        # Moves to the start of timestep Step. Only the draws near it are searched
+        Time = Step * self.Timestep_Hours
+        self.Step = Step
+        self.Next = int(
+            np.searchsorted(self.Start, Time, side="left")
+        )  # The first draw starting at or after Time
+        First = int(np.searchsorted(self.Start, Time - self.Longest, side="left"))
+        self.Active = [
+            Draw for Draw in range(First, self.Next) if self.End[Draw] > Time
+        ]  # Draws that started earlier and are still running
+        return self
+
+    def Advance(self, Steps=1):
+        # Skips the next Steps timesteps without calculating them
+        return self.Seek(self.Step + Steps)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.Step >= self.Number_Steps:
+            raise StopIteration
+
+        Time_Start = self.Step * self.Timestep_Hours
+        Time_End = Time_Start + self.Timestep_Hours
+        while self.Next < len(self.Start) and self.Start[self.Next] < Time_End:
+            self.Active.append(self.Next)  # Draws starting during this timestep
+            self.Next += 1
+
+        Volume = 0.0
+        for Draw in self.Active:
+            Volume += (
+                (min(self.End[Draw], Time_End) - max(self.Start[Draw], Time_Start))
+                * Conversions.minutes_in_hour
+                * self.Flow_Rate[Draw]
+            )  # The part of the draw inside this timestep
+        self.Active = [Draw for Draw in self.Active if self.End[Draw] > Time_End]
+
+        Hour = int(Time_Start) % Hours_In_Year
+        Step = Draw_Step(
+            self.Step,
+            Time_Start,
+            Volume,
+            float(self.T_Mains[Hour // 24]),
+            float(self.T_Outdoor[Hour]),
+        )
+        self.Step += 1
+        return Step
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 14:05:37 2026
+
+This script writes draw profiles as tables for the Modelica CombiTimeTable
+block used in Dymola. TimestepBased_Compiler.py previously built each table by
+copying the profile, calculating the time column through temporary columns
+and concatenating a header data frame onto it before writing the text.
+
+Write_Table writes the table directly from arrays in a single pass:
+    -Text tables ('.txt') use the same layout as the previous exporter:
+        '#1', 'double tab1(rows,columns)' and one tab separated row per
+        timestep, written in chunks of Chunk_Size rows so memory use does not
+        grow with the length of the profile
+    -MATLAB v4 tables ('.mat') store the same matrix as binary doubles. Dymola
+        reads these much faster than large text tables. Use the same
+        tableName ('tab1') and set fileName to the .mat file in the
+        CombiTimeTable block
+
+The first column of the table is the time in seconds since the first timestep.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import numpy as np
+import struct
+
+# %%--------------------CONSTANTS------------------------
+
+Table_Name = "tab1"  # The tableName used in the CombiTimeTable block
+Default_Chunk_Size = 100000  # Number of rows formatted and written at a time
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Calculate_Time(Index):
+    # Returns the time of each timestep in whole seconds since the first timestep, the same as the cumulative sum of the timestep lengths
+    Seconds = np.asarray(Index, dtype="datetime64[ns]").astype(np.int64) // 10**9
+    return Seconds - Seconds[0] if len(Seconds) > 0 else Seconds
+
+
+def _Write_Text(Path, Time, Columns, Name, Precision, Chunk_Size):
+    Code = "%r" if Precision is None else "%.{}f".format(int(Precision))
+    Template = "\t".join(["%d"] + [Code] * len(Columns))
+    Padding = "\t" * (len(Columns) - 1)
+
+    with open(Path, "w", newline="") as File:
+        File.write("#1" + "\t" + Padding + "\n")
+        File.write(
+            "double\t{}({},{}){}\n".format(Name, len(Time), len(Columns) + 1, Padding)
+        )
+        for Start in range(0, len(Time), Chunk_Size):
+            Rows = zip(
+                Time[Start : Start + Chunk_Size].tolist(),
+                *[Column[Start : Start + Chunk_Size].tolist() for Column in Columns]
+            )
+            File.write("\n".join([Template % Row for Row in Rows]) + "\n")
+
+
+def _Write_MAT(Path, Time, Columns, Name):
+    # MATLAB v4 format: a 20 byte header, the variable name and the matrix in column-major order
+    Encoded_Name = Name.encode("ascii") + b"\x00"
+
+    with open(Path, "wb") as File:
+        File.write(
+            struct.pack(
+                "<5i", 0, len(Time), len(Columns) + 1, 0, len(Encoded_Name)
+            )  # Type 0 is a full, real, little-endian matrix of doubles
+        )
+        File.write(Encoded_Name)
+        for Column in [Time] + Columns:  # Each column is already contiguous, so it can be written directly
+            File.write(np.ascontiguousarray(Column, dtype="<f8").tobytes())
+
+
+def Write_Table(
+    Path,
+    Time,
+    Columns,
+    Name=Table_Name,
+    Precision=None,
+    Chunk_Size=Default_Chunk_Size,
+):
+    """
+    Writes a CombiTimeTable table to Path. Time is the time of each row in
+    seconds (see Calculate_Time), Columns is a list of arrays of the same
+    length, one for each table column after time. Paths ending in '.mat' are
+    written as MATLAB v4 files, all others as text. Precision is the number of
+    decimal places written to text tables. None writes full precision.
+    """
+
+    Time = np.asarray(Time)
+    Columns = [np.asarray(Column, dtype=float) for Column in Columns]
+
+    if Path.endswith(".mat"):
+        _Write_MAT(Path, Time, Columns, Name)
+    else:
+        _Write_Text(Path, Time, Columns, Name, Precision, Chunk_Size)
+
+    return Path
+
+
+def Write_Profile(Path, Profile, Columns, Name=Table_Name, Precision=None):
+    # Writes the listed columns of a timestep-based profile with a datetime index as a CombiTimeTable table
+    return Write_Table(
+        Path,
+        Calculate_Time(Profile.index),
+        [Profile[Column].to_numpy() for Column in Columns],
+        Name=Name,
+        Precision=Precision,
+    )
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 30 14:02:37 2026
+
+This script generates ensembles of stochastic annual draw profiles for
+diversity factor and peak demand studies. The CEC data set only has 5 single
+family and 60 multi-family annual profiles, and T24_Draw_Profile_Generator.py
+cycles through multi-family variants a-j, so a building with more than 10
+dwellings with the same number of bedrooms repeats identical years.
+
+Each realization samples the day code of every date from the pool of codes
+that dwellings of the same type use on days of the same type (weekday,
+weekend or holiday) in the CEC annual profiles. For instance, a 2 bedroom
+multi-family dwelling samples its weekdays from the weekdays of DHW2BRa
+through DHW2BRj. Realizations therefore have the same distribution of
+occupancy levels and daily volumes as the CEC profiles, on the calendar of
+the target years (see Annual_Synthesis.py).
+
+Ensembles are reproducible: the realizations are generated in chunks of
+Chunk_Size, and chunk n always uses the n'th random stream spawned from Seed.
+The results depend on Seed and Chunk_Size, not on the number of processes.
+Day codes are sampled for a whole chunk at once, and chunks run in parallel
+processes.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+import Annual_Synthesis
+import Progress
+import Daily_Profile_Catalog
+from Event_To_Timestep_Converter import Bin_Draws
+from T24_Draw_Profile_Generator import Modify_Profile_SDLM, Multiplier_Clotheswasher
+
+# %%--------------------CONSTANTS------------------------
+
+Default_Chunk_Size = 50  # Realizations sampled and assembled together
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Day_Type_Pools(Building_Type, NumberBedrooms_Dwelling, Version=2019):
+    """
+    Returns a dictionary of {day type: array of day codes} with every code
+    used on days of that type by the annual profiles of the dwelling type.
+    Codes appear as often as they do in the annual profiles.
+    """
+
+    Annual_Profiles = Annual_Synthesis.Read_Annual_Profiles(Version, Building_Type)
+    Name = Annual_Synthesis.Annual_Profile_Name(
+        Building_Type, NumberBedrooms_Dwelling, ""
+    )
+    Columns = [
+        Column
+        for Column in Annual_Profiles.columns
+        if Column == Name or (Building_Type == "Multi" and Column[:-1] == Name)
+    ]  # Multi-family dwellings pool all variants
+    if len(Columns) == 0:
+        raise ValueError(
+            "There are no {} family annual profiles for {} bedrooms".format(
+                Building_Type, NumberBedrooms_Dwelling
+            )
+        )
+
+    Codes = Annual_Profiles[Columns].to_numpy(dtype=str).ravel()
+    Types = np.array([Code[1] for Code in Codes])
+    return {Type: Codes[Types == Type] for Type in Annual_Synthesis.Day_Types}
+
+
+def Sample_Day_Codes(Pools, Dates, Number_Realizations, Random, Holidays=None):
+    # Returns a (realizations x dates) array of day codes sampled from the pool of each date's day type
+    Types = Annual_Synthesis.Calculate_Day_Types(Dates, Holidays)
+    Codes = np.empty((Number_Realizations, len(Dates)), dtype="<U3")
+    # Day types are always sampled in the same order, so the samples are reproducible
+    for Type in Annual_Synthesis.Day_Types:
+        Mask = Types == Type
+        if Mask.any():
+            Codes[:, Mask] = Pools[Type][
+                Random.integers(
+                    0, len(Pools[Type]), size=(Number_Realizations, Mask.sum())
+                )
+            ]
+    return Codes
+
+
+def _Generate_Chunk(Chunk):
+    # Samples and assembles one chunk of realizations. Runs in a worker process
+    Random = np.random.default_rng(Chunk["Seed"])
+    Codes = Sample_Day_Codes(
+        Chunk["Pools"], Chunk["Dates"], Chunk["Size"], Random, Chunk["Holidays"]
+    )
+
+    Results = []
+    for Realization in range(Chunk["Size"]):
+        # Each worker process builds the daily profiles once. They include the clotheswasher corrections and Multiplier_Clotheswasher, as in T24_Draw_Profile_Generator.py
+        Daily_Profiles = Daily_Profile_Catalog.Read_Clean_Daily_Profiles(
+            Chunk["Version"], Chunk["Building_Type"], True, Multiplier_Clotheswasher
+        )[0]
+        Profile = Annual_Synthesis.Assemble_Annual_Profile(
+            pd.Series(Codes[Realization], index=Chunk["Dates"]),
+            Daily_Profiles,
+            Chunk["ClimateZone"],
+            Reduce_Clothes=False,
+        )
+        if Chunk["SquareFootage_Dwelling"] is not None:
+            Profile = Modify_Profile_SDLM(
+                Profile,
+                Chunk["SquareFootage_Dwelling"],
+                "Hot",
+                Chunk["Distribution_System_Type"],
+            )
+
+        if Chunk["Timestep"] is None:
+            Results.append(Profile)
+        else:
+            Number_Bins = int(len(Chunk["Dates"]) * 24 * 3600 / Chunk["Timestep"])
+            Results.append(
+                Bin_Draws(
+                    Profile["Start Time of Year (hr)"],
+                    Profile["Duration (min)"],
+                    Profile["Hot Water Flow Rate (gpm)"],
+                    Chunk["Timestep"],
+                    Number_Bins + int(24 * 3600 / Chunk["Timestep"]),
+                )[:Number_Bins].astype(np.float32)
+            )  # Draws continuing past midnight of the last day are cut off
+
+    return Codes, Results
+
+
+def Generate_Ensemble(
+    Building_Type,
+    NumberBedrooms_Dwelling,
+    ClimateZone,
+    Number_Realizations,
+    Seed=0,
+    Years=Annual_Synthesis.CEC_Year,
+    Version=2019,
+    Timestep=None,
+    SquareFootage_Dwelling=None,
+    Distribution_System_Type="Trunk and Branch",
+    Holidays=None,
+    Processes=None,
+    Chunk_Size=Default_Chunk_Size,
+):
+    """
+    Generates Number_Realizations annual hot water profiles of one dwelling
+    type for Years (a year or list of consecutive years). Returns the day
+    codes as a (realizations x dates) data frame and either a list of event
+    based profiles (Timestep = None) or a (realizations x timesteps) float32
+    array of the hot water volume (gal) in each timestep (Timestep in
+    seconds). SDLM is applied if SquareFootage_Dwelling is given.
+    Processes = 1 runs in this process.
+    """
+
+    Pools = Day_Type_Pools(Building_Type, NumberBedrooms_Dwelling, Version)
+    Years = np.atleast_1d(Years)
+    Dates = pd.date_range(
+        "{}-01-01".format(Years.min()), "{}-12-31".format(Years.max()), freq="D"
+    )
+
+    Sizes = [
+        min(Chunk_Size, Number_Realizations - Start)
+        for Start in range(0, Number_Realizations, Chunk_Size)
+    ]
+    Chunks = [
+        {
+            "Seed": Chunk_Seed,
+            "Size": Size,
+            "Pools": Pools,
+            "Dates": Dates,
+            "Holidays": Holidays,
+            "Version": Version,
+            "Building_Type": Building_Type,
+            "ClimateZone": ClimateZone,
+            "Timestep": Timestep,
+            "SquareFootage_Dwelling": SquareFootage_Dwelling,
+            "Distribution_System_Type": Distribution_System_Type,
+        }
+        for Size, Chunk_Seed in zip(
+            Sizes, np.random.SeedSequence(Seed).spawn(len(Sizes))
+        )
+    ]
+
+    Ensemble_Progress = Progress.Progress(
+        "Ensemble", Number_Realizations, "realizations"
+    )  # Chunks are reported as they finish, in order
+    Generated = []
+    if Processes == 1 or len(Chunks) <= 1:
+        for Chunk in Chunks:
+            Generated.append(_Generate_Chunk(Chunk))
+            Ensemble_Progress.Update(Chunk["Size"])
+    else:
+        with ProcessPoolExecutor(max_workers=Processes) as Executor:
+            for Chunk, Result in zip(Chunks, Executor.map(_Generate_Chunk, Chunks)):
+                Generated.append(Result)
+                Ensemble_Progress.Update(Chunk["Size"])
+    Ensemble_Progress.Close()
+
+    Day_Codes = pd.DataFrame(
+        np.vstack([Codes for Codes, Results in Generated]), columns=Dates
+    )
+    Results = [Result for Codes, Chunk_Results in Generated for Result in Chunk_Results]
+    if Timestep is not None:
+        Results = np.vstack(Results)
+
+    return Day_Codes, Results
@@ -25,23 +25,112 @@ except:
 
 sys.path.append(os.path.join(root, "..", "hpwhs", "Utilities"))
 import Conversions as Conversions
+import Profile_Catalog
+import Fast_CSV_Writer
+import Columnar_Output
+import Day_Index
+import Result_Cache
+import Weather_Data
+import Instrumentation
+import Progress
 
 # %%----------------------INPUTS----------------------------------------
 
 SI = True  # True = outputs in SI units, False = outputs in IP units
 
 Timestep = 15  # Desired output timestep in seconds
+CSV_Precision = 6  # Number of decimal places written to the .csv outputs. 6 keeps volumes to a millionth of a liter or gallon and writes much faster. None writes full precision, identical to DataFrame.to_csv
+Output_Format = "CSV"  # Either 'CSV' or 'Parquet'. 'Parquet' writes to a partitioned dataset in DrawProfiles\Timestep_Based\Parquet. Requires the pyarrow package
 Start = dt.datetime(2022, 1, 1, 0, 0, 0)  # Start datetime of the draw profile
 End = dt.datetime(2023, 1, 1, 0, 0, 0)  # End datetime of the draw profile
+Use_Cache = "No"  # Either 'Yes' or 'No'. 'Yes' stores each conversion in Folder_Cache and reuses it when the same profile is converted again with the same inputs. See Result_Cache.py
+Cache_Size = 5 * 1024**3  # Bytes. The least recently used conversions are deleted once the cache is larger than this
 
 # The path to the desired T24 draw profile
 Folder = os.path.join(root, "DrawProfiles")
 # File = 'Bldg=Single_CZ=3_Wat=Hot_Prof=2_SDLM=Yes_CFA=1897_Inc=FSCDB_Ver=2019.csv'
 Files = glob.glob(Folder + "/*.csv")
+Folder_Cache = os.path.join(Folder, "Cache")
 
 # %%----------------DEFINE CONVERSION FUNCTION------------------
 
 
+def Convertible_Profiles(Files):
+    """
+    Returns the files that are event-based draw profiles of one climate zone.
+    Other .csv files, and the climate-independent profiles ('CZ=Any') written
+    by Climate_Independent_Profiles.py, are skipped since they have no mains
+    water temperature to convert with.
+    """
+
+    Convertible = []
+    for File in Files:
+        try:
+            Parameters = Profile_Catalog.Parse_Profile_FileName(File)
+        except ValueError:
+            continue  # Not a draw profile
+        if Parameters["Format"] == "Event" and Parameters["CZ"] is not None:
+            Convertible.append(File)
+    return Convertible
+
+
+
+@Instrumentation.Timed("Bin")
+def Bin_Draws(Start_Time, Duration, Flow_Rate, Timestep, Number_Bins):
+    """
+    Returns the volume drawn during each timestep, for all draws at once.
+    Start_Time is the start of each draw (hr), Duration its length (min) and
+    Flow_Rate its flow rate (E.g. gpm), so volumes are in the units of
+    Flow_Rate * min. Draws are split between bins the same way as the per-draw
+    loops in this script: the start and end bins receive the part of the draw
+    inside them and every bin in between receives a full timestep.
+    """
+
+    Start_Time = np.asarray(Start_Time, dtype=float)
+    Duration = np.asarray(Duration, dtype=float)
+    Flow_Rate = np.asarray(Flow_Rate, dtype=float)
+
+    Timestep_Hours = Timestep / (Conversions.seconds_in_minute * Conversions.minutes_in_hour)
+    Timestep_Minutes = Timestep / Conversions.seconds_in_minute
+    End_Time = Start_Time + Duration / Conversions.minutes_in_hour
+
+    Bin_Start = np.floor(Start_Time / Timestep_Hours).astype(int)
+    Bin_End = np.floor(End_Time / Timestep_Hours).astype(int)
+    if len(Bin_End) > 0 and Bin_End.max() >= Number_Bins:
+        raise ValueError("Draws extend past the last of the {} timesteps".format(Number_Bins))
+
+    Time_Start_Bin = (
+        (Bin_Start + 1) * Timestep_Hours - Start_Time
+    ) * Conversions.minutes_in_hour  # Minutes of the draw in its start bin, if it continues into the next bin
+    Time_End_Bin = (
+        End_Time - Bin_End * Timestep_Hours
+    ) * Conversions.minutes_in_hour  # Minutes of the draw in its end bin
+    One_Bin = Bin_End == Bin_Start
+
+    Volume = np.bincount(
+        Bin_Start,
+        weights=np.where(One_Bin, Duration, Time_Start_Bin) * Flow_Rate,
+        minlength=Number_Bins,
+    )
+    Volume += np.bincount(
+        Bin_End, weights=np.where(One_Bin, 0, Time_End_Bin) * Flow_Rate, minlength=Number_Bins
+    )
+
+    # Full timesteps between the start and end bins, added as steps of a cumulative sum
+    Full_Bins = np.bincount(
+        Bin_Start + 1,
+        weights=np.where(One_Bin, 0, Flow_Rate * Timestep_Minutes),
+        minlength=Number_Bins + 1,
+    ) - np.bincount(
+        Bin_End,
+        weights=np.where(One_Bin, 0, Flow_Rate * Timestep_Minutes),
+        minlength=Number_Bins + 1,
+    )
+    Volume += np.cumsum(Full_Bins)[:Number_Bins]
+
+    return Volume
+
+
 def Convert_Profile_SingleDay(
     EventBased, Day_Of_Year, Timestep, ClimateZone, SI=True, interpolate=False
 ):
@@ -94,67 +183,14 @@ def Convert_Profile_SingleDay(
         columns=["Hot Water Draw Volume (gal)", "Mains Temperature (deg F)"],
     )
 
-    # For each draw in the T24 draw profile
-    for Draw in EventBased.index:
-        # Gather draw data from the event-based data set
-        Start_Time = Start + pd.Timedelta(
-            EventBased.loc[Draw, "Start time (hr)"], unit="h"
-        )
-        Duration = EventBased.loc[Draw, "Duration (min)"]
-        End_Time = (
-            EventBased.loc[Draw, "Start time (hr)"]
-            + Duration / Conversions.minutes_in_hour
-        )
-        Flow_Rate = EventBased.loc[Draw, "Hot Water Flow Rate (gpm)"]
-
-        # Identify the start/end bin and draw duration during each of those bins
-        Bin_Start = int(
-            np.floor(
-                EventBased.loc[Draw, "Start time (hr)"]
-                / (
-                    Timestep
-                    / (Conversions.seconds_in_minute * Conversions.minutes_in_hour)
-                )
-            )
-        )
-
-        Time_Start_Bin = (
-            TimestepBased.index[Bin_Start + 1] - Start_Time
-        ).total_seconds() / Conversions.seconds_in_minute
-
-        Bin_End = int(
-            np.floor(
-                End_Time
-                / (
-                    Timestep
-                    / (Conversions.seconds_in_minute * Conversions.minutes_in_hour)
-                )
-            )
-        )
-        End_Timestamp = Start + pd.Timedelta(End_Time, unit="h")
-        Time_End_Bin = (
-            End_Timestamp - TimestepBased.index[Bin_End]
-        ).total_seconds() / Conversions.seconds_in_minute
-
-        # Assign the hot water draw volume to each bin
-        if Bin_End == Bin_Start:
-            TimestepBased.loc[
-                TimestepBased.index[Bin_Start], "Hot Water Draw Volume (gal)"
-            ] += (Duration * Flow_Rate)
-        else:
-            TimestepBased.loc[
-                TimestepBased.index[Bin_Start], "Hot Water Draw Volume (gal)"
-            ] += (Time_Start_Bin * Flow_Rate)
-
-        if Bin_End - Bin_Start >= 1:  # If the draw doesn't end during the start bin
-            TimestepBased.loc[
-                TimestepBased.index[Bin_End], "Hot Water Draw Volume (gal)"
-            ] += (Time_End_Bin * Flow_Rate)
-        if Bin_End - Bin_Start >= 2:  # If there are bins between start and end
-            TimestepBased.loc[
-                TimestepBased.index[Bin_Start + 1] : TimestepBased.index[Bin_End - 1],
-                "Hot Water Draw Volume (gal)",
-            ] += Flow_Rate * (Timestep / Conversions.seconds_in_minute)
+    # Split each draw's hot water volume between the timesteps it overlaps
+    TimestepBased["Hot Water Draw Volume (gal)"] = Bin_Draws(
+        EventBased["Start time (hr)"],
+        EventBased["Duration (min)"],
+        EventBased["Hot Water Flow Rate (gpm)"],
+        Timestep,
+        len(TimestepBased.index),
+    )
 
     # Add mains temperature data to the output
     TimestepBased["Mains Temperature (deg F)"] = WeatherData["T_Mains"]
@@ -193,207 +229,176 @@ def Convert_Profile_SingleDay(
     return TimestepBased
 
 
-# %%----------------CONVERT PROFILES--------------------
+def Convert_Profile(EventBased, Timestep, ClimateZone, Start, End, SI=True):
+    """
+    Returns the timestep-based profile of an annual event-based profile from
+    Start to End, with the mains and outdoor temperatures of ClimateZone.
+    """
 
-if __name__ == "__main__":
-    for File in Files:
-        # Read the climate zone from the draw profile
-        ClimateZone = File.split("CZ=")[-1].split("_")[0]
+    # Read the CSE weather data
+    ClimateZone = str(ClimateZone)
+    if len(ClimateZone) < 2:
+        CZ = "0{}".format(ClimateZone)
+    else:
+        CZ = ClimateZone
 
-        # State the output folder
-        Output_Folder = os.path.join(root, "DrawProfiles", "Timestep_Based")
+    FileName = "CTZ{}S13b.CSW".format(CZ)
 
-        # %%---------------------READ WEATHER DATA----------------------------------
+    WeatherData = pd.read_csv(os.path.join(root, "WeatherFiles", FileName), skiprows=26)
 
-        # Read the CSE weather data
-        if len(ClimateZone) < 2:
-            CZ = "0{}".format(ClimateZone)
-        else:
-            CZ = ClimateZone
+    # Calculate the mains water temperature using CSE assumptions
+    # Equation 10, ACM, Appendix B. Returns the mains water temperature as a function of the ground temperature
+    WeatherData["T_Mains"] = (
+        0.65 * WeatherData["T Ground"] + 0.35 * WeatherData["31-day Avg lag DB"]
+    )
 
-        FileName = "CTZ{}S13b.CSW".format(CZ)
+    # Create datetime index, interpolate to desired timestep
+    WeatherData.loc[0, "Timestamp"] = dt.datetime(Start.year, 1, 1, 0)
+    WeatherData.loc[1:, "Timestamp"] = WeatherData.loc[
+        0, "Timestamp"
+    ] + pd.to_timedelta(WeatherData.index[1:], unit="h")
+    WeatherData.index = WeatherData["Timestamp"]
+    WeatherData = WeatherData.resample("{}S".format(Timestep)).interpolate(
+        method="ffill"
+    )
 
-        WeatherData = pd.read_csv(
-            os.path.join(root, "WeatherFiles", FileName), skiprows=26
-        )
+    # Create the timestep-based dataframe with the desired index
+    TimestepBased_Index = pd.date_range(
+        Start, End, freq="{}T".format(Timestep / Conversions.seconds_in_minute)
+    )
+    TimestepBased = pd.DataFrame(
+        0,
+        index=TimestepBased_Index,
+        columns=["Hot Water Draw Volume (gal)", "Mains Temperature (deg F)"],
+    )
 
-        # Calculate the mains water temperature using CSE assumptions
-        # Equation 10, ACM, Appendix B. Returns the mains water temperature as a function of the ground temperature
-        WeatherData["T_Mains"] = (
-            0.65 * WeatherData["T Ground"] + 0.35 * WeatherData["31-day Avg lag DB"]
-        )
+    # Split each draw's hot water volume between the timesteps it overlaps
+    TimestepBased["Hot Water Draw Volume (gal)"] = Bin_Draws(
+        EventBased["Start Time of Year (hr)"],
+        EventBased["Duration (min)"],
+        EventBased["Hot Water Flow Rate (gpm)"],
+        Timestep,
+        len(TimestepBased.index),
+    )
 
-        # Create datetime index, interpolate to desired timestep
-        WeatherData.loc[0, "Timestamp"] = dt.datetime(Start.year, 1, 1, 0)
-        WeatherData.loc[1:, "Timestamp"] = WeatherData.loc[
-            0, "Timestamp"
-        ] + pd.to_timedelta(WeatherData.index[1:], unit="h")
-        WeatherData.index = WeatherData["Timestamp"]
-        WeatherData = WeatherData.resample("{}S".format(Timestep)).interpolate(
-            method="ffill"
-        )
+    # Add mains temperature data to the output
+    TimestepBased["Mains Temperature (deg F)"] = WeatherData["T_Mains"]
+    TimestepBased["Mains Temperature (deg F)"] = TimestepBased[
+        "Mains Temperature (deg F)"
+    ].ffill()
 
-        # %%------------------DECLARE CONSTANTS------------------------------------
+    # Add outdoor temperature data to the output
+    TimestepBased["Outdoor Temperature (deg F)"] = WeatherData["Dry Bulb"]
+    TimestepBased["Outdoor Temperature (deg F)"] = TimestepBased[
+        "Outdoor Temperature (deg F)"
+    ].ffill()
 
-        # Read the event-based T24 darw profile
-        Path = os.path.join(Folder, File)
-        EventBased = pd.read_csv(Path)
+    # Add timestep data to the output
+    TimestepBased["Timestep (min)"] = Timestep / Conversions.seconds_in_minute
 
-        # Create the timestep-based dataframe with the desired index
-        TimestepBased_Index = pd.date_range(
-            Start, End, freq="{}T".format(Timestep / Conversions.seconds_in_minute)
+    # Convert to SI units
+    if SI == True:
+        TimestepBased["Hot Water Draw Volume (gal)"] = (
+            TimestepBased["Hot Water Draw Volume (gal)"] * Conversions.L_in_gal
         )
-        TimestepBased = pd.DataFrame(
-            0,
-            index=TimestepBased_Index,
-            columns=["Hot Water Draw Volume (gal)", "Mains Temperature (deg F)"],
+        TimestepBased["Mains Temperature (deg F)"] = (
+            TimestepBased["Mains Temperature (deg F)"] - 32
+        ) / 1.8
+        TimestepBased["Outdoor Temperature (deg F)"] = (
+            TimestepBased["Outdoor Temperature (deg F)"] - 32
+        ) / 1.8
+        TimestepBased = TimestepBased.rename(
+            columns={
+                "Hot Water Draw Volume (gal)": "Hot Water Draw Volume (L)",
+                "Mains Temperature (deg F)": "Mains Temperature (deg C)",
+                "Outdoor Temperature (deg F)": "Outdoor Temperature (deg C)",
+            }
         )
 
-        # For each draw in the T24 draw profile
-        for Draw in EventBased.index:
-            # Gather draw data from the event-based data set
-            Start_Time = Start + pd.Timedelta(
-                EventBased.loc[Draw, "Start Time of Year (hr)"], unit="h"
-            )
-            Duration = EventBased.loc[Draw, "Duration (min)"]
-            End_Time = (
-                EventBased.loc[Draw, "Start Time of Year (hr)"]
-                + Duration / Conversions.minutes_in_hour
-            )
-            Flow_Rate = EventBased.loc[Draw, "Hot Water Flow Rate (gpm)"]
-
-            # Identify the start/end bin and draw duration during each of those bins
-            Bin_Start = int(
-                np.floor(
-                    EventBased.loc[Draw, "Start Time of Year (hr)"]
-                    / (
-                        Timestep
-                        / (Conversions.seconds_in_minute * Conversions.minutes_in_hour)
-                    )
-                )
-            )
-            Time_Start_Bin = (
-                TimestepBased.index[Bin_Start + 1] - Start_Time
-            ).total_seconds() / Conversions.seconds_in_minute
-
-            Bin_End = int(
-                np.floor(
-                    End_Time
-                    / (
-                        Timestep
-                        / (Conversions.seconds_in_minute * Conversions.minutes_in_hour)
-                    )
-                )
-            )
-            End_Timestamp = Start + pd.Timedelta(End_Time, unit="h")
-            Time_End_Bin = (
-                End_Timestamp - TimestepBased.index[Bin_End]
-            ).total_seconds() / Conversions.seconds_in_minute
-
-            # Assign the hot water draw volume to each bin
-            if Bin_End == Bin_Start:
-                TimestepBased.loc[
-                    TimestepBased.index[Bin_Start], "Hot Water Draw Volume (gal)"
-                ] += (Duration * Flow_Rate)
-            else:
-                TimestepBased.loc[
-                    TimestepBased.index[Bin_Start], "Hot Water Draw Volume (gal)"
-                ] += (Time_Start_Bin * Flow_Rate)
-
-            if Bin_End - Bin_Start >= 1:  # If the draw doesn't end during the start bin
-                TimestepBased.loc[
-                    TimestepBased.index[Bin_End], "Hot Water Draw Volume (gal)"
-                ] += (Time_End_Bin * Flow_Rate)
-            if Bin_End - Bin_Start >= 2:  # If there are bins between start and end
-                TimestepBased.loc[
-                    TimestepBased.index[Bin_Start + 1] : TimestepBased.index[
-                        Bin_End - 1
-                    ],
-                    "Hot Water Draw Volume (gal)",
-                ] += Flow_Rate * (Timestep / Conversions.seconds_in_minute)
-
-        # Add mains temperature data to the output
-        TimestepBased["Mains Temperature (deg F)"] = WeatherData["T_Mains"]
-        TimestepBased["Mains Temperature (deg F)"] = TimestepBased[
-            "Mains Temperature (deg F)"
-        ].ffill()
-
-        # Add outdoor temperature data to the output
-        TimestepBased["Outdoor Temperature (deg F)"] = WeatherData["Dry Bulb"]
-        TimestepBased["Outdoor Temperature (deg F)"] = TimestepBased[
-            "Outdoor Temperature (deg F)"
-        ].ffill()
-
-        # Add timestep data to the output
-        TimestepBased["Timestep (min)"] = Timestep / Conversions.seconds_in_minute
-
-        # Convert to SI units
-        if SI == True:
-            TimestepBased["Hot Water Draw Volume (gal)"] = (
-                TimestepBased["Hot Water Draw Volume (gal)"] * Conversions.L_in_gal
+    return TimestepBased
+
+
+# %%----------------CONVERT PROFILES--------------------
+
+if __name__ == "__main__":
+    if Use_Cache == "Yes":
+        Cache = Result_Cache.Result_Cache(Folder_Cache, Cache_Size)
+
+    Files = Convertible_Profiles(Files)
+    File_Progress = Progress.Progress("Timestep conversion", len(Files), "files")
+
+    for File in Files:
+        # Read the parameters of the draw profile from its file name
+        Parameters = Profile_Catalog.Parse_Profile_FileName(File)
+        ClimateZone = str(Parameters["CZ"])
+
+        # State the output folder
+        Output_Folder = os.path.join(root, "DrawProfiles", "Timestep_Based")
+
+        # Read the event-based T24 darw profile
+        Path = os.path.join(Folder, File)
+
+        TimestepBased = None
+        if (
+            Use_Cache == "Yes"
+        ):  # Use the stored conversion if the profile, weather file and inputs haven't changed
+            Cache_Key = Result_Cache.Cache_Key(
+                {
+                    "Result": "Timestep",
+                    "ClimateZone": ClimateZone,
+                    "Timestep": Timestep,
+                    "Start": Start,
+                    "End": End,
+                    "SI": SI,
+                },
+                Files=[
+                    Path,
+                    os.path.join(
+                        root,
+                        "WeatherFiles",
+                        Weather_Data.Weather_File_Name(ClimateZone),
+                    ),
+                ],
+                Functions=[Convert_Profile, Bin_Draws],
             )
-            TimestepBased["Mains Temperature (deg F)"] = (
-                TimestepBased["Mains Temperature (deg F)"] - 32
-            ) / 1.8
-            TimestepBased["Outdoor Temperature (deg F)"] = (
-                TimestepBased["Outdoor Temperature (deg F)"] - 32
-            ) / 1.8
-            TimestepBased = TimestepBased.rename(
-                columns={
-                    "Hot Water Draw Volume (gal)": "Hot Water Draw Volume (L)",
-                    "Mains Temperature (deg F)": "Mains Temperature (deg C)",
-                    "Outdoor Temperature (deg F)": "Outdoor Temperature (deg C)",
-                }
+            TimestepBased = Cache.Get(Cache_Key)
+
+        if TimestepBased is None:
+            with Instrumentation.Stage("Load") as Record:
+                EventBased = pd.read_csv(Path)
+                Record.Rows_Out = len(EventBased)
+            TimestepBased = Convert_Profile(
+                EventBased, Timestep, ClimateZone, Start, End, SI
             )
-
-        # Gather specifics about the event-based draw profile, create output filename
-        Bldg = File.split("=")[1].split("_")[0][0]
-        Wat = File.split("=")[3].split("_")[0]
-        Prof = File.split("=")[4].split("_")[0]
-        SDLM = File.split("=")[5].split("_")[0]
-        CFA = File.split("=")[6].split("_")[0]
-        Inc = File.split("=")[7].split("_")[0]
-        Ver = File.split("=")[8].split(".")[0]
-
-        if SI == True:
-            Output_File = (
-                Bldg
-                + "_"
-                + CZ
-                + "_"
-                + Wat
-                + "_"
-                + Prof
-                + "_"
-                + SDLM
-                + "_"
-                + CFA
-                + "_"
-                + Inc
-                + "_"
-                + Ver
-                + "_SI.csv"
+            if Use_Cache == "Yes":
+                Cache.Put(Cache_Key, TimestepBased)
+
+        # Create the output filename from the specifics of the event-based draw profile
+        Output_File = Profile_Catalog.Create_Timestep_FileName(Parameters, SI)
+
+        if Output_Format == "Parquet":
+            Output_Path = Columnar_Output.Write_Profile_Dataset(
+                TimestepBased,
+                os.path.join(Output_Folder, "Parquet"),
+                Parameters,
+                Index=True,
+                SI=SI,
             )
         else:
-            Output_File = (
-                Bldg
-                + "_"
-                + CZ
-                + "_"
-                + Wat
-                + "_"
-                + Prof
-                + "_"
-                + SDLM
-                + "_"
-                + CFA
-                + "_"
-                + Inc
-                + "_"
-                + Ver
-                + ".csv"
+            Output_Path = os.path.join(Output_Folder, Output_File)
+            Fast_CSV_Writer.Write_CSV(
+                TimestepBased,
+                Output_Path,
+                Index=True,
+                Precision=CSV_Precision,
             )
-
-        TimestepBased.to_csv(os.path.join(Output_Folder, Output_File))
+            Profile_Catalog.Register_Profile(Output_Path, TimestepBased)
+        Day_Index.Write_Day_Index(
+            Day_Index.Calculate_Day_Index(TimestepBased.index), Output_Path
+        )  # Save the position of each day so later scripts can slice days without parsing dates
 
         print("Finished: {}".format(Output_File))
+        File_Progress.Update(Rows=len(TimestepBased))
+
+    File_Progress.Close()
+    Instrumentation.Print_Summary()
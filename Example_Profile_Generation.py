@@ -15,8 +15,13 @@ import os
 import datetime
 import pandas as pd
 import numpy as np
-from SingleDay_DrawProfile_Generator import Create_Hot_Profiles, Calculate_TMains
+from SingleDay_DrawProfile_Generator import (
+    Create_Hot_Profiles,
+    Calculate_TMains,
+    Read_Daily_Profiles,
+)
 from Event_To_Timestep_Converter import Convert_Profile_SingleDay
+import Fast_CSV_Writer
 
 # %%-----------------------DEFINE INPUTS------------------------------------
 
@@ -54,18 +59,8 @@ Day_Of_Year = Date.timetuple().tm_yday
 T_Mains = Calculate_TMains(
     ClimateZone
 )  # Calcualte the inlet water temperature. Modify to enable nationwide calculations
-Daily_Profiles = pd.read_csv(
-    os.path.join(
-        os.getcwd(),
-        "..",
-        "T24_Draw_Profile_Generator",
-        "SourceData",
-        "2019",
-        "DailyProfiles.csv",
-    ),
-    index_col=0,
-)
-Profile_List = np.unique(Daily_Profiles.index)
+Daily_Profiles = Read_Daily_Profiles(Version)
+Profile_List = np.unique(Daily_Profiles["Day"])
 print(Profile_List)
 print("Creating profiles")
 Profiles = Create_Hot_Profiles(
@@ -85,7 +80,8 @@ Profiles = Create_Hot_Profiles(
     SquareFootage_Dwelling,
     Water,
     Distribution_System_Type,
-)
+    Daily_Profiles=Daily_Profiles,
+)  # Creates all day codes in one call
 
 print("Converting profiles to timestep-based")
 for key in Profiles.keys():
@@ -95,6 +91,8 @@ for key in Profiles.keys():
 
 print("Saving draw profiles to .csv")
 for key in Profiles.keys():
-    Profiles[key].to_csv(
-        os.path.join(os.getcwd(), "DrawProfiles", "{}.csv".format(key))
+    Fast_CSV_Writer.Write_CSV(
+        Profiles[key],
+        os.path.join(os.getcwd(), "DrawProfiles", "{}.csv".format(key)),
+        Index=True,
     )
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:06:18 2026
+
+This script selects the fixtures included in draw profiles with a bitmask, so
+excluded fixtures are removed from the daily profiles before the annual
+profiles are assembled. Previously every annual profile was assembled with
+all fixtures, then Filter_DataSet_ByFixture in T24_Draw_Profile_Generator.py
+concatenated a slice of each included fixture, re-sorted the result, and
+returned a list of letters that was turned into a string with five .replace
+calls. A shower-only profile assembled 365 days of faucet draws only to
+remove them.
+
+Each fixture has one bit in Fixture_Bits. Fixture_Mask combines the
+Include_Faucet, Include_Shower, Include_Clothes, Include_Dish and Include_Bath
+inputs into a mask (E.g. 31 for all fixtures, 2 for showers only), and
+Included_Code returns the letters of the fixtures in a mask in the order used
+in file names (E.g. 'FSCDB', or 'S').
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import numpy as np
+
+# %%--------------------CONSTANTS------------------------
+
+Fixture_Bits = {
+    "FAUC": 1,
+    "SHWR": 2,
+    "CWSH": 4,
+    "DWSH": 8,
+    "BATH": 16,
+}
+Fixture_Letters = {
+    "FAUC": "F",
+    "SHWR": "S",
+    "CWSH": "C",
+    "DWSH": "D",
+    "BATH": "B",
+}  # The letter of each fixture in Included_Code
+All_Fixtures = sum(Fixture_Bits.values())  # The mask including every fixture
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Fixture_Mask(
+    Include_Faucet, Include_Shower, Include_Clothes, Include_Dish, Include_Bath
+):
+    # Returns the mask of the fixtures whose input is 'Yes'
+    Include = [
+        Include_Faucet,
+        Include_Shower,
+        Include_Clothes,
+        Include_Dish,
+        Include_Bath,
+    ]
+    return sum(
+        Bit for Bit, Flag in zip(Fixture_Bits.values(), Include) if Flag == "Yes"
+    )
+
+
+def Included_Code(Mask):
+    # Returns the letters of the fixtures in a mask. E.g. 'FSCDB'
+    return "".join(
+        Fixture_Letters[Fixture] for Fixture, Bit in Fixture_Bits.items() if Mask & Bit
+    )
+
+
+def Select_Fixtures(Fixtures, Mask):
+    """
+    Returns a boolean array that is True for the draws whose fixture is in
+    Mask. Fixtures is an array or series of fixture names. Unknown fixtures
+    (E.g. the combined fixtures of Combine_Profiles) are only kept by the
+    mask of all fixtures.
+    """
+
+    if Mask == All_Fixtures:
+        return np.ones(len(Fixtures), dtype=bool)
+    Fixtures = np.asarray(Fixtures)
+    Bits = np.zeros(len(Fixtures), dtype=int)
+    for Fixture, Bit in Fixture_Bits.items():
+        Bits[Fixtures == Fixture] = Bit
+    return (Bits & Mask) != 0
+
+
+def Filter_Daily_Profiles(Daily_Profiles, Mask):
+    # Returns the rows of the daily profile table with the fixtures in Mask, in their original order
+    if Mask == All_Fixtures:
+        return Daily_Profiles
+    return Daily_Profiles[
+        Select_Fixtures(Daily_Profiles["Fixture"].to_numpy(), Mask)
+    ].reset_index(drop=True)
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 14 11:37:20 2026
+
+This script holds array versions of the hot water calculations performed by
+Calculate_Fraction_HotWater and Calculate_FlowWater_Hot in
+T24_Draw_Profile_Generator.py. They operate directly on numpy arrays rather
+than adding and deleting BooleanMask columns in a data frame, and broadcast
+across climate zones. For instance, passing a (16 x N) array of mains water
+temperatures returns the fraction of hot water in each of N draws in all 16
+climate zones at once.
+
+The assumptions are the same as in T24_Draw_Profile_Generator.py: hot water
+fractions for faucets, clothes washers and dish washers are taken from pg B-3
+of the 2016 CBECC ACM reference manual, and baths and showers are mixed to
+Temperature_Bath and Temperature_Shower using the mains water temperature.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import numpy as np
+
+# %%--------------------CONSTANTS------------------------
+
+# Hot water fractions are taken from pg B-3 of the 2016 CBECC ACM reference manual
+Fraction_HotWater_Fixed = {
+    "FAUC": 0.5,
+    "CWSH": 0.22,
+    "DWSH": 1,
+}
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Calculate_Fraction_HotWater_Array(
+    Fixtures,
+    T_Mains,
+    Temperature_Supply_Hot_AtFixture,
+    Temperature_Bath,
+    Temperature_Shower,
+):
+    """
+    Returns the fraction of hot water in each draw. Fixtures is an array of
+    fixture names (N), T_Mains is the mains water temperature of each draw
+    (deg F), either (N) or (Zones x N). The result has the broadcast shape.
+    Combined fixtures (E.g. 'FAUCSHWR' from Combine_Profiles) receive 0, as
+    they do in Calculate_Fraction_HotWater.
+    """
+
+    Fixtures = np.asarray(Fixtures)
+    T_Mains = np.asarray(T_Mains, dtype=float)
+
+    Fraction = np.zeros(np.broadcast_shapes(Fixtures.shape, T_Mains.shape))
+    for Fixture, Fraction_HotWater in Fraction_HotWater_Fixed.items():
+        Fraction += (Fixtures == Fixture) * Fraction_HotWater
+
+    Denominator = Temperature_Supply_Hot_AtFixture - T_Mains
+    Fraction += (Fixtures == "BATH") * (
+        Temperature_Bath - T_Mains
+    ) / Denominator  # Calculates the fraction of hot water in a bath based on the CBECC-Res assumed temperature for baths and the mains water temperature
+    Fraction += (Fixtures == "SHWR") * (
+        Temperature_Shower - T_Mains
+    ) / Denominator  # Calculates the fraction of hot water in a shower based on the CBECC-Res assumed temperature for showers and the mains water temperature
+
+    return Fraction
+
+
+def Calculate_FlowWater_Hot_Array(Fraction_HotWater, Flow_Rate, Duration):
+    # Returns the hot water flow rate (gpm) and volume (gal) of each draw. Broadcasts the same way as Calculate_Fraction_HotWater_Array
+    Flow_Rate_Hot = Fraction_HotWater * np.asarray(Flow_Rate, dtype=float)
+    Volume_Hot = Flow_Rate_Hot * np.asarray(Duration, dtype=float)
+
+    return Flow_Rate_Hot, Volume_Hot
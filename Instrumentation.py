@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Thu Nov  5 10:04:26 2026
+
+This script records the time spent in each stage of the scripts in this
+repository (load, assemble, filter, hot fraction, SDLM, combine, bin, write).
+It replaces the start_time/end_time prints, the laggard timers in
+T24_Draw_Profile_Generator.py and linetimer.CodeTimer in
+Convert_Profile_Climate_Zone.py.
+
+Stages are recorded either with the Timed decorator, which also counts the rows
+of the first data frame argument and of the result:
+
+    @Instrumentation.Timed("SDLM")
+    def Modify_Profile_SDLM(Dwelling_Profile, ...):
+
+or with a Stage block, whose rows are set by hand:
+
+    with Instrumentation.Stage("Load") as Record:
+        Data = pd.read_csv(File_Location)
+        Record.Rows_Out = len(Data)
+
+Each record holds the wall and CPU time (s), rows in and out, peak memory (MB)
+and depth (stages run inside other stages have depth > 0, and their time is
+also included in the outer stage). Recording is always on and costs a few
+microseconds per stage. Scripts call Print_Summary at the end of a run.
+
+Reports and profiles are turned on with environment variables, so production
+runs can be measured without editing code:
+    -DRAWPROFILE_TIMING - Path of a report written when the process exits.
+        '.csv' writes one row per record, any other extension writes JSON
+    -DRAWPROFILE_CPROFILE - Path of a cProfile .prof file of the whole run
+        (E.g. for snakeviz or pstats)
+    -DRAWPROFILE_TRACEMALLOC - Set to 1 to measure the peak memory of each
+        stage with tracemalloc. This slows down the run. Otherwise the peak
+        memory is the peak resident memory of the process so far
+
+Only the records of the current process are reported. Stages run in
+process-pool workers are not included.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import os
+import sys
+import csv
+import json
+import time
+import atexit
+import functools
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# %%--------------------CONSTANTS------------------------
+
+Timing_Output = os.environ.get("DRAWPROFILE_TIMING")
+Profile_Output = os.environ.get("DRAWPROFILE_CPROFILE")
+Trace_Memory = os.environ.get("DRAWPROFILE_TRACEMALLOC", "") not in ("", "0")
+
+Fields = [
+    "Stage",
+    "Depth",
+    "Wall Time (s)",
+    "CPU Time (s)",
+    "Rows In",
+    "Rows Out",
+    "Peak Memory (MB)",
+    "Details",
+]
+
+# The records of every stage run in this process, in the order they finished
+Records = []
+Start_Time = time.perf_counter()  # The start of the run
+_Stack = []  # The stages currently running
+_Peaks = []  # The peak traced memory of the running stages, when tracing memory
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def _Rows(Value):
+    # Returns the number of rows of a data frame or array, or of the first item of a tuple (E.g. (Dwelling_Profile, Included_Code))
+    if isinstance(Value, tuple) and len(Value) > 0:
+        return _Rows(Value[0])
+    Shape = getattr(Value, "shape", None)
+    return Shape[0] if Shape else None
+
+
+def _Peak_Memory():
+    # Returns the peak resident memory of the process so far (MB). ru_maxrss is in kB on Linux and bytes on macOS
+    if resource is None:
+        return None
+    Peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return Peak / 1024**2 if sys.platform == "darwin" else Peak / 1024
+
+
+class Stage:
+    """
+    Records the time spent in a with block. Rows_In and Rows_Out can be set
+    on the record inside the block, and any keyword arguments are reported as
+    details (E.g. Stage('Convert', Zone=3)).
+    """
+
+    def __init__(self, Name, Rows_In=None, **Details):
+        self.Name = Name
+        self.Rows_In = Rows_In
+        self.Rows_Out = None
+        self.Details = Details
+
+    def __enter__(self):
+        self.Depth = len(_Stack)
+        _Stack.append(self)
+        if Trace_Memory:
+            if len(_Peaks) > 0:
+                _Peaks[-1] = max(_Peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            _Peaks.append(0)
+        self.Wall = time.perf_counter()
+        self.CPU = time.process_time()
+        return self
+
+    def __exit__(self, *Exception_Info):
+        Wall = time.perf_counter() - self.Wall
+        CPU = time.process_time() - self.CPU
+        _Stack.pop()
+        if Trace_Memory:
+            Peak = max(tracemalloc.get_traced_memory()[1], _Peaks.pop())
+            if len(_Peaks) > 0:
+                _Peaks[-1] = max(
+                    _Peaks[-1], Peak
+                )  # The stage's peak is also the peak of the stage running it
+            Peak = Peak / 1024**2
+        else:
+            Peak = _Peak_Memory()
+
+        Records.append(
+            {
+                "Stage": self.Name,
+                "Depth": self.Depth,
+                "Wall Time (s)": Wall,
+                "CPU Time (s)": CPU,
+                "Rows In": self.Rows_In,
+                "Rows Out": self.Rows_Out,
+                "Peak Memory (MB)": Peak,
+                "Details": self.Details,
+            }
+        )
+        return False
+
+
+def Timed(Name):
+    # Decorator recording every call of a function as a stage, with the rows of its first data frame argument and of its result
+    def Decorator(Function):
+        @functools.wraps(Function)
+        def Wrapper(*Arguments, **Keyword_Arguments):
+            Rows_In = None
+            for Argument in Arguments:
+                Rows_In = _Rows(Argument)
+                if Rows_In is not None:
+                    break
+            with Stage(Name, Rows_In) as Record:
+                Result = Function(*Arguments, **Keyword_Arguments)
+                Record.Rows_Out = _Rows(Result)
+            return Result
+
+        return Wrapper
+
+    return Decorator
+
+
+def Summary():
+    """
+    Returns a list of the totals of each stage, in the order the stages first
+    finished: calls, wall and CPU time (s), rows in and out, and the largest
+    peak memory (MB).
+    """
+
+    Totals = {}
+    for Record in Records:
+        Total = Totals.setdefault(
+            Record["Stage"],
+            {
+                "Stage": Record["Stage"],
+                "Calls": 0,
+                "Wall Time (s)": 0.0,
+                "CPU Time (s)": 0.0,
+                "Rows In": 0,
+                "Rows Out": 0,
+                "Peak Memory (MB)": None,
+            },
+        )
+        Total["Calls"] += 1
+        Total["Wall Time (s)"] += Record["Wall Time (s)"]
+        Total["CPU Time (s)"] += Record["CPU Time (s)"]
+        Total["Rows In"] += Record["Rows In"] or 0
+        Total["Rows Out"] += Record["Rows Out"] or 0
+        if Record["Peak Memory (MB)"] is not None:
+            Total["Peak Memory (MB)"] = max(
+                Total["Peak Memory (MB)"] or 0, Record["Peak Memory (MB)"]
+            )
+    return list(Totals.values())
+
+
+def Print_Summary():
+    # Prints the total time of the run and of each stage
+    print("total = {:.3f} s".format(time.perf_counter() - Start_Time))
+    for Total in Summary():
+        print(
+            "    {}: {:.3f} s wall, {:.3f} s CPU, {} calls, {} rows in, {} rows out".format(
+                Total["Stage"],
+                Total["Wall Time (s)"],
+                Total["CPU Time (s)"],
+                Total["Calls"],
+                Total["Rows In"],
+                Total["Rows Out"],
+            )
+        )
+
+
+def Write_Report(Path):
+    # Writes every record to a .csv file (one row per record) or a JSON file with the records and the totals of each stage
+    if Path.lower().endswith(".csv"):
+        with open(Path, "w", newline="") as File:
+            Writer = csv.DictWriter(File, fieldnames=Fields)
+            Writer.writeheader()
+            for Record in Records:
+                Writer.writerow(dict(Record, Details=json.dumps(Record["Details"])))
+    else:
+        with open(Path, "w") as File:
+            json.dump(
+                {
+                    "Total Time (s)": time.perf_counter() - Start_Time,
+                    "Stages": Summary(),
+                    "Records": Records,
+                },
+                File,
+                indent=1,
+                default=str,
+            )
+
+
+# %%--------------------OPTIONAL PROFILING-----------------------------------
+
+if Trace_Memory:
+    import tracemalloc
+
+    tracemalloc.start()
+
+if Profile_Output:
+    import cProfile
+
+    Profiler = cProfile.Profile()
+    Profiler.enable()
+    atexit.register(lambda: (Profiler.disable(), Profiler.dump_stats(Profile_Output)))
+
+if Timing_Output:
+    atexit.register(lambda: Write_Report(Timing_Output))
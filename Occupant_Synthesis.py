@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Nov  2 10:36:19 2026
+
+This script generates the day codes of many dwellings from the number of
+occupants in each, using the daily volumes in
+DailyProfiles_Analyzed_Consumption_1Person.csv. The first digit of each day
+code is the number of people in the house the draws were measured in (6 = 6 or
+more), so the occupant count selects the codes a dwelling can use.
+
+The functions in this script:
+    -Read_Volume_Index - The mixed water volume (gal) of every day code, with
+        its occupancy level and day type, sorted by volume within each
+        (occupancy level, day type) pool. Excel converted the weekend codes in
+        the .csv to numbers (E.g. '1E1' to '1.00E+01'), so they are repaired
+        when read
+    -Calculate_Consumption_Statistics - The mean and standard deviation of
+        the daily volume of each pool, calculated from the day codes
+    -Read_Published_Statistics - The one occupant weekday, weekend and
+        holiday statistics in the Average and stdev rows of the .csv. They
+        differ from the calculated ones (E.g. a weekend mean of 41.40 gal
+        versus 37.26 gal), as they appear to leave out 1E0
+    -Occupant_Distribution - The share of days at each occupancy level in the
+        CEC annual profiles of a dwelling type, used to give dwellings a
+        realistic spread of occupants
+    -Generate_Dwellings - Selects the day code of every dwelling on every date
+        in one vectorized call. Each day receives a target volume sampled from
+        a lognormal distribution with the mean and standard deviation of its
+        pool (or of Statistics, to study other consumption levels), and the
+        code in the pool with the nearest volume. With Scale = True the draw
+        durations of each day are also scaled so its volume equals the target,
+        by a factor limited to between 1 / Max_Scale_Factor and
+        Max_Scale_Factor. Pools have about 10 codes with gaps between their
+        volumes (E.g. 3H0 is 0.04 gal and the next holiday code 30 gal), and
+        an unlimited factor stretched a 0.12 min faucet draw to 43 min. Days
+        whose factor is limited use less or more than their target volume
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import numpy as np
+import os
+
+import Annual_Synthesis
+
+try:
+    root = os.path.dirname(os.path.abspath(__file__))
+except:
+    root = os.getcwd()
+
+# %%--------------------CONSTANTS------------------------
+
+File_Consumption = os.path.join(root, "DailyProfiles_Analyzed_Consumption_1Person.csv")
+# The first digit of the day codes. 6 = 6 or more occupants
+Occupancy_Levels = [1, 2, 3, 4, 5, 6]
+Max_Scale_Factor = 3  # With Scale = True the durations of a day are multiplied by at most this, or divided by at most this
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Read_Volume_Index(Path=File_Consumption):
+    """
+    Returns a data frame of the daily mixed water volume (gal) of every day
+    code, with columns 'Day', 'Occupants', 'Day Type' and 'Volume (gal)',
+    sorted by occupancy level, day type and volume.
+    """
+
+    Draws = pd.read_csv(Path, usecols=["Day", "Volume (gal)"])
+    Draws["Day"] = Draws["Day"].str.replace(
+        r"^(\d)\.00E\+0(\d)$", r"\1E\2", regex=True
+    )  # Repairs the weekend codes converted to numbers by Excel
+
+    Volume_Index = Draws.groupby("Day", as_index=False)["Volume (gal)"].sum()
+    Volume_Index["Occupants"] = Volume_Index["Day"].str[0].astype(int)
+    Volume_Index["Day Type"] = Volume_Index["Day"].str[1]
+
+    return Volume_Index.sort_values(
+        ["Occupants", "Day Type", "Volume (gal)"], kind="stable"
+    ).reset_index(drop=True)[["Day", "Occupants", "Day Type", "Volume (gal)"]]
+
+
+def Calculate_Consumption_Statistics(Volume_Index):
+    # Returns a data frame of the mean and standard deviation of the daily volume of each pool, indexed by (Occupants, Day Type)
+    return Volume_Index.groupby(["Occupants", "Day Type"])["Volume (gal)"].agg(
+        Mean="mean", Std="std"
+    )
+
+
+def Read_Published_Statistics(Path=File_Consumption):
+    # Returns the one occupant statistics in the Average and stdev rows of the .csv, in the layout of Calculate_Consumption_Statistics
+    Summary = pd.read_csv(
+        Path, usecols=[7, 8, 9, 10], index_col=0, nrows=2
+    )  # The unnamed column holds the row labels
+    Statistics = pd.DataFrame(
+        {
+            "Mean": Summary.loc["Average", ["Weekday", "Weekend", "Holiday"]],
+            "Std": Summary.loc["stdev", ["Weekday", "Weekend", "Holiday"]],
+        }
+    ).astype(float)
+    Statistics.index = pd.MultiIndex.from_product(
+        [[1], Annual_Synthesis.Day_Types], names=["Occupants", "Day Type"]
+    )
+    return Statistics
+
+
+def Occupant_Distribution(Building_Type, NumberBedrooms_Dwelling, Version=2019):
+    # Returns the share of days at each occupancy level in the annual profiles of the dwelling type (all variants if multi-family)
+    Annual_Profiles = Annual_Synthesis.Read_Annual_Profiles(Version, Building_Type)
+    Name = Annual_Synthesis.Annual_Profile_Name(
+        Building_Type, NumberBedrooms_Dwelling, ""
+    )
+    Codes = Annual_Profiles[
+        [Column for Column in Annual_Profiles.columns if Column.startswith(Name)]
+    ].to_numpy(dtype=str)
+    Levels = pd.Series(Codes.ravel()).str[0].astype(int).to_numpy()
+
+    return pd.Series(
+        np.bincount(Levels, minlength=7)[1:] / len(Levels), index=Occupancy_Levels
+    )
+
+
+def Sample_Occupants(Number_Dwellings, Distribution, Random):
+    # Returns the number of occupants of each dwelling, sampled from Distribution (the share of dwellings at each occupancy level)
+    return Random.choice(
+        np.asarray(Distribution.index),
+        size=Number_Dwellings,
+        p=np.asarray(Distribution) / np.sum(Distribution),
+    )
+
+
+def Generate_Dwellings(
+    Occupants,
+    Years=Annual_Synthesis.CEC_Year,
+    Seed=0,
+    Statistics=None,
+    Scale=False,
+    Max_Scale=Max_Scale_Factor,
+    Holidays=None,
+    Volume_Index=None,
+):
+    """
+    Selects the day code of each dwelling on each date of Years. Occupants is
+    the number of occupants of each dwelling (see Sample_Occupants). Returns
+    a (dwellings x dates) data frame of day codes, a data frame of the target
+    daily volume (gal) of each day, and a data frame of the factor each day's
+    draw durations are multiplied by (all 1 unless Scale = True). The factor
+    is limited to between 1 / Max_Scale and Max_Scale.
+
+    Statistics overrides the target mean and standard deviation of each pool
+    (same layout as Calculate_Consumption_Statistics). Pools missing from it
+    keep the calculated statistics, so Read_Published_Statistics() only
+    changes the one occupant pools.
+    """
+
+    if Volume_Index is None:
+        Volume_Index = Read_Volume_Index()
+    Calculated = Calculate_Consumption_Statistics(Volume_Index)
+    Statistics = (
+        Calculated
+        if Statistics is None
+        else Statistics.combine_first(Calculated)[["Mean", "Std"]]
+    )
+    Random = np.random.default_rng(Seed)
+
+    Years = np.atleast_1d(Years)
+    Dates = pd.date_range(
+        "{}-01-01".format(Years.min()), "{}-12-31".format(Years.max()), freq="D"
+    )
+    Types = Annual_Synthesis.Calculate_Day_Types(Dates, Holidays)
+
+    # Number every (occupancy level, day type) pool. The index is sorted by pool, then volume
+    Type_Number = {
+        Type: Number for Number, Type in enumerate(Annual_Synthesis.Day_Types)
+    }
+    Index_Pool = (Volume_Index["Occupants"].to_numpy() - 1) * len(Type_Number)
+    Index_Pool = Index_Pool + Volume_Index["Day Type"].map(Type_Number).to_numpy()
+    Pool_Start = np.searchsorted(
+        Index_Pool, np.arange(len(Occupancy_Levels) * len(Type_Number))
+    )
+    Pool_End = np.searchsorted(
+        Index_Pool, np.arange(len(Occupancy_Levels) * len(Type_Number)), side="right"
+    )
+
+    Levels = np.clip(np.asarray(Occupants, dtype=int), 1, 6)
+    Date_Type = np.array(
+        [Type_Number[Type] for Type in Types]
+    )  # Pools are (dwellings x dates)
+    Pool = (Levels[:, np.newaxis] - 1) * len(Type_Number) + Date_Type
+    if (Pool_End[Pool] == Pool_Start[Pool]).any():
+        raise ValueError("Some occupancy levels have no day codes of some day types")
+
+    # Lognormal target volume with the mean and standard deviation of each pool
+    Mean = (
+        Statistics["Mean"]
+        .reindex(
+            pd.MultiIndex.from_product([Occupancy_Levels, Annual_Synthesis.Day_Types])
+        )
+        .to_numpy()[Pool]
+    )
+    Std = (
+        Statistics["Std"]
+        .reindex(
+            pd.MultiIndex.from_product([Occupancy_Levels, Annual_Synthesis.Day_Types])
+        )
+        .fillna(0)
+        .to_numpy()[Pool]
+    )
+    Sigma = np.sqrt(np.log(1 + (Std / Mean) ** 2))
+    Target = np.exp(
+        np.log(Mean) - Sigma**2 / 2 + Sigma * Random.standard_normal(Pool.shape)
+    )
+
+    # The code with the nearest volume in each day's pool, with one search over all pools
+    Volume = Volume_Index["Volume (gal)"].to_numpy()
+    Offset = Volume.max() + Target.max() + 1  # Separates the pools in one sorted key
+    Keys = Index_Pool * Offset + Volume
+    Position = np.searchsorted(Keys, Pool * Offset + Target)
+    Above = np.clip(Position, Pool_Start[Pool], Pool_End[Pool] - 1)
+    Below = np.clip(Position - 1, Pool_Start[Pool], Pool_End[Pool] - 1)
+    Selected = np.where(
+        np.abs(Volume[Below] - Target) <= np.abs(Volume[Above] - Target), Below, Above
+    )
+
+    Codes = Volume_Index["Day"].to_numpy(dtype=str)[Selected]
+    Factor = (
+        np.clip(Target / Volume[Selected], 1 / Max_Scale, Max_Scale)
+        if Scale
+        else np.ones(Target.shape)
+    )
+
+    return (
+        pd.DataFrame(Codes, columns=Dates),
+        pd.DataFrame(Target, columns=Dates),
+        pd.DataFrame(Factor, columns=Dates),
+    )
+
+
+def Assemble_Dwelling(Day_Codes, Factor, Daily_Profiles, ClimateZone):
+    """
+    Returns the draw profile (without SDLM) of one dwelling from its row of
+    the day codes and duration factors returned by Generate_Dwellings.
+    """
+
+    Profile = Annual_Synthesis.Assemble_Annual_Profile(
+        Day_Codes, Daily_Profiles, ClimateZone
+    )
+    Day_Factor = Factor.to_numpy()[Profile["Day of Year (Day)"].to_numpy() - 1]
+    Profile["Duration (min)"] = Profile["Duration (min)"] * Day_Factor
+    Profile["Hot Water Volume (gal)"] = Profile["Hot Water Volume (gal)"] * Day_Factor
+
+    return Profile
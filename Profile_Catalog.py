@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 12 09:14:37 2026
+
+This script maintains an indexed catalog of the draw profiles created by the
+other scripts in this repository.
+
+Profile metadata previously only lived in the file names (E.g.
+'Bldg=Multi_CZ=3_Wat=Hot_Prof=1a_SDLM=Yes_CFA=780_Inc=FSCDB_Ver=2019.csv' for
+event-based profiles, or 'M_03_Hot_1a_Yes_780_FSCDB_2019_SI.csv' for
+timestep-based profiles), and every script recovered it by splitting the file
+name at hard-coded positions. This module provides:
+    -Parse_Profile_FileName - Reads the parameters out of either file name
+        format and returns them as a dictionary with typed values
+    -Create_Profile_FileName/Create_Timestep_FileName - The inverse of
+        Parse_Profile_FileName. These build the file names used by
+        T24_Draw_Profile_Generator.py and Event_To_Timestep_Converter.py
+    -Register_Profile - Records a profile (parameters, row count, annual
+        volume and path) in the SQLite catalog stored alongside the outputs
+    -Build_Catalog - Indexes every profile already in a folder. Files that are
+        already in the catalog and haven't changed are not re-opened
+    -Query_Catalog - Returns the catalog entries matching the requested
+        parameters. E.g. Query_Catalog(Folder, CZ=3, Bldg='Multi', Bedrooms=2,
+        Wat='Hot') returns all CZ 3 MF 2-bedroom hot water profiles without
+        listing the folder or opening any profiles
+
+The catalog is a single SQLite file named Profile_Catalog.sqlite, stored in the
+same folder as the profiles it describes.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import os
+import glob
+import sqlite3
+from contextlib import closing
+
+import Conversions as Conversions
+
+# %%--------------------CONSTANTS------------------------
+
+Catalog_File_Name = "Profile_Catalog.sqlite"
+
+# Extensions stripped from file names before parsing. Longest first so '.csv.gz' is removed before '.gz'
+Profile_Extensions = [".csv.gz", ".csv.zst", ".parquet", ".csv", ".gz", ".zst"]
+
+# Order of the fields in event-based file names (written by T24_Draw_Profile_Generator.py, where SDLM and CFA are only present when SDLM == 'Yes') and timestep-based file names (written by Event_To_Timestep_Converter.py)
+Profile_Fields = ["Bldg", "CZ", "Wat", "Prof", "SDLM", "CFA", "Inc", "Ver"]
+
+Building_Initials = {"M": "Multi", "S": "Single"}
+
+# Columns of the catalog table. Parameter names match the keys used in the file names
+Catalog_Columns = {
+    "Path": "TEXT PRIMARY KEY",  # Path of the profile, relative to the folder holding the catalog
+    "Format": "TEXT",  # 'Event' or 'Timestep'
+    "Bldg": "TEXT",
+    "CZ": "INTEGER",
+    "Wat": "TEXT",
+    "Prof": "TEXT",
+    "Bedrooms": "INTEGER",  # Parsed from Prof. NULL for combined profiles
+    "Variant": "TEXT",  # Parsed from Prof. NULL for single family and combined profiles
+    "SDLM": "TEXT",
+    "CFA": "TEXT",
+    "Inc": "TEXT",
+    "Ver": "INTEGER",
+    "Units": "TEXT",  # 'IP' or 'SI'
+    "Rows": "INTEGER",
+    "Annual_Volume_gal": "REAL",  # Hot water volume of hot water profiles. NULL for climate-independent hot water profiles (CZ=Any), whose hot water volume depends on the climate zone they are loaded for
+    "Modified": "REAL",  # File modification time when the entry was recorded
+}
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def _Strip_Extension(Name):
+    for Extension in Profile_Extensions:
+        if Name.endswith(Extension):
+            return Name[: -len(Extension)]
+    return os.path.splitext(Name)[0]
+
+
+def _Split_Profile(Prof):
+    # Splits a profile name such as '2b' into the number of bedrooms and the variant. Combined profiles (E.g. '[1, 1, 2, 2]') have neither
+    Bedrooms = "".join(Character for Character in Prof if Character.isdigit())
+    Variant = "".join(Character for Character in Prof if Character.isalpha())
+    if Prof.startswith("[") or Bedrooms == "":
+        return None, None
+    return int(Bedrooms), (Variant if Variant != "" else None)
+
+
+def Parse_Profile_FileName(File):
+    """
+    Returns the parameters encoded in an event-based or timestep-based draw
+    profile file name. Raises ValueError if the name matches neither format.
+    """
+
+    Stem = _Strip_Extension(os.path.basename(File))
+
+    if "=" in Stem:  # Event-based profiles store their parameters as Key=Value pairs
+        Parameters = {"Format": "Event", "Units": "IP"}
+        for Field in Stem.split("_"):
+            if "=" not in Field:
+                raise ValueError("Unrecognized draw profile file name: {}".format(File))
+            Key, Value = Field.split("=", 1)
+            Parameters[Key] = Value
+    else:  # Timestep-based profiles store their parameters in a fixed order
+        Values = Stem.split("_")
+        Units = "IP"
+        if Values[-1] == "SI":
+            Units = "SI"
+            Values = Values[:-1]
+        if len(Values) != len(Profile_Fields) or Values[0] not in Building_Initials:
+            raise ValueError("Unrecognized draw profile file name: {}".format(File))
+        Parameters = dict(zip(Profile_Fields, Values))
+        Parameters["Bldg"] = Building_Initials[Parameters["Bldg"]]
+        Parameters["Format"] = "Timestep"
+        Parameters["Units"] = Units
+
+    if "CZ" not in Parameters or "Prof" not in Parameters:
+        raise ValueError("Unrecognized draw profile file name: {}".format(File))
+
+    Parameters["CZ"] = (
+        None if Parameters["CZ"] == "Any" else int(Parameters["CZ"])
+    )  # Climate-independent profiles (See Climate_Independent_Profiles.py) use 'CZ=Any'
+    if "Ver" in Parameters:
+        Parameters["Ver"] = int(Parameters["Ver"])
+    Parameters["Bedrooms"], Parameters["Variant"] = _Split_Profile(Parameters["Prof"])
+
+    return Parameters
+
+
+def Create_Profile_FileName(Parameters, Extension=".csv"):
+    # Builds the event-based file name used by T24_Draw_Profile_Generator.py. SDLM and CFA are only included when SDLM == 'Yes'
+    Fields = [
+        Field
+        for Field in Profile_Fields
+        if Parameters.get("SDLM") == "Yes" or Field not in ["SDLM", "CFA"]
+    ]
+
+    return (
+        "_".join("{}={}".format(Field, Parameters[Field]) for Field in Fields)
+        + Extension
+    )
+
+
+def Create_Timestep_FileName(Parameters, SI, Extension=".csv"):
+    # Builds the timestep-based file name used by Event_To_Timestep_Converter.py
+    Values = [
+        Parameters["Bldg"][0],
+        "{:02d}".format(int(Parameters["CZ"])),
+        Parameters["Wat"],
+        Parameters["Prof"],
+        Parameters.get("SDLM", "No"),
+        str(Parameters.get("CFA", "NA")),
+        Parameters["Inc"],
+        str(Parameters["Ver"]),
+    ]
+    if SI == True:
+        Values.append("SI")
+
+    return "_".join(Values) + Extension
+
+
+def Summarize_Profile(Profile, Parameters):
+    # Returns the number of rows and the annual water volume (gal) of a draw profile. The volume is None for hot water profiles without hot water volumes (climate-independent profiles)
+    if Parameters["Format"] == "Event":
+        if "Hot Water Volume (gal)" in Profile.columns and Parameters["Wat"] == "Hot":
+            Volume = Profile["Hot Water Volume (gal)"].sum()
+        elif Parameters["Wat"] == "Hot":
+            Volume = None  # Climate-independent profiles only store the mixed water draws
+        else:
+            Volume = (Profile["Flow Rate (gpm)"] * Profile["Duration (min)"]).sum()
+    else:
+        if "Hot Water Draw Volume (L)" in Profile.columns:
+            Volume = Profile["Hot Water Draw Volume (L)"].sum() / Conversions.L_in_gal
+        else:
+            Volume = Profile["Hot Water Draw Volume (gal)"].sum()
+
+    return len(Profile.index), (None if Volume is None else float(Volume))
+
+
+def _Catalog_Path(Folder_Or_Path):
+    # Accepts either the folder holding the catalog or the path to the catalog itself
+    if Folder_Or_Path.endswith(".sqlite"):
+        return Folder_Or_Path
+    return os.path.join(Folder_Or_Path, Catalog_File_Name)
+
+
+def _Connect(Catalog_Path):
+    Connection = sqlite3.connect(Catalog_Path, timeout=30)
+    Connection.execute(
+        "CREATE TABLE IF NOT EXISTS Profiles ({})".format(
+            ", ".join(
+                "{} {}".format(Column, Type) for Column, Type in Catalog_Columns.items()
+            )
+        )
+    )
+    return Connection
+
+
+def _Read_Profile(Path, Parameters):
+    if Path.endswith(".parquet"):
+        return pd.read_parquet(Path)
+    if Parameters["Format"] == "Timestep":
+        return pd.read_csv(Path, index_col=0)
+    return pd.read_csv(Path)
+
+
+def Register_Profile(Path, Profile=None, Parameters=None, Catalog=None):
+    """
+    Records a draw profile in the catalog. Profile and Parameters are read
+    from the file when not provided. Catalog defaults to the catalog in the
+    folder holding the profile.
+    """
+
+    Catalog_Path = _Catalog_Path(Catalog if Catalog is not None else os.path.dirname(Path))
+    if Parameters is None:
+        Parameters = Parse_Profile_FileName(Path)
+    if Profile is None:
+        Profile = _Read_Profile(Path, Parameters)
+
+    Rows, Volume = Summarize_Profile(Profile, Parameters)
+
+    Entry = {Column: Parameters.get(Column) for Column in Catalog_Columns}
+    Entry["Path"] = os.path.relpath(Path, os.path.dirname(os.path.abspath(Catalog_Path)))
+    Entry["Rows"] = Rows
+    Entry["Annual_Volume_gal"] = Volume
+    Entry["Modified"] = os.path.getmtime(Path)
+
+    with closing(_Connect(Catalog_Path)) as Connection, Connection:
+        Connection.execute(
+            "INSERT OR REPLACE INTO Profiles ({}) VALUES ({})".format(
+                ", ".join(Entry.keys()), ", ".join("?" * len(Entry))
+            ),
+            list(Entry.values()),
+        )
+
+    return Entry
+
+
+def Build_Catalog(Folder, Pattern="*", Rebuild=False):
+    """
+    Indexes every draw profile in Folder matching Pattern. Use '**/*' to
+    include subfolders, E.g. a partitioned Parquet dataset. Files whose
+    modification time matches their catalog entry are skipped unless Rebuild
+    is True. Files that aren't draw profiles are ignored.
+    """
+
+    Catalog_Path = _Catalog_Path(Folder)
+    with closing(_Connect(Catalog_Path)) as Connection:
+        Known = dict(Connection.execute("SELECT Path, Modified FROM Profiles").fetchall())
+
+    for Path in sorted(glob.glob(os.path.join(Folder, Pattern), recursive=True)):
+        if not os.path.isfile(Path) or not any(
+            Path.endswith(Extension) for Extension in Profile_Extensions
+        ):  # Skip the catalog itself and metadata files
+            continue
+        try:
+            Parameters = Parse_Profile_FileName(Path)
+        except ValueError:  # Not a draw profile (E.g. a day code output such as '1Y0.csv')
+            continue
+        Relative_Path = os.path.relpath(Path, Folder)
+        if not Rebuild and Known.get(Relative_Path) == os.path.getmtime(Path):
+            continue
+        Register_Profile(Path, Parameters=Parameters, Catalog=Catalog_Path)
+
+    # Remove entries for profiles that no longer exist
+    with closing(_Connect(Catalog_Path)) as Connection, Connection:
+        for Relative_Path in Known:
+            if not os.path.exists(os.path.join(Folder, Relative_Path)):
+                Connection.execute("DELETE FROM Profiles WHERE Path = ?", [Relative_Path])
+
+    return Catalog_Path
+
+
+def Query_Catalog(Folder, **Filters):
+    """
+    Returns a data frame of the catalog entries matching every filter. Filter
+    values may be single values or lists of acceptable values. The 'Full_Path'
+    column holds the absolute path of each profile.
+    E.g. Query_Catalog(Folder, CZ=3, Bldg='Multi', Bedrooms=2, Wat='Hot')
+    """
+
+    Catalog_Path = _Catalog_Path(Folder)
+
+    Conditions = []
+    Values = []
+    for Column, Value in Filters.items():
+        if Column not in Catalog_Columns:
+            raise KeyError("{} is not a catalog column".format(Column))
+        if Value is None:  # E.g. CZ=None returns the climate-independent profiles
+            Conditions.append("{} IS NULL".format(Column))
+        elif isinstance(Value, (list, tuple, set)):
+            Conditions.append("{} IN ({})".format(Column, ", ".join("?" * len(Value))))
+            Values += list(Value)
+        else:
+            Conditions.append("{} = ?".format(Column))
+            Values.append(Value)
+
+    Query = "SELECT * FROM Profiles"
+    if len(Conditions) > 0:
+        Query += " WHERE " + " AND ".join(Conditions)
+    Query += " ORDER BY Path"
+
+    with closing(_Connect(Catalog_Path)) as Connection:
+        Entries = pd.read_sql_query(Query, Connection, params=Values)
+
+    Entries["Full_Path"] = [
+        os.path.join(os.path.dirname(os.path.abspath(Catalog_Path)), Path)
+        for Path in Entries["Path"]
+    ]
+
+    return Entries
+
+
+# %%----------------------------------INDEX THE DRAW PROFILE FOLDERS-----------------------------
+
+if __name__ == "__main__":
+    root = os.path.dirname(os.path.abspath(__file__))
+    for Folder in [
+        os.path.join(root, "DrawProfiles"),
+        os.path.join(root, "DrawProfiles", "Timestep_Based"),
+    ]:
+        if os.path.exists(Folder):
+            Catalog_Path = Build_Catalog(Folder)
+            print(
+                "Indexed {} profiles in {}".format(
+                    len(Query_Catalog(Catalog_Path).index), Catalog_Path
+                )
+            )
@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Nov  9 10:27:31 2026
+
+This script holds a Profile_Generator object that keeps everything needed to
+create draw profiles in memory: the daily and annual profiles in SourceData,
+the mains water temperature of every climate zone, the hot water temperature
+constants and the distribution system multipliers used for SDLM.
+
+The functions in T24_Draw_Profile_Generator.py take their constants from
+module globals, and Create_Mixed_Profile_NoSDLM and Create_Hot_Profile_NoSDLM
+read the annual profiles on every call (the daily profiles are read once per
+process, see Daily_Profile_Catalog.py). Create_Hot_Profiles in
+SingleDay_DrawProfile_Generator.py reads the daily profiles unless they are
+passed. Long-lived
+processes (E.g. Profile_Service.py, notebooks and sweep workers) create a
+generator once and call its methods as many times as needed:
+    -Dwelling - The annual profile of one dwelling, the same as
+        Create_Dwelling_Profile in T24_Draw_Profile_Generator.py
+    -Building - The profiles of the dwellings of a building, combined if
+        requested, the same as running T24_Draw_Profile_Generator.py
+    -Single_Day - The profiles of one or many day codes on one day of the
+        year, the same as Create_Hot_Profiles
+    -Timestep - The volume drawn in each timestep of a profile
+
+    Generator = Profile_Generator(Version=2019)
+    for ClimateZone in Weather_Data.Climate_Zones:
+        Dwelling_Profile, Included_Code = Generator.Dwelling("Single", 3, ClimateZone=ClimateZone)
+
+Source data is read the first time it is needed and kept for the life of the
+generator. Annual profiles are gathered from the daily profiles of every day
+at once (see Annual_Synthesis.Gather_Draws) instead of day by day, and sorted
+in the same way, so Dwelling returns the same draws as
+Create_Dwelling_Profile in the same order, with a new index and float columns.
+Excluded fixtures are removed from the daily profiles before gathering, as in
+Create_Dwelling_Profile (See Fixture_Filter.py).
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import numpy as np
+import pandas as pd
+
+import Weather_Data
+import Annual_Synthesis
+import Hot_Water_Calculations
+from SingleDay_DrawProfile_Generator import Create_Hot_Profiles, Read_Daily_Profiles
+from Event_To_Timestep_Converter import Bin_Draws
+import Conversions
+import Fixture_Filter
+import Daily_Profile_Catalog
+import T24_Draw_Profile_Generator
+
+# %%--------------------CONSTANTS------------------------
+
+# Distribution system multipliers, per table B-1 in the ACM. Used by Modify_Profile_SDLM in T24_Draw_Profile_Generator.py
+Distribution_System_Multipliers = {
+    "Trunk and Branch": 1,
+    "Central Parallel Piping": 1.1,
+    "Point of Use": 0.3,
+    "Recirculation - Non-Demand Control": 9.8,
+    "Recirculation with Manual Demand Control": 1.75,
+    "Recirculation with Motion Sensor Demand Control": 2.6,
+    "Pipe Insulation": 0.85,
+    "Central Parallel Piping with 5 ft Maximum Length": 1,
+    "Compact Design": 0.7,
+    "Recirculation with Manual Demand Control - HERS": 1.6,
+    "Recirculation with Motion Sensor Demand Control - HERS": 2.4,
+}
+Variants = ["a", "b", "c", "d", "e", "f", "g", "h", "i", "j"]
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Assign_Variants(Building_Type, NumberBedrooms_Dwellings):
+    """
+    Returns the sorted number of bedrooms of each dwelling and its variant,
+    the same way as T24_Draw_Profile_Generator.py: multi-family dwellings
+    with the same number of bedrooms cycle through variants a-j.
+    """
+
+    Bedrooms = sorted(NumberBedrooms_Dwellings)
+    Assigned = []
+    Variant = 0
+    for i in range(len(Bedrooms)):
+        if Building_Type == "Multi" and i != 0:
+            if Bedrooms[i - 1] == Bedrooms[i]:
+                Variant = (Variant + 1) % len(Variants)
+            else:
+                Variant = 0
+        Assigned.append((Bedrooms[i], Variants[Variant]))
+    return Assigned
+
+
+def Distribution_Loss_Multiplier(SquareFootage_Dwelling, Distribution_System_Type):
+    # Returns the distribution loss multiplier per Eqn 5 and 6 of Appendix B in the ACM. Also used by Modify_Profile_SDLM in T24_Draw_Profile_Generator.py
+    Standard_Distribution_Loss_Multiplier = (
+        1.0032
+        + 0.0001864 * min(2500, SquareFootage_Dwelling)
+        - 0.00000002165 * min(2500, SquareFootage_Dwelling) ** 2
+    )  # Calculated per Equation 6 in the ACM. Believe that there is a typo in the ACM, and it should be +1.0032, not =1.0032. Based on both results of equation and comparing to previous versions
+    return (
+        1
+        + (Standard_Distribution_Loss_Multiplier - 1)
+        * Distribution_System_Multipliers[Distribution_System_Type]
+    )  # Combine the Distribution System Multiplier and Standard Distribution Loss Multiplier to get the Distribution Loss Multiplier per Eqn 5 of Appendix B in the ACM
+
+
+class Profile_Generator:
+    """
+    Creates draw profiles from source data and weather data that are loaded
+    once. Version is the default version of the T24 data set used by every
+    method. The temperatures (deg F) and Multiplier_Clotheswasher default to
+    those of T24_Draw_Profile_Generator.py.
+    """
+
+    def __init__(
+        self,
+        Version=T24_Draw_Profile_Generator.Version,
+        Temperature_Supply_Hot_AtFixture=T24_Draw_Profile_Generator.Temperature_Supply_Hot_AtFixture,
+        Temperature_Bath=T24_Draw_Profile_Generator.Temperature_Bath,
+        Temperature_Shower=T24_Draw_Profile_Generator.Temperature_Shower,
+        Multiplier_Clotheswasher=T24_Draw_Profile_Generator.Multiplier_Clotheswasher,
+        Folder_WeatherData=Weather_Data.Folder_WeatherData,
+    ):
+        self.Version = Version
+        self.Temperature_Supply_Hot_AtFixture = Temperature_Supply_Hot_AtFixture
+        self.Temperature_Bath = Temperature_Bath
+        self.Temperature_Shower = Temperature_Shower
+        self.Multiplier_Clotheswasher = Multiplier_Clotheswasher
+        self.T_Mains = Weather_Data.Read_TMains_AllZones(
+            Folder_WeatherData
+        )  # (CZ x day)
+        self._Daily_Profiles = {}
+        self._Clean_Daily_Profiles = {}
+        self._Annual_Profiles = {}
+
+    def Daily_Profiles(self, Building_Type, Version=None):
+        # Returns the daily profiles of a version of the data set, reading them the first time
+        Version = self.Version if Version is None else Version
+        Key = (Version, Building_Type if Version == 2016 else None)
+        if Key not in self._Daily_Profiles:
+            self._Daily_Profiles[Key] = Read_Daily_Profiles(Version, Building_Type)
+        return self._Daily_Profiles[Key]
+
+    def Clean_Daily_Profiles(
+        self,
+        Building_Type,
+        Version=None,
+        Mask=Fixture_Filter.All_Fixtures,
+        Reduce_Clothes=True,
+    ):
+        # Returns the daily profiles with the fixtures in Mask, the clotheswasher corrections and Multiplier_Clotheswasher (see Daily_Profile_Catalog.py), building them the first time
+        Version = self.Version if Version is None else Version
+        Key = (
+            Version,
+            Building_Type if Version == 2016 else None,
+            Mask,
+            Reduce_Clothes,
+        )
+        if Key not in self._Clean_Daily_Profiles:
+            self._Clean_Daily_Profiles[Key] = Fixture_Filter.Filter_Daily_Profiles(
+                Daily_Profile_Catalog.Read_Clean_Daily_Profiles(
+                    Version,
+                    Building_Type,
+                    Reduce_Clothes,
+                    self.Multiplier_Clotheswasher,
+                )[0],
+                Mask,
+            )
+        return self._Clean_Daily_Profiles[Key]
+
+    def Annual_Profiles(self, Building_Type, Version=None):
+        # Returns the annual profiles of a version of the data set, reading them the first time
+        Version = self.Version if Version is None else Version
+        if (Version, Building_Type) not in self._Annual_Profiles:
+            self._Annual_Profiles[(Version, Building_Type)] = (
+                Annual_Synthesis.Read_Annual_Profiles(Version, Building_Type)
+            )
+        return self._Annual_Profiles[(Version, Building_Type)]
+
+    def Mains_Temperature(self, ClimateZone):
+        # Returns the mains water temperature (deg F) of each day of the year
+        if int(ClimateZone) not in Weather_Data.Climate_Zones:
+            raise ValueError("Unknown ClimateZone {}".format(ClimateZone))
+        return self.T_Mains[int(ClimateZone) - 1]
+
+    def Dwelling(
+        self,
+        Building_Type,
+        NumberBedrooms_Dwelling,
+        Variant="a",
+        SquareFootage_Dwelling=1897,
+        ClimateZone=3,
+        Water="Hot",
+        SDLM="Yes",
+        Include_Faucet="Yes",
+        Include_Shower="Yes",
+        Include_Clothes="Yes",
+        Include_Dish="Yes",
+        Include_Bath="Yes",
+        Version=None,
+        Distribution_System_Type="Trunk and Branch",
+        Reduce_Clothes=True,
+    ):
+        """
+        Returns the annual draw profile of one dwelling and the code of its
+        included fixtures (E.g. 'FSCDB'), with the clotheswasher multiplier
+        and, if SDLM = 'Yes', the distribution loss multiplier of
+        SquareFootage_Dwelling (ft2, 1897 by default as in Single_Day).
+        """
+
+        if SDLM == "Yes" and SquareFootage_Dwelling is None:
+            raise ValueError("SDLM = 'Yes' requires SquareFootage_Dwelling")
+        Version = self.Version if Version is None else Version
+        Mask = Fixture_Filter.Fixture_Mask(
+            Include_Faucet, Include_Shower, Include_Clothes, Include_Dish, Include_Bath
+        )
+        Day_Codes = pd.Series(
+            self.Annual_Profiles(Building_Type, Version)[
+                Annual_Synthesis.Annual_Profile_Name(
+                    Building_Type, NumberBedrooms_Dwelling, Variant
+                )
+            ].to_numpy()
+        )
+        Dwelling_Profile = Annual_Synthesis.Gather_Draws(
+            Day_Codes,
+            self.Clean_Daily_Profiles(Building_Type, Version, Mask, Reduce_Clothes),
+            Reduce_Clothes=False,
+        )  # The daily profiles are already corrected
+        Dwelling_Profile = Dwelling_Profile.sort_values(
+            ["Start Time of Year (hr)"]
+        ).reset_index(
+            drop=True
+        )  # Sorts the draws in chronological order, the same way as Create_Hot_Profile_NoSDLM
+
+        Dwelling_Profile.insert(
+            Dwelling_Profile.columns.get_loc("Start Time of Year (hr)"),
+            "Mains Temperature (deg F)",
+            self.Mains_Temperature(ClimateZone)[
+                Dwelling_Profile["Day of Year (Day)"].to_numpy() - 1
+            ],
+        )
+        # Written as floats, as in Create_Dwelling_Profile
+        Dwelling_Profile["Day of Year (Day)"] = Dwelling_Profile[
+            "Day of Year (Day)"
+        ].astype(float)
+        Fixture = Dwelling_Profile["Fixture"].to_numpy()
+        Duration = Dwelling_Profile["Duration (min)"].to_numpy(dtype=float)
+        if Water == "Hot":
+            Dwelling_Profile["Fraction Hot Water"] = (
+                Hot_Water_Calculations.Calculate_Fraction_HotWater_Array(
+                    Fixture,
+                    Dwelling_Profile["Mains Temperature (deg F)"].to_numpy(),
+                    self.Temperature_Supply_Hot_AtFixture,
+                    self.Temperature_Bath,
+                    self.Temperature_Shower,
+                )
+            )
+            (
+                Dwelling_Profile["Hot Water Flow Rate (gpm)"],
+                Dwelling_Profile["Hot Water Volume (gal)"],
+            ) = Hot_Water_Calculations.Calculate_FlowWater_Hot_Array(
+                Dwelling_Profile["Fraction Hot Water"].to_numpy(),
+                Dwelling_Profile["Flow Rate (gpm)"].to_numpy(dtype=float),
+                Duration,
+            )
+
+        if SDLM == "Yes":
+            Columns = ["Duration (min)"] + (
+                ["Hot Water Volume (gal)"] if Water == "Hot" else []
+            )
+            Multiplier = Distribution_Loss_Multiplier(
+                SquareFootage_Dwelling, Distribution_System_Type
+            )
+            Modified = (Fixture != "CWSH") & (
+                Fixture != "DWSH"
+            )  # All draws except the clotheswasher and dishwasher are modified
+            for Column in Columns:
+                Values = Dwelling_Profile[Column].to_numpy(dtype=float)
+                Dwelling_Profile[Column] = np.where(
+                    Modified, Values * Multiplier, Values
+                )
+
+        return Dwelling_Profile, Fixture_Filter.Included_Code(Mask)
+
+    def Building(
+        self,
+        Building_Type,
+        NumberBedrooms_Dwellings,
+        SquareFootage_Dwellings,
+        Combined="No",
+        Combined_LargeBuilding="No",
+        **Dwelling_Parameters
+    ):
+        """
+        Returns the profiles of the dwellings of a building and the code of
+        the included fixtures. Returns a list of (number of bedrooms,
+        variant, profile) unless Combined or Combined_LargeBuilding = 'Yes',
+        in which case the profiles are combined into one with
+        Combine_Profiles or Combined_Profile_LargeBuilding. The other
+        parameters are passed to Dwelling.
+        """
+
+        Profiles = []
+        for (NumberBedrooms_Dwelling, Variant), SquareFootage_Dwelling in zip(
+            Assign_Variants(Building_Type, NumberBedrooms_Dwellings),
+            SquareFootage_Dwellings,
+        ):  # Square footages are not sorted with the bedrooms, as in T24_Draw_Profile_Generator.py
+            Dwelling_Profile, Included_Code = self.Dwelling(
+                Building_Type,
+                NumberBedrooms_Dwelling,
+                Variant,
+                SquareFootage_Dwelling,
+                **Dwelling_Parameters
+            )
+            Profiles.append((NumberBedrooms_Dwelling, Variant, Dwelling_Profile))
+
+        Water = Dwelling_Parameters.get("Water", "Hot")
+        if Combined == "Yes":
+            return (
+                T24_Draw_Profile_Generator.Combine_Profiles(
+                    [Profile for Bedrooms, Variant, Profile in Profiles], Water
+                )[0],
+                Included_Code,
+            )
+        if Combined_LargeBuilding == "Yes":
+            return (
+                T24_Draw_Profile_Generator.Combined_Profile_LargeBuilding(
+                    [Profile for Bedrooms, Variant, Profile in Profiles], Water
+                ),
+                Included_Code,
+            )
+        return Profiles, Included_Code
+
+    def Single_Day(
+        self,
+        Profile_Type,
+        Day_Of_Year,
+        ClimateZone=3,
+        Building_Type="Single",
+        SquareFootage_Dwelling=1897,
+        Water="Hot",
+        Distribution_System_Type="Trunk and Branch",
+        Version=None,
+        Output="Dict",
+        Temperature_Bath=None,
+        Temperature_Shower=None,
+    ):
+        """
+        Returns the draw profiles of one or many day codes on Day_Of_Year
+        (zero-based), from Create_Hot_Profiles. Output = 'Dict' returns {day
+        code: draw profile}, 'Table' one data frame of all draws.
+        Temperature_Bath and Temperature_Shower default to those of the
+        generator.
+        """
+
+        Version = self.Version if Version is None else Version
+        return Create_Hot_Profiles(
+            Building_Type,
+            Profile_Type,
+            ClimateZone,
+            "Yes",
+            "Yes",
+            "Yes",
+            "Yes",
+            "Yes",
+            Version,
+            self.Mains_Temperature(ClimateZone),
+            Day_Of_Year,
+            self.Temperature_Bath if Temperature_Bath is None else Temperature_Bath,
+            (
+                self.Temperature_Shower
+                if Temperature_Shower is None
+                else Temperature_Shower
+            ),
+            SquareFootage_Dwelling,
+            Water,
+            Distribution_System_Type,
+            Daily_Profiles=self.Daily_Profiles(Building_Type, Version),
+            Output=Output,
+            Temperature_Supply_Hot_AtFixture=self.Temperature_Supply_Hot_AtFixture,
+        )
+
+    def Timestep(
+        self,
+        Profile,
+        Timestep,
+        Water="Hot",
+        Start_Column="Start Time of Year (hr)",
+        Number_Bins=None,
+    ):
+        """
+        Returns an array of the volume (gal) drawn in each timestep (seconds)
+        of a profile, starting at midnight of the first day. Number_Bins
+        defaults to the timesteps through the end of the last draw. Water =
+        'Hot' bins the hot water, 'Mixed' the mixed water.
+        """
+
+        Flow_Rate = Profile[
+            "Hot Water Flow Rate (gpm)" if Water == "Hot" else "Flow Rate (gpm)"
+        ].to_numpy(dtype=float)
+        Start_Time = Profile[Start_Column].to_numpy(dtype=float)
+        Duration = Profile["Duration (min)"].to_numpy(dtype=float)
+        if Number_Bins is None:
+            Timestep_Hours = Timestep / (
+                Conversions.seconds_in_minute * Conversions.minutes_in_hour
+            )
+            End_Time = Start_Time + Duration / Conversions.minutes_in_hour
+            Number_Bins = (
+                int(np.floor(End_Time.max() / Timestep_Hours)) + 1
+                if len(End_Time) > 0
+                else 0
+            )  # Through the end of the last draw
+        return Bin_Draws(Start_Time, Duration, Flow_Rate, Timestep, Number_Bins)
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Oct 23 11:40:52 2026
+
+This script plots timestep-based draw profiles with millions of points.
+TimestepBased_Compiler.py previously drew every timestep of the year (~2
+million points at 15 seconds) for each building, which is slow to draw and
+can't show more detail than the width of the figure in pixels anyway.
+
+The functions in this script:
+    -Downsample_MinMax - Splits the series into bins and keeps the minimum and
+        maximum of each bin. Keeps every peak, so draw spikes aren't lost
+    -Downsample_LTTB - Largest-Triangle-Three-Buckets. Keeps the point in each
+        bucket that best preserves the visual shape of the series
+    -Plot_Profile - Downsamples and plots one series. Matplotlib is only
+        imported when a plot is drawn
+    -Render_Plots - Saves many plots to image files in parallel processes,
+        without a display (Agg backend)
+    -Zoom_Pyramid and Write_HTML - Downsample the series at increasing
+        resolution so interactive HTML views (E.g. Debugging.html) load the
+        coarsest level instantly, and switch to finer levels when zoomed in.
+        Write_HTML requires the bokeh package
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import numpy as np
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+# %%--------------------CONSTANTS------------------------
+
+Default_Points = 4000  # Number of points drawn per series. About twice the width of a figure in pixels
+Methods = ["MinMax", "LTTB", "None"]
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def _Import_Pyplot(Headless=False):
+    try:
+        import matplotlib
+
+        if Headless:
+            matplotlib.use("Agg")  # Draw to files without a display
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise ImportError("Plotting requires the matplotlib package")
+    return plt
+
+
+def _As_Numbers(X):
+    # Returns X as floats for the downsampling arithmetic. Datetimes become nanoseconds
+    X = np.asarray(X)
+    if X.dtype.kind == "M":
+        return X.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return X.astype(float)
+
+
+def Downsample_MinMax(X, Y, Points=Default_Points):
+    """
+    Returns X and Y reduced to at most Points points by keeping the minimum
+    and maximum of Y in each of Points / 2 equal bins, in their original
+    order. Series that are already short enough are returned unchanged.
+    """
+
+    X = np.asarray(X)
+    Y = np.asarray(Y, dtype=float)
+    Bins = max(Points // 2, 1)
+    if len(Y) <= Points:
+        return X, Y
+
+    Size = len(Y) // Bins
+    Grid = Y[: Bins * Size].reshape(Bins, Size)  # The remainder joins the last bin below
+    Offsets = np.arange(Bins) * Size
+    Minimum = Offsets + Grid.argmin(axis=1)
+    Maximum = Offsets + Grid.argmax(axis=1)
+
+    Remainder = Y[(Bins - 1) * Size :]
+    Minimum[-1] = (Bins - 1) * Size + Remainder.argmin()
+    Maximum[-1] = (Bins - 1) * Size + Remainder.argmax()
+
+    Keep = np.unique(np.concatenate([Minimum, Maximum]))  # Sorted, and a flat bin keeps only one point
+    return X[Keep], Y[Keep]
+
+
+def Downsample_LTTB(X, Y, Points=Default_Points):
+    """
+    Returns X and Y reduced to Points points with the
+    Largest-Triangle-Three-Buckets algorithm (Steinarsson, 2013). The first and
+    last points are always kept.
+    """
+
+    X = np.asarray(X)
+    Y = np.asarray(Y, dtype=float)
+    if len(Y) <= Points or Points < 3:
+        return X, Y
+
+    X_Numbers = _As_Numbers(X)
+    Edges = np.linspace(1, len(Y) - 1, Points - 1).astype(int)  # Bucket edges, excluding the first and last point
+    Keep = np.empty(Points, dtype=int)
+    Keep[0] = 0
+    Keep[-1] = len(Y) - 1
+
+    for Bucket in range(Points - 2):
+        Start, End = Edges[Bucket], Edges[Bucket + 1]
+        Next_Start = End
+        Next_End = Edges[Bucket + 2] if Bucket + 2 < len(Edges) else len(Y)
+        Next_X = X_Numbers[Next_Start:Next_End].mean()  # The average of the next bucket is the third corner of the triangle
+        Next_Y = Y[Next_Start:Next_End].mean()
+        Previous = Keep[Bucket]
+        Area = np.abs(
+            (X_Numbers[Previous] - Next_X) * (Y[Start:End] - Y[Previous])
+            - (X_Numbers[Previous] - X_Numbers[Start:End]) * (Next_Y - Y[Previous])
+        )
+        Keep[Bucket + 1] = Start + Area.argmax()
+
+    return X[Keep], Y[Keep]
+
+
+def Downsample(X, Y, Method="MinMax", Points=Default_Points):
+    if Method == "MinMax":
+        return Downsample_MinMax(X, Y, Points)
+    if Method == "LTTB":
+        return Downsample_LTTB(X, Y, Points)
+    if Method == "None":
+        return np.asarray(X), np.asarray(Y)
+    raise ValueError("Method must be one of {}".format(Methods))
+
+
+def Plot_Profile(
+    X,
+    Y,
+    Title="",
+    Path=None,
+    Method="MinMax",
+    Points=Default_Points,
+    Y_Label="",
+    Headless=False,
+):
+    """
+    Downsamples and plots one series. If Path is given the figure is saved to
+    it and closed, otherwise the figure is returned.
+    """
+
+    plt = _Import_Pyplot(Headless or Path is not None)
+    X, Y = Downsample(X, Y, Method, Points)
+
+    fig = plt.figure()
+    plt.plot(X, Y)
+    plt.title(Title)
+    plt.ylabel(Y_Label)
+
+    if Path is not None:
+        fig.savefig(Path)
+        plt.close(fig)
+        return Path
+    return fig
+
+
+def _Render(Plot):
+    return Plot_Profile(**dict(Plot, Headless=True))
+
+
+def Render_Plots(Plots, Processes=None):
+    """
+    Saves a list of plots to image files in parallel. Each plot is a
+    dictionary of Plot_Profile arguments, including "Path". Series are sent
+    to the worker processes as they are, so downsample them first (Method =
+    'None' then skips the second pass) to keep the transfer small. Returns the
+    paths of the saved plots.
+    """
+
+    if Processes == 1 or len(Plots) <= 1:
+        return [_Render(Plot) for Plot in Plots]
+
+    with ProcessPoolExecutor(max_workers=Processes) as Executor:
+        return list(Executor.map(_Render, Plots))
+
+
+def Zoom_Pyramid(X, Y, Levels=5, Points=Default_Points, Method="MinMax"):
+    """
+    Returns a list of (X, Y) pairs, one per zoom level. Level 0 has Points
+    points across the whole series and each level doubles the resolution, so
+    level n shows about Points points when 1/2^n of the series is visible.
+    The last level is never finer than the original series.
+    """
+
+    Pyramid = []
+    for Level in range(Levels):
+        Pyramid.append(Downsample(X, Y, Method, Points * 2**Level))
+        if len(Pyramid[-1][1]) == len(Y):  # Reached the original resolution
+            break
+    return Pyramid
+
+
+def _Pyramid_Lists(X, Y, Levels, Points, Method):
+    # Returns the zoom pyramid as lists for javascript plotting libraries, with datetimes as milliseconds since 1970
+    Scale = 1e6 if np.asarray(X).dtype.kind == "M" else 1
+    return [
+        ((_As_Numbers(Level_X) / Scale).tolist(), Level_Y.tolist())
+        for Level_X, Level_Y in Zoom_Pyramid(X, Y, Levels, Points, Method)
+    ]
+
+
+def Write_Zoom_Pyramid(Path, X, Y, Levels=5, Points=Default_Points, Method="MinMax"):
+    # Saves a zoom pyramid as .json, for interactive views that load each level as needed
+    with open(Path, "w") as Pyramid_File:
+        json.dump(
+            {
+                "Points": Points,
+                "Levels": [
+                    {"x": Level_X, "y": Level_Y}
+                    for Level_X, Level_Y in _Pyramid_Lists(X, Y, Levels, Points, Method)
+                ],
+            },
+            Pyramid_File,
+        )
+    return Path
+
+
+def Write_HTML(Path, X, Y, Title="", Levels=5, Points=Default_Points, Method="MinMax"):
+    """
+    Saves an interactive bokeh plot of the series to Path. The plot opens at
+    the coarsest zoom level and swaps in finer levels of the zoom pyramid,
+    limited to the visible range, as the user zooms in.
+    """
+
+    try:
+        from bokeh.plotting import figure, output_file, save
+        from bokeh.models import ColumnDataSource, CustomJS
+    except ImportError:
+        raise ImportError("HTML plots require the bokeh package")
+
+    Is_Datetime = np.asarray(X).dtype.kind == "M"
+    Pyramid = _Pyramid_Lists(X, Y, Levels, Points, Method)
+
+    Source = ColumnDataSource(data={"x": Pyramid[0][0], "y": Pyramid[0][1]})
+    Plot = figure(
+        title=Title,
+        x_axis_type="datetime" if Is_Datetime else "linear",
+        sizing_mode="stretch_width",
+    )
+    Plot.line("x", "y", source=Source)
+
+    Callback = CustomJS(
+        args={"source": Source, "range": Plot.x_range},
+        code="""
+        const levels = %s;
+        const span = levels[0][0][levels[0][0].length - 1] - levels[0][0][0];
+        const visible = Math.max((range.end - range.start) / span, 1e-9);
+        const level = Math.min(levels.length - 1, Math.max(0, Math.ceil(Math.log2(1 / visible))));
+        const [x, y] = levels[level];
+        let first = 0, last = x.length;
+        while (first < x.length && x[first] < range.start) { first++; }
+        while (last > first && x[last - 1] > range.end) { last--; }
+        first = Math.max(first - 1, 0);
+        last = Math.min(last + 1, x.length);
+        source.data = {x: x.slice(first, last), y: y.slice(first, last)};
+        """
+        % json.dumps(Pyramid),
+    )  # Chooses the level whose resolution matches the visible fraction of the series
+    Plot.x_range.js_on_change("end", Callback)
+
+    output_file(Path, title=Title)
+    save(Plot)
+
+    return Path
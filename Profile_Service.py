@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 27 13:18:06 2026
+
+This script runs a small local HTTP service that generates draw profiles for
+co-simulations (E.g. HPWH controller studies). Studies previously started a
+new Python process for every profile, importing pandas and re-reading
+SourceData and the weather files each time. The service reads them once when
+it starts, keeps the results of recent requests in an LRU cache limited to
+Cache_Size bytes of response bodies and returns them in about a millisecond.
+
+Requests are HTTP GET requests with the parameters in the query string:
+    -/single - The draw profile of one day code on one day of the year, from
+        Profile_Generator.Single_Day (Create_Hot_Profiles in
+        SingleDay_DrawProfile_Generator.py). E.g.
+        /single?Code=1D0&Day_Of_Year=200&ClimateZone=12&Timestep=15
+    -/annual - The annual draw profile of one dwelling, from
+        Profile_Generator.Dwelling (the same as Create_Dwelling_Profile in
+        T24_Draw_Profile_Generator.py). E.g.
+        /annual?Building_Type=Multi&NumberBedrooms_Dwelling=2&Variant=b&ClimateZone=3&Timestep=15
+    -/stats - The number and size (bytes) of cached responses, hits and misses
+The parameters not given take the default values in Single_Defaults and
+Annual_Defaults. Parameters with a fixed set of values are checked against
+Options, and invalid requests or profiles that can't be generated (E.g.
+Version=2016 for single family dwellings) return 400 with the error.
+
+If Timestep (seconds) is given the profile is converted to timestep-based with
+Bin_Draws, otherwise the individual draws are returned. Format = 'json'
+(default) returns the draws as {"columns": [...], "data": [[...], ...]}, or a
+timestep-based profile as {"Timestep": ..., "Volume (gal)": [...]}. Format =
+'binary' returns the timestep-based volumes as little-endian float64 bytes,
+with the timestep in the 'X-Timestep' header, for clients that read them
+straight into an array (E.g. numpy.frombuffer).
+
+Responses are cached by the full parameter tuple, so any change to any
+parameter is a new profile. Set Socket_Path to serve on a Unix socket instead
+of Host and Port.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import asyncio
+import json
+import urllib.parse
+from collections import OrderedDict
+
+import Weather_Data
+from Profile_Generator import (
+    Profile_Generator,
+    Distribution_System_Multipliers,
+    Variants,
+)
+
+# %%--------------------INPUTS---------------------------
+
+Host = "127.0.0.1"  # Only serve requests from this computer
+Port = 8765
+Socket_Path = None  # Path to a Unix socket. If not None the service uses it instead of Host and Port
+Cache_Size = 1024**3  # Bytes. The least recently used responses are evicted once the cached bodies are larger than this. One annual profile at a 15 second timestep is about 46 MB as JSON
+
+# %%--------------------CONSTANTS------------------------
+
+Single_Defaults = {
+    "Code": "1D0",
+    "Day_Of_Year": 200,
+    "ClimateZone": 3,
+    "Version": 2019,
+    "Building_Type": "Single",
+    "SquareFootage_Dwelling": 1897,
+    "Water": "Hot",
+    "Distribution_System_Type": "Trunk and Branch",
+    "Temperature_Bath": 105,
+    "Temperature_Shower": 105,
+    "Timestep": None,
+    "Format": "json",
+}
+Annual_Defaults = {
+    "Building_Type": "Single",
+    "NumberBedrooms_Dwelling": 3,
+    "Variant": "a",
+    "ClimateZone": 3,
+    "Version": 2019,
+    "Water": "Hot",
+    "SDLM": "Yes",
+    "SquareFootage_Dwelling": 1897,
+    "Distribution_System_Type": "Trunk and Branch",
+    "Timestep": None,
+    "Format": "json",
+}
+Formats = ["json", "binary"]
+Options = {
+    "ClimateZone": Weather_Data.Climate_Zones,
+    "Version": [2016, 2019],
+    "Building_Type": ["Single", "Multi"],
+    "Variant": Variants,
+    "Water": ["Hot", "Mixed"],
+    "SDLM": ["Yes", "No"],
+    "Distribution_System_Type": list(Distribution_System_Multipliers),
+    "Format": Formats,
+}  # The allowed values of the parameters that have a fixed set
+Statuses = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+class LRU_Cache:
+    # A dictionary of responses that keeps the most recently used ones whose bodies total at most Size bytes
+    def __init__(self, Size):
+        self.Size = Size
+        self.Entries = OrderedDict()
+        self.Bytes = 0
+        self.Hits = 0
+        self.Misses = 0
+
+    def Get(self, Key):
+        if Key not in self.Entries:
+            self.Misses += 1
+            return None
+        self.Hits += 1
+        self.Entries.move_to_end(Key)
+        return self.Entries[Key]
+
+    def Put(self, Key, Value):
+        # Value is (body, content type, headers). Bodies larger than the whole cache are not kept
+        if Key in self.Entries:
+            self.Bytes -= len(self.Entries.pop(Key)[0])
+        if len(Value[0]) > self.Size:
+            return
+        self.Entries[Key] = Value
+        self.Bytes += len(Value[0])
+        while self.Bytes > self.Size:
+            self.Bytes -= len(
+                self.Entries.popitem(last=False)[1][0]
+            )  # Evict the least recently used entry
+
+
+def _Parse_Parameters(Query, Defaults):
+    # Returns the request parameters as a key ordered like Defaults, converting each to the type of its default
+    Parameters = dict(Defaults)
+    for Name, Value in urllib.parse.parse_qsl(Query):
+        if Name not in Defaults:
+            raise ValueError("Unknown parameter {}".format(Name))
+        Default = Defaults[Name]
+        if isinstance(Default, int) and not isinstance(Default, bool):
+            Value = int(Value)
+        elif isinstance(Default, float) or Name == "Timestep":
+            Value = float(Value)
+        Parameters[Name] = Value
+    for Name, Allowed in Options.items():
+        if Name in Parameters and Parameters[Name] not in Allowed:
+            raise ValueError("{} must be one of {}".format(Name, Allowed))
+    if Parameters["Format"] == "binary" and Parameters["Timestep"] is None:
+        raise ValueError("Format = 'binary' requires a Timestep")
+    return tuple(Parameters.items())
+
+
+class Profile_Service:
+    """
+    Generates and caches draw profiles. The source data and mains water
+    temperatures are held by a Profile_Generator for the life of the service.
+    """
+
+    def __init__(self, Cache_Size=Cache_Size):
+        self.Cache = LRU_Cache(Cache_Size)
+        self.Generator = Profile_Generator()
+        self.Pending = {}  # Requests being generated. Simultaneous identical requests share one
+
+    def Create_Single(self, Parameters):
+        # Returns the draws of one day code, with start times relative to midnight of that day
+        return self.Generator.Single_Day(
+            Parameters["Code"],
+            Parameters["Day_Of_Year"],
+            Parameters["ClimateZone"],
+            Parameters["Building_Type"],
+            Parameters["SquareFootage_Dwelling"],
+            Parameters["Water"],
+            Parameters["Distribution_System_Type"],
+            Parameters["Version"],
+            Temperature_Bath=Parameters["Temperature_Bath"],
+            Temperature_Shower=Parameters["Temperature_Shower"],
+        )[Parameters["Code"]]
+
+    def Create_Annual(self, Parameters):
+        # Returns the annual draws of one dwelling, processed the same way as in T24_Draw_Profile_Generator.py
+        return self.Generator.Dwelling(
+            Parameters["Building_Type"],
+            Parameters["NumberBedrooms_Dwelling"],
+            Parameters["Variant"],
+            Parameters["SquareFootage_Dwelling"],
+            Parameters["ClimateZone"],
+            Parameters["Water"],
+            Parameters["SDLM"],
+            Version=Parameters["Version"],
+            Distribution_System_Type=Parameters["Distribution_System_Type"],
+        )[0]
+
+    def Convert(self, Profile, Start_Column, Water, Timestep):
+        # Returns the volume drawn in each timestep, starting at midnight of the first day
+        return self.Generator.Timestep(Profile, Timestep, Water, Start_Column)
+
+    def Generate(self, Kind, Key):
+        # Generates the response body and content type of a request. Runs in a worker thread
+        Parameters = dict(Key)
+        if Kind == "single":
+            Profile = self.Create_Single(Parameters)
+            Start_Column = "Start time (hr)"
+        else:
+            Profile = self.Create_Annual(Parameters)
+            Start_Column = "Start Time of Year (hr)"
+
+        if Parameters["Timestep"] is None:
+            Body = Profile.to_json(orient="split", index=False)
+            return Body.encode(), "application/json", {}
+
+        Volume = self.Convert(
+            Profile, Start_Column, Parameters["Water"], Parameters["Timestep"]
+        )
+        Headers = {"X-Timestep": str(Parameters["Timestep"])}
+        if Parameters["Format"] == "binary":
+            return Volume.astype("<f8").tobytes(), "application/octet-stream", Headers
+        Body = json.dumps(
+            {"Timestep": Parameters["Timestep"], "Volume (gal)": Volume.tolist()}
+        )
+        return Body.encode(), "application/json", Headers
+
+    async def Respond(self, Kind, Query):
+        # Returns the cached response of a request, generating it if needed
+        Defaults = Single_Defaults if Kind == "single" else Annual_Defaults
+        Key = (Kind,) + _Parse_Parameters(Query, Defaults)
+
+        Response = self.Cache.Get(Key)
+        if Response is not None:
+            return Response
+        if Key not in self.Pending:
+            self.Pending[Key] = asyncio.get_running_loop().run_in_executor(
+                None, self.Generate, Kind, Key[1:]
+            )  # Generate in a thread so the service keeps answering cached requests
+        try:
+            Response = await asyncio.shield(self.Pending[Key])
+        finally:
+            self.Pending.pop(Key, None)
+        self.Cache.Put(Key, Response)
+        return Response
+
+    async def Handle(self, Reader, Writer):
+        # Answers the HTTP requests of one connection. Connections are kept alive until the client closes them
+        try:
+            while True:
+                Request_Line = await Reader.readline()
+                if not Request_Line:
+                    break
+                while (await Reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # Skip the headers. Requests have no body
+
+                Status, Body, Content_Type, Headers = 200, b"", "application/json", {}
+                try:
+                    Words = Request_Line.decode("latin-1").split()
+                    if len(Words) < 2:
+                        raise ValueError("Malformed request line")
+                    Method, Target = Words[:2]
+                    Path, _, Query = Target.partition("?")
+                    if Method != "GET":
+                        Status = 405
+                    elif Path.strip("/") in ["single", "annual"]:
+                        Body, Content_Type, Headers = await self.Respond(
+                            Path.strip("/"), Query
+                        )
+                    elif Path.strip("/") == "stats":
+                        Body = json.dumps(
+                            {
+                                "Entries": len(self.Cache.Entries),
+                                "Bytes": self.Cache.Bytes,
+                                "Hits": self.Cache.Hits,
+                                "Misses": self.Cache.Misses,
+                            }
+                        ).encode()
+                    else:
+                        Status = 404
+                # Invalid parameters, or any error while generating the profile (E.g. a profile missing from the source data), are reported to the client instead of closing the connection
+                except Exception as Error:
+                    Status = 400
+                    Body = json.dumps(
+                        {"Error": "{}: {}".format(type(Error).__name__, Error)}
+                    ).encode()
+                    Content_Type, Headers = "application/json", {}
+
+                Header_Lines = "".join(
+                    "{}: {}\r\n".format(Name, Value) for Name, Value in Headers.items()
+                )
+                Writer.write(
+                    "HTTP/1.1 {} {}\r\nContent-Type: {}\r\nContent-Length: {}\r\n{}\r\n".format(
+                        Status, Statuses[Status], Content_Type, len(Body), Header_Lines
+                    ).encode(
+                        "latin-1"
+                    )
+                    + Body
+                )
+                await Writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            Writer.close()
+
+    async def Serve(self, Host=Host, Port=Port, Socket_Path=Socket_Path):
+        if Socket_Path is not None:
+            Server = await asyncio.start_unix_server(self.Handle, path=Socket_Path)
+        else:
+            Server = await asyncio.start_server(self.Handle, Host, Port)
+        async with Server:
+            await Server.serve_forever()
+
+
+# %%----------------------------------START THE SERVICE-----------------------------
+
+if __name__ == "__main__":
+    Service = Profile_Service(Cache_Size)
+    print(
+        "Serving draw profiles on {}".format(
+            Socket_Path
+            if Socket_Path is not None
+            else "http://{}:{}".format(Host, Port)
+        )
+    )
+    asyncio.run(Service.Serve(Host, Port, Socket_Path))
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Fri Nov  6 11:17:42 2026
+
+This script reports the progress of long loops: the dwelling loop of
+T24_Draw_Profile_Generator.py, Combine_Profiles, the timestep conversion loop
+of Event_To_Timestep_Converter.py, the climate zone loop of
+Convert_Profile_Climate_Zone.py and the chunks of Ensemble_Generator.py. A
+500-dwelling combine or a full climate zone sweep previously printed nothing
+until the end.
+
+    Tracker = Progress.Progress("Dwellings", len(NumberBedrooms_Dwellings), "dwellings")
+    for ...:
+        ...
+        Tracker.Update(Rows=len(Dwelling_Profile))
+    Tracker.Close()
+
+Each report states the task, the number of items done out of Total, the
+percentage done, the items and rows processed per second, the elapsed time
+and the estimated time remaining (ETA). Reports are printed to stderr at most
+once every Interval seconds, so Update is cheap enough to call on every
+iteration of a hot loop: between reports it only adds to two counters and
+reads the clock.
+
+Setting the DRAWPROFILE_PROGRESS environment variable to a file path also
+appends every report to that file as one JSON object per line, for job
+schedulers. Worker processes inherit the variable and append to the same
+file, and each line states the process id, so the progress of every worker
+of a process pool can be followed. Set it to '-' to write the JSON lines to
+stdout instead.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import os
+import sys
+import json
+import time
+
+# %%--------------------CONSTANTS------------------------
+
+Progress_Output = os.environ.get("DRAWPROFILE_PROGRESS")
+Default_Interval = 5.0  # Seconds between reports
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def _Format_Time(Seconds):
+    # Returns a duration as h:mm:ss
+    if Seconds is None:
+        return "?"
+    Minutes, Seconds = divmod(int(round(Seconds)), 60)
+    Hours, Minutes = divmod(Minutes, 60)
+    return "{}:{:02d}:{:02d}".format(Hours, Minutes, Seconds)
+
+
+class Progress:
+    """
+    Tracks the progress of Total items of a task. Unit names the items in the
+    printed reports (E.g. 'dwellings'). Set Quiet = True to only write the
+    JSON reports.
+    """
+
+    def __init__(
+        self, Task, Total, Unit="items", Interval=Default_Interval, Quiet=False
+    ):
+        self.Task = Task
+        self.Total = Total
+        self.Unit = Unit
+        self.Interval = Interval
+        self.Quiet = Quiet
+        self.Done = 0
+        self.Rows = 0
+        self.Start = time.perf_counter()
+        self.Next_Report = self.Start + Interval
+
+    def Update(self, Count=1, Rows=0):
+        # Adds Count items (and Rows rows) to the progress, and reports it if Interval has passed since the last report
+        self.Done += Count
+        self.Rows += Rows
+        Now = time.perf_counter()
+        if Now >= self.Next_Report:
+            self.Report(Now)
+
+    def Status(self, Now=None):
+        # Returns the current progress as a dictionary
+        Elapsed = (time.perf_counter() if Now is None else Now) - self.Start
+        Rate = self.Done / Elapsed if Elapsed > 0 else None
+        # The time remaining is unknown until the first item is done, or if the total is unknown
+        Remaining = None
+        if Rate and self.Total is not None:
+            Remaining = max(self.Total - self.Done, 0) / Rate
+        return {
+            "Task": self.Task,
+            "Done": self.Done,
+            "Total": self.Total,
+            "Percent": (
+                100.0 * self.Done / self.Total if self.Total else None
+            ),  # None if the total is unknown
+            "Rate (/s)": Rate,
+            "Rows": self.Rows,
+            "Rows Rate (/s)": self.Rows / Elapsed if Elapsed > 0 else None,
+            "Elapsed (s)": Elapsed,
+            "ETA (s)": Remaining,
+            "PID": os.getpid(),
+            "Time": time.time(),
+        }
+
+    def Report(self, Now=None, Final=False):
+        Status = dict(self.Status(Now), Final=Final)
+        self.Next_Report = (time.perf_counter() if Now is None else Now) + self.Interval
+
+        if not self.Quiet:
+            print(
+                "{}: {}/{} {} ({}), {:.1f} {}/s{}, elapsed {}, ETA {}".format(
+                    self.Task,
+                    self.Done,
+                    "?" if self.Total is None else self.Total,
+                    self.Unit,
+                    (
+                        "?"
+                        if Status["Percent"] is None
+                        else "{:.1f}%".format(Status["Percent"])
+                    ),
+                    Status["Rate (/s)"] or 0,
+                    self.Unit,
+                    (
+                        ", {:.0f} rows/s".format(Status["Rows Rate (/s)"])
+                        if self.Rows > 0
+                        else ""
+                    ),
+                    _Format_Time(Status["Elapsed (s)"]),
+                    _Format_Time(Status["ETA (s)"]),
+                ),
+                file=sys.stderr,
+                flush=True,
+            )
+
+        if Progress_Output == "-":
+            print(json.dumps(Status), flush=True)
+        elif Progress_Output:
+            with open(Progress_Output, "a") as File:
+                File.write(
+                    json.dumps(Status) + "\n"
+                )  # One short write per line, so lines from several processes don't interleave
+
+        return Status
+
+    def Close(self):
+        # Reports the final progress
+        return self.Report(Final=True)
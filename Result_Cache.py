@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Nov  4 09:38:51 2026
+
+This script stores the results of T24_Draw_Profile_Generator.py,
+Event_To_Timestep_Converter.py and Convert_Profile_Climate_Zone.py in a
+content-addressed cache, so runs with the same inputs return the stored result
+instead of recalculating it. Nightly sweeps mostly regenerate profiles whose
+inputs have not changed. The cache is off by default, since it can grow to
+Default_Max_Size: set Use_Cache = 'Yes' in the INPUTS section of a script to
+use it.
+
+Each result is stored under a key that is the SHA-256 hash of everything it
+depends on (see Cache_Key):
+    -The parameters of the result (E.g. version, building type, bedrooms,
+        variant, CFA, climate zone, fixtures, temperatures and multipliers)
+    -The contents of the input files (E.g. the files in SourceData, the
+        weather file or the event-based profile being converted). Files are
+        only re-hashed when their size or modification time changes
+    -The source code of the functions that calculate the result, so editing
+        a calculation invalidates the results it created. Calculations that
+        are not in a function (E.g. the clotheswasher multiplier in
+        T24_Draw_Profile_Generator.py) are covered by their parameters
+
+Results are pickled to [Folder]/[first 2 characters of key]/[key].pkl. Each
+hit updates the modification time of the file, and once the cache is larger
+than Max_Size bytes the least recently used results are deleted. Several
+processes can share a cache: results are written to a temporary file and
+renamed into place, and reads, writes and evictions hold a lock on
+[Folder]/Cache.lock (shared for reads, exclusive otherwise).
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import os
+import glob
+import json
+import pickle
+import hashlib
+import inspect
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    root = os.path.dirname(os.path.abspath(__file__))
+except:
+    root = os.getcwd()
+
+# %%--------------------CONSTANTS------------------------
+
+Folder_Cache = os.path.join(root, "DrawProfiles", "Cache")
+Default_Max_Size = 5 * 1024**3  # Bytes. 5 GB
+Cache_Format = 1  # Increase to invalidate every stored result (E.g. after changing how results are pickled)
+
+# {path: (size, modification time, hash)}, so unchanged files are only read once per process
+_File_Hashes = {}
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Hash_File(Path):
+    # Returns the SHA-256 hash of the contents of a file
+    Status = os.stat(Path)
+    if Path in _File_Hashes and _File_Hashes[Path][:2] == (
+        Status.st_size,
+        Status.st_mtime_ns,
+    ):
+        return _File_Hashes[Path][2]
+
+    Hash = hashlib.sha256()
+    with open(Path, "rb") as File:
+        for Block in iter(lambda: File.read(1024**2), b""):
+            Hash.update(Block)
+    _File_Hashes[Path] = (Status.st_size, Status.st_mtime_ns, Hash.hexdigest())
+    return Hash.hexdigest()
+
+
+def Source_Data_Files(Version):
+    # Returns the files in SourceData used by a version of the data set
+    return sorted(glob.glob(os.path.join(root, "SourceData", str(Version), "*.csv")))
+
+
+def Cache_Key(Parameters, Files=(), Functions=()):
+    """
+    Returns the key of a result: the SHA-256 hash of Parameters (a dictionary
+    of JSON serializable values, or values whose str is stable), the contents
+    of Files and the source code of Functions.
+    """
+
+    Hash = hashlib.sha256()
+    Hash.update(
+        json.dumps(
+            {"Cache_Format": Cache_Format, "Parameters": Parameters},
+            sort_keys=True,
+            default=str,
+        ).encode()
+    )
+    for Path in Files:
+        Hash.update(os.path.basename(Path).encode() + Hash_File(Path).encode())
+    for Function in Functions:
+        Hash.update(inspect.getsource(Function).encode())
+    return Hash.hexdigest()
+
+
+@contextmanager
+def _Lock(Path, Shared=False):
+    # Holds a lock on Path for the duration of the with block. Windows locks are always exclusive
+    with open(Path, "a+b") as File:
+        if fcntl is not None:
+            fcntl.flock(File, fcntl.LOCK_SH if Shared else fcntl.LOCK_EX)
+        else:
+            File.seek(0)
+            msvcrt.locking(File.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(File, fcntl.LOCK_UN)
+            else:
+                File.seek(0)
+                msvcrt.locking(File.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class Result_Cache:
+    """
+    A size-bounded cache of results on disk, shared by every process using
+    the same Folder.
+    """
+
+    def __init__(self, Folder=Folder_Cache, Max_Size=Default_Max_Size):
+        self.Folder = Folder
+        self.Max_Size = Max_Size
+        self.Hits = 0
+        self.Misses = 0
+        os.makedirs(Folder, exist_ok=True)
+        self.Lock_Path = os.path.join(Folder, "Cache.lock")
+
+    def Path(self, Key):
+        return os.path.join(self.Folder, Key[:2], Key + ".pkl")
+
+    def Get(self, Key):
+        # Returns the stored result, or None if there isn't one
+        Path = self.Path(Key)
+        with _Lock(self.Lock_Path, Shared=True):
+            try:
+                with open(Path, "rb") as File:
+                    Result = pickle.load(File)
+            except FileNotFoundError:
+                self.Misses += 1
+                return None
+            try:
+                os.utime(Path)  # Marks the result as recently used
+            except OSError:  # Another process may have just evicted it
+                pass
+        self.Hits += 1
+        return Result
+
+    def Put(self, Key, Result):
+        # Stores a result, then evicts the least recently used results if the cache is too large
+        Path = self.Path(Key)
+        os.makedirs(os.path.dirname(Path), exist_ok=True)
+        Descriptor, Temporary_Path = tempfile.mkstemp(
+            dir=os.path.dirname(Path), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(Descriptor, "wb") as File:
+                pickle.dump(Result, File, protocol=pickle.HIGHEST_PROTOCOL)
+            with _Lock(self.Lock_Path):
+                os.replace(Temporary_Path, Path)
+                self.Evict()
+        except BaseException:
+            if os.path.exists(Temporary_Path):
+                os.remove(Temporary_Path)
+            raise
+
+    def Get_Or_Calculate(self, Key, Function, *Arguments, **Keyword_Arguments):
+        # Returns the stored result, or calculates and stores it
+        Result = self.Get(Key)
+        if Result is None:
+            Result = Function(*Arguments, **Keyword_Arguments)
+            self.Put(Key, Result)
+        return Result
+
+    def Entries(self):
+        # Returns a list of (modification time, size, path) of every stored result
+        Entries = []
+        for Path in glob.glob(os.path.join(self.Folder, "??", "*.pkl")):
+            try:
+                Status = os.stat(Path)
+            except FileNotFoundError:
+                continue
+            Entries.append((Status.st_mtime_ns, Status.st_size, Path))
+        return Entries
+
+    def Size(self):
+        return sum(Size for Time, Size, Path in self.Entries())
+
+    def Evict(self):
+        # Deletes the least recently used results until the cache is no larger than Max_Size. Called while holding the lock
+        Entries = sorted(self.Entries())
+        Size = sum(Size for Time, Size, Path in Entries)
+        for Time, Entry_Size, Path in Entries:
+            if Size <= self.Max_Size:
+                break
+            try:
+                os.remove(Path)
+            except FileNotFoundError:
+                pass
+            Size -= Entry_Size
+
+    def Clear(self):
+        with _Lock(self.Lock_Path):
+            for Time, Size, Path in self.Entries():
+                os.remove(Path)
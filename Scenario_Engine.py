@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Nov  3 13:52:08 2026
+
+This script runs sensitivity studies on the annual profiles of
+T24_Draw_Profile_Generator.py without regenerating every profile after each
+parameter change. Each profile is calculated in a chain of stages, and every
+stage only depends on the output of the stage before it and on its own
+parameters:
+
+    Assembly -> Fixture_Filter -> Hot_Fraction -> Clotheswasher -> SDLM -> Output
+
+    -Assembly - Gathers the draws of the annual profile for Years and applies
+        the CWSH corrections (Building_Type, NumberBedrooms_Dwelling, Variant,
+        Version, Years, Holidays, Reduce_Clothes)
+    -Fixture_Filter - Removes the fixtures that are not included
+        (Include_Faucet, Include_Shower, Include_Clothes, Include_Dish,
+        Include_Bath)
+    -Hot_Fraction - Adds the mains water temperature and calculates the hot
+        water fraction and flows (ClimateZone, Temperature_Supply_Hot_AtFixture,
+        Temperature_Bath, Temperature_Shower)
+    -Clotheswasher - Multiplies the duration of clotheswasher draws
+        (Multiplier_Clotheswasher)
+    -SDLM - Applies the distribution loss multipliers if SDLM = 'Yes' (SDLM,
+        SquareFootage_Dwelling, Distribution_System_Type, Water)
+    -Output - The annual volume (gal) and the peak volume (gal) drawn in one
+        timestep (Timestep in seconds, Water)
+
+The engine keeps the output of every stage of every profile. Update changes
+parameters and recomputes each profile from the first stage whose parameters
+changed, reusing the stages before it. For instance, changing
+Multiplier_Clotheswasher only recomputes Clotheswasher, SDLM and Output, and
+changing Timestep only recomputes Output. Update returns the change in annual
+and peak volume of every profile:
+
+    Engine = Scenario_Engine(
+        {
+            "1BR": {"NumberBedrooms_Dwelling": 1, "SquareFootage_Dwelling": 780},
+            "2BR": {"NumberBedrooms_Dwelling": 2, "SquareFootage_Dwelling": 960},
+        },
+        Building_Type="Single",
+        ClimateZone=3,
+    )
+    Results = Engine.Run()
+    Delta = Engine.Update(Multiplier_Clotheswasher=2.5)
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import numpy as np
+
+import Annual_Synthesis
+import Daily_Profile_Catalog
+from Event_To_Timestep_Converter import Bin_Draws
+from T24_Draw_Profile_Generator import (
+    Calculate_Fraction_HotWater,
+    Calculate_FlowWater_Hot,
+    Modify_Profile_SDLM,
+    Multiplier_Clotheswasher,
+    Temperature_Supply_Hot_AtFixture,
+    Temperature_Bath,
+    Temperature_Shower,
+)
+
+# %%--------------------CONSTANTS------------------------
+
+# The parameters of every profile, unless given when creating the engine or in the profile
+Default_Parameters = {
+    "Building_Type": "Single",
+    "NumberBedrooms_Dwelling": 3,
+    "Variant": "a",
+    "Version": 2019,
+    "Years": Annual_Synthesis.CEC_Year,
+    "Holidays": None,
+    "Reduce_Clothes": True,
+    "Include_Faucet": "Yes",
+    "Include_Shower": "Yes",
+    "Include_Clothes": "Yes",
+    "Include_Dish": "Yes",
+    "Include_Bath": "Yes",
+    "ClimateZone": 3,
+    "Temperature_Supply_Hot_AtFixture": Temperature_Supply_Hot_AtFixture,
+    "Temperature_Bath": Temperature_Bath,
+    "Temperature_Shower": Temperature_Shower,
+    "Multiplier_Clotheswasher": Multiplier_Clotheswasher,
+    "SDLM": "Yes",
+    "SquareFootage_Dwelling": 2000,
+    "Distribution_System_Type": "Trunk and Branch",
+    "Water": "Hot",
+    "Timestep": 3600,  # Seconds. The peak volume is the largest volume drawn in one timestep
+}
+Fixtures = {
+    "Include_Faucet": "FAUC",
+    "Include_Shower": "SHWR",
+    "Include_Clothes": "CWSH",
+    "Include_Dish": "DWSH",
+    "Include_Bath": "BATH",
+}
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def _Dates(Parameters):
+    # Returns the dates of the profile's years
+    Years = np.atleast_1d(Parameters["Years"])
+    return pd.date_range(
+        "{}-01-01".format(Years.min()), "{}-12-31".format(Years.max()), freq="D"
+    )
+
+
+def _Freeze(Value):
+    # Returns a hashable copy of a parameter value, so lists of years or holidays can be compared
+    if isinstance(Value, (list, tuple, np.ndarray, pd.Index)):
+        return tuple(_Freeze(Item) for Item in Value)
+    return Value
+
+
+def Stage_Assembly(Profile, Parameters, Engine):
+    Annual_Profile = Engine.Annual_Profiles(
+        Parameters["Version"], Parameters["Building_Type"]
+    )[
+        Annual_Synthesis.Annual_Profile_Name(
+            Parameters["Building_Type"],
+            Parameters["NumberBedrooms_Dwelling"],
+            Parameters["Variant"],
+        )
+    ]
+    Day_Codes = Annual_Synthesis.Synthesize_Day_Codes(
+        Annual_Profile, Parameters["Years"], Parameters["Holidays"]
+    )
+    return Annual_Synthesis.Gather_Draws(
+        Day_Codes,
+        Engine.Daily_Profiles(
+            Parameters["Version"],
+            Parameters["Building_Type"],
+            Parameters["Reduce_Clothes"],
+        ),
+        Reduce_Clothes=False,
+    )  # The daily profiles are already corrected
+
+
+def Stage_Fixture_Filter(Profile, Parameters, Engine):
+    Included = [
+        Fixture for Flag, Fixture in Fixtures.items() if Parameters[Flag] == "Yes"
+    ]
+    if len(Included) == len(Fixtures):
+        return Profile
+    return Profile[Profile["Fixture"].isin(Included)].reset_index(drop=True)
+
+
+def Stage_Hot_Fraction(Profile, Parameters, Engine):
+    Profile = Annual_Synthesis.Add_Mains_Temperature(
+        Profile, _Dates(Parameters), Parameters["ClimateZone"]
+    )
+    Profile = Calculate_Fraction_HotWater(
+        Parameters["Temperature_Supply_Hot_AtFixture"],
+        Parameters["Temperature_Bath"],
+        Parameters["Temperature_Shower"],
+        Profile,
+    )
+    return Calculate_FlowWater_Hot(Profile)
+
+
+def Stage_Clotheswasher(Profile, Parameters, Engine):
+    # Increases the duration of clotheswasher draws to match CBECC calculations, as in T24_Draw_Profile_Generator.py
+    Profile = Profile.copy()
+    Multiplier = np.where(
+        Profile["Fixture"] == "CWSH", Parameters["Multiplier_Clotheswasher"], 1
+    )
+    Profile["Duration (min)"] = Profile["Duration (min)"] * Multiplier
+    Profile["Hot Water Volume (gal)"] = Profile["Hot Water Volume (gal)"] * Multiplier
+    return Profile
+
+
+def Stage_SDLM(Profile, Parameters, Engine):
+    if Parameters["SDLM"] != "Yes":
+        return Profile
+    return Modify_Profile_SDLM(
+        Profile.copy(),
+        Parameters["SquareFootage_Dwelling"],
+        Parameters["Water"],
+        Parameters["Distribution_System_Type"],
+    )
+
+
+def Stage_Output(Profile, Parameters, Engine):
+    # Returns the annual and peak volume (gal) of the hot water, or of the mixed water if Water = 'Mixed'
+    Flow_Column = (
+        "Hot Water Flow Rate (gpm)"
+        if Parameters["Water"] == "Hot"
+        else "Flow Rate (gpm)"
+    )
+    Number_Bins = int(len(_Dates(Parameters)) * 24 * 3600 / Parameters["Timestep"])
+    Volume = Bin_Draws(
+        Profile["Start Time of Year (hr)"],
+        Profile["Duration (min)"],
+        Profile[Flow_Column],
+        Parameters["Timestep"],
+        Number_Bins + int(24 * 3600 / Parameters["Timestep"]),
+    )  # One extra day of bins for draws continuing past midnight of the last day
+    return {
+        "Annual Volume (gal)": float(
+            (Profile["Duration (min)"] * Profile[Flow_Column]).sum()
+        ),
+        "Peak Volume (gal)": float(Volume.max()) if len(Volume) > 0 else 0.0,
+    }
+
+
+# The stages in order, with the parameters each depends on
+Stages = [
+    (
+        "Assembly",
+        [
+            "Building_Type",
+            "NumberBedrooms_Dwelling",
+            "Variant",
+            "Version",
+            "Years",
+            "Holidays",
+            "Reduce_Clothes",
+        ],
+        Stage_Assembly,
+    ),
+    ("Fixture_Filter", list(Fixtures), Stage_Fixture_Filter),
+    (
+        "Hot_Fraction",
+        [
+            "ClimateZone",
+            "Temperature_Supply_Hot_AtFixture",
+            "Temperature_Bath",
+            "Temperature_Shower",
+        ],
+        Stage_Hot_Fraction,
+    ),
+    ("Clotheswasher", ["Multiplier_Clotheswasher"], Stage_Clotheswasher),
+    (
+        "SDLM",
+        ["SDLM", "SquareFootage_Dwelling", "Distribution_System_Type", "Water"],
+        Stage_SDLM,
+    ),
+    ("Output", ["Timestep", "Water"], Stage_Output),
+]
+
+
+class Scenario_Engine:
+    """
+    Calculates the annual and peak volume of a set of profiles and recomputes
+    only the stages affected by parameter changes. Profiles is a dictionary of
+    {name: dictionary of parameters}, and the keyword arguments are the
+    parameters shared by all profiles (see Default_Parameters). Stage outputs
+    are never modified in place, so they can be reused by later updates.
+    """
+
+    def __init__(self, Profiles, **Parameters):
+        Unknown = set(Parameters).union(*Profiles.values()) - set(Default_Parameters)
+        if len(Unknown) > 0:
+            raise ValueError(
+                "Unknown parameters: {}".format(", ".join(sorted(Unknown)))
+            )
+
+        self.Parameters = dict(Default_Parameters, **Parameters)
+        self.Profiles = {Name: dict(Overrides) for Name, Overrides in Profiles.items()}
+        self.Cache = {
+            Name: {} for Name in self.Profiles
+        }  # {profile: {stage: (key, output)}}
+        self.Recomputed = (
+            {}
+        )  # The number of times each stage was calculated, for reporting
+        self._Annual_Profiles = {}
+
+    def Daily_Profiles(self, Version, Building_Type, Reduce_Clothes=True):
+        # The daily profiles are read and corrected once for all profiles and updates. Multiplier_Clotheswasher is applied by Stage_Clotheswasher, so changing it doesn't rebuild them
+        return Daily_Profile_Catalog.Read_Clean_Daily_Profiles(
+            Version, Building_Type, Reduce_Clothes
+        )[0]
+
+    def Annual_Profiles(self, Version, Building_Type):
+        if (Version, Building_Type) not in self._Annual_Profiles:
+            self._Annual_Profiles[(Version, Building_Type)] = (
+                Annual_Synthesis.Read_Annual_Profiles(Version, Building_Type)
+            )
+        return self._Annual_Profiles[(Version, Building_Type)]
+
+    def Profile_Parameters(self, Name):
+        # The shared parameters, overridden by those of the profile
+        return dict(self.Parameters, **self.Profiles[Name])
+
+    def Calculate(self, Name):
+        """
+        Returns the output of one profile and the first stage that was
+        recomputed (None if every stage was reused).
+        """
+
+        Parameters = self.Profile_Parameters(Name)
+        Cache = self.Cache[Name]
+        Output = None
+        First_Recomputed = None
+        for Stage, Depends_On, Function in Stages:
+            Key = tuple(_Freeze(Parameters[Parameter]) for Parameter in Depends_On)
+            if First_Recomputed is None and Stage in Cache and Cache[Stage][0] == Key:
+                Output = Cache[Stage][1]  # Neither this stage nor any before it changed
+                continue
+            if First_Recomputed is None:
+                First_Recomputed = Stage
+            Output = Function(Output, Parameters, self)
+            Cache[Stage] = (Key, Output)
+            self.Recomputed[Stage] = self.Recomputed.get(Stage, 0) + 1
+
+        return Output, First_Recomputed
+
+    def Profile(self, Name):
+        # Returns the event-based draw profile of one profile after SDLM, calculating it if needed
+        self.Calculate(Name)
+        return self.Cache[Name]["SDLM"][1]
+
+    def Run(self):
+        """
+        Returns a data frame of the annual and peak volume of every profile,
+        with the first stage recomputed for each.
+        """
+
+        Results = {}
+        for Name in self.Profiles:
+            Output, First_Recomputed = self.Calculate(Name)
+            Results[Name] = dict(Output, **{"Recomputed From": First_Recomputed})
+        return pd.DataFrame.from_dict(Results, orient="index")
+
+    def Update(self, Profiles=None, **Changes):
+        """
+        Changes the shared parameters (keyword arguments) and/or the
+        parameters of individual profiles (Profiles = {name: dictionary of
+        parameters}), then recomputes the affected stages. Returns a data frame
+        of the annual and peak volume of every profile before and after the
+        change, the difference, and the first stage recomputed.
+        """
+
+        Unknown = set(Changes).union(*(Profiles or {}).values()) - set(
+            Default_Parameters
+        )
+        if len(Unknown) > 0:
+            raise ValueError(
+                "Unknown parameters: {}".format(", ".join(sorted(Unknown)))
+            )
+
+        Before = self.Run().drop(columns="Recomputed From")
+        self.Parameters.update(Changes)
+        for Name, Overrides in (Profiles or {}).items():
+            self.Profiles[Name].update(Overrides)
+        After = self.Run()
+
+        Delta = pd.DataFrame(index=After.index)
+        for Column in ["Annual Volume (gal)", "Peak Volume (gal)"]:
+            Delta[Column + " Before"] = Before[Column]
+            Delta[Column + " After"] = After[Column]
+            Delta[Column + " Delta"] = After[Column] - Before[Column]
+        Delta["Recomputed From"] = After["Recomputed From"]
+        return Delta
@@ -12,7 +12,6 @@ See documentation in that script for more comprehensive information.
 
 import pandas as pd
 import os
-import time
 import ast
 from T24_Draw_Profile_Generator import (
     Calculate_Fraction_HotWater,
@@ -20,6 +19,7 @@ from T24_Draw_Profile_Generator import (
     Modify_Profile_SDLM,
 )
 from Event_To_Timestep_Converter import Convert_Profile_SingleDay
+import Instrumentation
 
 
 try:
@@ -31,7 +31,7 @@ except:
 
 Version = 2019
 ClimateZone = 12
-Number_Occupants = 1
+Number_Occupants = 1  # Selects day codes by occupancy level with Occupant_Synthesis.Generate_Dwellings. The day codes in Create_Hot_Profiles are chosen directly
 Building_Type = "Single"
 Include_Faucet = "Yes"
 Include_Shower = "Yes"
@@ -102,6 +102,21 @@ def Calculate_TMains(ClimateZone):
 # %%--------------------DEFINE FUNCTIONS-----------------------------------
 
 
+@Instrumentation.Timed("Load")
+def Read_Daily_Profiles(Version, Building_Type="Single"):
+    # Reads the .csv file containing information about the daily profiles used in CBECC-Res. 2016 has separate single and multi-family data sets
+    if Version == 2016:
+        File = (
+            "DailyProfilesSF.csv"
+            if Building_Type == "Single"
+            else "DailyProfilesMF.csv"
+        )
+    else:
+        File = "DailyProfiles.csv"
+    return pd.read_csv(os.path.join(root, "SourceData", str(Version), File))
+
+
+@Instrumentation.Timed("Assemble")
 def Create_Hot_Profiles(
     Building_Type,
     Profile_Type,
@@ -119,45 +134,40 @@ def Create_Hot_Profiles(
     SquareFootage_Dwelling,
     Water,
     Distribution_System_Type,
+    Daily_Profiles=None,
+    Output="Dict",
+    Temperature_Supply_Hot_AtFixture=Temperature_Supply_Hot_AtFixture,
 ):
-    Folder = (
-        os.path.dirname(__file__) + os.sep
-    )  # The path to the folder where you have the base files for this script stored
-    if Version == 2016:
-        if Building_Type == "Single":
-            Daily_Profiles = pd.read_csv(
-                Folder
-                + os.sep
-                + "SourceData"
-                + os.sep
-                + str(Version)
-                + os.sep
-                + "DailyProfilesSF.csv"
-            )  # Reads the .csv file containing information about the daily profiles used in CBECC-Res
-        elif Building_Type == "Multi":
-            Daily_Profiles = pd.read_csv(
-                Folder
-                + os.sep
-                + "SourceData"
-                + os.sep
-                + str(Version)
-                + os.sep
-                + "DailyProfilesMF.csv"
-            )  # Reads the .csv file containing information about the daily profiles used in CBECC-Res
-    elif Version == 2019:
-        Daily_Profiles = pd.read_csv(
-            Folder
-            + os.sep
-            + "SourceData"
-            + os.sep
-            + str(Version)
-            + os.sep
-            + "DailyProfiles.csv"
-        )  # Reads the .csv file containing information about the daily profiles used in CBECC-Res
-
-    Draw_Profiles = {}
-
-    temp = Daily_Profiles[Daily_Profiles["Day"] == Profile_Type].reset_index(drop=True)
+    """
+    Creates the draw profiles of one or many day codes. Profile_Type is a
+    single day code or a list of them. The rows of all requested codes are
+    gathered at once, and the hot water fraction and SDLM are calculated once
+    over all of them, so generating every code in the data set is a single
+    call. Daily_Profiles is the CBECC-Res daily profile table, read from
+    SourceData if not provided (pass it when calling repeatedly).
+
+    Output = 'Dict' returns {day code: draw profile}, 'Table' returns one
+    long data frame of all draws with the day code in the 'Day' column.
+    Temperature_Supply_Hot_AtFixture defaults to the constant above.
+    """
+
+    if Daily_Profiles is None:
+        Daily_Profiles = Read_Daily_Profiles(Version, Building_Type)
+    Codes = (
+        [Profile_Type]
+        if isinstance(Profile_Type, str)
+        else list(pd.unique(pd.Series(Profile_Type)))
+    )
+
+    temp = Daily_Profiles[Daily_Profiles["Day"].isin(Codes)].reset_index(drop=True)
+    Missing = set(Codes) - set(temp["Day"])
+    if len(Missing) > 0:
+        raise ValueError(
+            "Day codes {} are not in the {} daily profiles".format(
+                sorted(Missing), Version
+            )
+        )
+
     temp["Mains Temperature (deg F)"] = T_Mains[Day_Of_Year]
     temp["Start Time of Year (hr)"] = temp["Start time (hr)"] + (24 * Day_Of_Year)
     temp = Calculate_Fraction_HotWater(
@@ -167,17 +177,23 @@ def Create_Hot_Profiles(
     temp = Modify_Profile_SDLM(
         temp, SquareFootage_Dwelling, Water, Distribution_System_Type
     )
-    Draw_Profiles[Profile_Type] = temp
 
-    return Draw_Profiles
+    if Output == "Table":
+        return temp
+
+    Draw_Profiles = {
+        Code: Profile.reset_index(drop=True)
+        for Code, Profile in temp.groupby("Day", sort=False)
+    }  # Each draw profile keeps the row order of the daily profile table
+
+    return {Code: Draw_Profiles[Code] for Code in Codes}
 
 
 # %%----------------------------------EXECUTE CODE FOR TESTING-----------------------------
 
 if __name__ == "__main__":
-    start_time = time.time()
-
     T_Mains = Calculate_TMains(ClimateZone)
+    Daily_Profiles = Read_Daily_Profiles(Version, Building_Type)
     Binned_Profiles = pd.read_csv(
         os.path.join(os.getcwd(), "..", "hpwhs", "Profiles_Binned_ByAvgElecPerDay.csv"),
         index_col=0,
@@ -202,6 +218,7 @@ if __name__ == "__main__":
             SquareFootage_Dwelling,
             Water,
             Distribution_System_Type,
+            Daily_Profiles=Daily_Profiles,
         )
         TimestepBased = {}
 
@@ -210,4 +227,4 @@ if __name__ == "__main__":
                 Profiles[key], Day_Of_Year, 15, ClimateZone
             )
 
-    print(time.time() - start_time)
+    Instrumentation.Print_Summary()
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 26 08:52:31 2026
+
+This script precomputes single-day hot water draw profiles for every day code,
+day of year and climate zone, and stores them in memory-mapped arrays.
+Controller studies previously called Create_Hot_Profiles and
+Convert_Profile_SingleDay for each profile they needed. With the lookup table
+any (day code, day of year, climate zone) profile is an index lookup.
+
+The only climate dependent part of a hot water profile is the fraction of hot
+water in showers and baths, which depends on the mains water temperature of the
+day and climate zone. Faucet, clothes washer and dish washer draws use fixed
+fractions. So each day code is stored as three binned mixed water profiles
+(fixed fraction fixtures already multiplied by their hot water fraction,
+showers and baths), and the hot water profile of any day and climate zone is
+    Fixed + Fraction_Shower(day, CZ) * Shower + Fraction_Bath(day, CZ) * Bath
+which is exactly the profile calculated from the individual draws. Storing the
+full (code x day x CZ x timestep) array instead would take 171 x 365 x 16 x
+5761 doubles, about 46 GB, for the 2019 day codes alone.
+
+The table is stored in a folder containing:
+    -Index.json - The day codes, fixtures, timestep and the parameters used to
+        build the table
+    -Daily_Volume.npy - Hot water volume (gal) of each (code, day, CZ)
+    -Fixture_Volume.npy - Hot water volume (gal) of each (code, day, CZ, fixture)
+    -Binned_Components.npy - The three binned profiles (gal per timestep) of
+        each day code
+    -Component_Fractions.npy - The hot water fraction of each component on each
+        (CZ, day)
+
+Days of the year start at 1 (Jan 1 is day 1), as in Convert_Profile_SingleDay.
+Profiles use the SDLM of one dwelling (SquareFootage_Dwelling and
+Distribution_System_Type), so build one table per dwelling size of interest.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import numpy as np
+import os
+import json
+import datetime as dt
+
+import Weather_Data
+import Hot_Water_Calculations
+import Conversions
+from T24_Draw_Profile_Generator import Modify_Profile_SDLM
+from Event_To_Timestep_Converter import Bin_Draws
+from SingleDay_DrawProfile_Generator import Read_Daily_Profiles
+
+try:
+    root = os.path.dirname(os.path.abspath(__file__))
+except:
+    root = os.getcwd()
+
+# %%--------------------CONSTANTS------------------------
+
+Fixtures = ["FAUC", "SHWR", "CWSH", "DWSH", "BATH"]
+Components = ["Fixed", "Shower", "Bath"]  # The binned profiles stored for each day code
+Days_Of_Year = list(range(1, 366))
+Year = 2022  # The year of the timestamps returned by Lookup_Profile, as in Convert_Profile_SingleDay
+
+# Hot water temperature constants are taken from pg B-3 of the 2016 CBECC ACM reference manual
+Temperature_Shower = 105  # deg F
+Temperature_Bath = 105  # deg F
+Temperature_Supply_Hot_AtFixture = 115  # deg F. CSE assumes 115 deg F hot water at the fixture, per 1/28/2020 email with Aaron Boranian
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Build_Lookup_Table(
+    Folder,
+    Version=2019,
+    Building_Type="Single",
+    SquareFootage_Dwelling=1897,
+    Distribution_System_Type="Trunk and Branch",
+    Timestep=15,
+    Temperature_Supply_Hot_AtFixture=Temperature_Supply_Hot_AtFixture,
+    Temperature_Bath=Temperature_Bath,
+    Temperature_Shower=Temperature_Shower,
+):
+    """
+    Builds the lookup table for every day code in the Version data set, every
+    day of the year and every climate zone, and saves it to Folder. Timestep
+    is in seconds. Returns the opened table.
+    """
+
+    os.makedirs(Folder, exist_ok=True)
+
+    Daily_Profiles = Read_Daily_Profiles(Version, Building_Type)
+    Daily_Profiles = Modify_Profile_SDLM(
+        Daily_Profiles, SquareFootage_Dwelling, "Mixed", Distribution_System_Type
+    )  # Extends the duration of every draw except clothes washers and dish washers
+    Codes = list(pd.unique(Daily_Profiles["Day"]))
+    Code_Number = pd.Categorical(Daily_Profiles["Day"], categories=Codes).codes.astype(
+        int
+    )
+    Fixture_Number = pd.Categorical(
+        Daily_Profiles["Fixture"], categories=Fixtures
+    ).codes.astype(int)
+
+    # Mixed water volume of each draw, and the hot water fraction of the fixed fraction fixtures
+    Flow_Rate = Daily_Profiles["Flow Rate (gpm)"].to_numpy()
+    Duration = Daily_Profiles["Duration (min)"].to_numpy()
+    Fixture = Daily_Profiles["Fixture"].to_numpy()
+    Fraction_Fixed = np.zeros(len(Fixture))
+    for Name, Fraction in Hot_Water_Calculations.Fraction_HotWater_Fixed.items():
+        Fraction_Fixed += (Fixture == Name) * Fraction
+
+    # Bin all day codes at once, placing each code in its own block of timesteps
+    Start_Time = Daily_Profiles["Start time (hr)"].to_numpy()
+    Timestep_Hours = Timestep / (
+        Conversions.seconds_in_minute * Conversions.minutes_in_hour
+    )
+    Number_Bins = max(
+        int(24 / Timestep_Hours) + 1,
+        int(
+            np.floor(
+                (Start_Time + Duration / Conversions.minutes_in_hour).max()
+                / Timestep_Hours
+            )
+        )
+        + 1,
+    )  # A full day plus midnight, as in Convert_Profile_SingleDay, or longer if draws continue past it
+    Block_Start = Code_Number * Number_Bins * Timestep_Hours
+    Binned_Components = np.stack(
+        [
+            Bin_Draws(
+                Block_Start + Start_Time,
+                Duration,
+                Flow_Rate * Weight,
+                Timestep,
+                len(Codes) * Number_Bins,
+            ).reshape(len(Codes), Number_Bins)
+            for Weight in [Fraction_Fixed, Fixture == "SHWR", Fixture == "BATH"]
+        ],
+        axis=1,
+    )  # (codes x components x timesteps)
+
+    # Hot water fraction of each component and fixture on each day in each climate zone
+    T_Mains = Weather_Data.Read_TMains_AllZones()  # (CZ x day)
+    Fraction_Shower = (Temperature_Shower - T_Mains) / (
+        Temperature_Supply_Hot_AtFixture - T_Mains
+    )
+    Fraction_Bath = (Temperature_Bath - T_Mains) / (
+        Temperature_Supply_Hot_AtFixture - T_Mains
+    )
+    Component_Fractions = np.stack(
+        [np.ones_like(T_Mains), Fraction_Shower, Fraction_Bath], axis=2
+    )  # (CZ x day x components)
+    Fixture_Fractions = Hot_Water_Calculations.Calculate_Fraction_HotWater_Array(
+        np.array(Fixtures),
+        T_Mains[:, :, np.newaxis],
+        Temperature_Supply_Hot_AtFixture,
+        Temperature_Bath,
+        Temperature_Shower,
+    )  # (CZ x day x fixtures)
+
+    Mixed_Volume = np.zeros((len(Codes), len(Fixtures)))
+    np.add.at(Mixed_Volume, (Code_Number, Fixture_Number), Flow_Rate * Duration)
+    Fixture_Volume = (
+        Mixed_Volume[:, np.newaxis, np.newaxis, :]
+        * Fixture_Fractions.transpose(1, 0, 2)[np.newaxis, :, :, :]
+    )  # (codes x day x CZ x fixtures)
+
+    np.save(os.path.join(Folder, "Binned_Components.npy"), Binned_Components)
+    np.save(os.path.join(Folder, "Component_Fractions.npy"), Component_Fractions)
+    np.save(os.path.join(Folder, "Fixture_Volume.npy"), Fixture_Volume)
+    np.save(os.path.join(Folder, "Daily_Volume.npy"), Fixture_Volume.sum(axis=3))
+    with open(os.path.join(Folder, "Index.json"), "w") as Index_File:
+        json.dump(
+            {
+                "Codes": Codes,
+                "Fixtures": Fixtures,
+                "Components": Components,
+                "Climate_Zones": Weather_Data.Climate_Zones,
+                "Timestep": Timestep,
+                "Number_Bins": Number_Bins,
+                "Parameters": {
+                    "Version": Version,
+                    "Building_Type": Building_Type,
+                    "SquareFootage_Dwelling": SquareFootage_Dwelling,
+                    "Distribution_System_Type": Distribution_System_Type,
+                    "Temperature_Supply_Hot_AtFixture": Temperature_Supply_Hot_AtFixture,
+                    "Temperature_Bath": Temperature_Bath,
+                    "Temperature_Shower": Temperature_Shower,
+                },
+            },
+            Index_File,
+            indent=4,
+        )
+
+    return Open_Lookup_Table(Folder)
+
+
+def Open_Lookup_Table(Folder):
+    """
+    Opens a lookup table saved by Build_Lookup_Table. The arrays are memory
+    mapped, so only the parts that are looked up are read from disk.
+    """
+
+    with open(os.path.join(Folder, "Index.json")) as Index_File:
+        Table = json.load(Index_File)
+    Table["Code_Index"] = {Code: Number for Number, Code in enumerate(Table["Codes"])}
+    for Name in [
+        "Binned_Components",
+        "Component_Fractions",
+        "Fixture_Volume",
+        "Daily_Volume",
+    ]:
+        Table[Name] = np.load(os.path.join(Folder, Name + ".npy"), mmap_mode="r")
+
+    return Table
+
+
+def Lookup_Daily_Volume(Table, Code, Day_Of_Year, ClimateZone):
+    # Returns the hot water volume (gal) of a day code on a day of the year in a climate zone
+    return float(
+        Table["Daily_Volume"][
+            Table["Code_Index"][Code], Day_Of_Year - 1, ClimateZone - 1
+        ]
+    )
+
+
+def Lookup_Fixture_Volumes(Table, Code, Day_Of_Year, ClimateZone):
+    # Returns a series of the hot water volume (gal) of each fixture
+    return pd.Series(
+        Table["Fixture_Volume"][
+            Table["Code_Index"][Code], Day_Of_Year - 1, ClimateZone - 1
+        ],
+        index=Table["Fixtures"],
+    )
+
+
+def Lookup_Profile(Table, Code, Day_Of_Year, ClimateZone, SI=False):
+    """
+    Returns the timestep-based hot water profile of a day code on a day of the
+    year in a climate zone, indexed by timestamp. The volume is in gallons, or
+    liters if SI = True.
+    """
+
+    Volume = (
+        Table["Component_Fractions"][ClimateZone - 1, Day_Of_Year - 1]
+        @ Table["Binned_Components"][Table["Code_Index"][Code]]
+    )
+    Start = dt.datetime(Year, 1, 1) + dt.timedelta(days=Day_Of_Year - 1)
+    Index = pd.date_range(
+        Start, periods=Table["Number_Bins"], freq="{}s".format(Table["Timestep"])
+    )
+
+    if SI == True:
+        return pd.Series(
+            Volume * Conversions.L_in_gal, index=Index, name="Hot Water Draw Volume (L)"
+        )
+    return pd.Series(Volume, index=Index, name="Hot Water Draw Volume (gal)")
+
+
+# %%----------------------------------BUILD THE TABLES-----------------------------
+
+if __name__ == "__main__":
+    for Version, Building_Type in [(2019, "Single"), (2016, "Single"), (2016, "Multi")]:
+        Folder = os.path.join(
+            root,
+            "LookupTables",
+            "Ver={}_Bldg={}_CFA=1897".format(Version, Building_Type),
+        )
+        Table = Build_Lookup_Table(Folder, Version, Building_Type)
+        print("Finished: {} ({} day codes)".format(Folder, len(Table["Codes"])))
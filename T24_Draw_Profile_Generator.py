@@ -55,6 +55,12 @@ The script uses a number of different functions to accomplish its flexible
     -Calculate_FlowWater_Hot - Another support function. This one calculates 
         the hot water flow rate and volume using the provided profile and hot 
         water fraction
+    -Create_Dwelling_Profile - Creates the profile of one dwelling by calling
+        the functions above, then applying SDLM. The clotheswasher corrections
+        and multiplier are applied once to the daily profiles (See
+        Daily_Profile_Catalog.py). If Use_Cache = 'Yes' the profile is looked up in the result
+        cache first (see Result_Cache.py), using the key from
+        Dwelling_Cache_Key
     -Combine_Profiles - This is a very long and complex function. Reading the 
         comments and documentation included in the function itself is strongly 
         recommended. It combines profiles from multiple dwellings into a single
@@ -67,6 +73,9 @@ The script uses a number of different functions to accomplish its flexible
         from the profile as desired, and as specified by the user. For 
         instance, a user could desire a draw profile that only includes 
         showers. Or both showers and dishwashers. Or all of the fixtures.
+        Create_Hot_Profile_NoSDLM and Create_Mixed_Profile_NoSDLM don't use
+        it, they remove the excluded fixtures from the daily profiles before
+        building the annual profile (See Fixture_Filter.py)
     -Determine_Next_Change - This supports the Combine_Profiles function. It is
         called when overlapping draws are identified, and looks to identify the
         next change. It could identify that the next change in the draw profile
@@ -105,13 +114,18 @@ Known issues with this script:
 import pandas as pd
 import sys
 import os
-import time
 
-# %%------------------------------TIMER--------------------------------------
-start_time = (
-    time.time()
-)  # mark the beginning of the execution time for reference back to later
-end_laggard_hot, start_laggard_hot, end_laggard_mixed, start_laggard_mixed = 0, 0, 0, 0
+import Profile_Catalog
+import Fast_CSV_Writer
+import Climate_Independent_Profiles
+import Columnar_Output
+import Result_Cache
+import Weather_Data
+import Instrumentation
+import Progress
+import Fixture_Filter
+import Daily_Profile_Catalog
+
 # %%------------------------------INPUTS--------------------------------------
 
 # Describe the building. All lists describing the building need to be the same length for this script to work correctly
@@ -133,11 +147,16 @@ Multiplier_Clotheswasher = 2.03  # Adds a multiplier to increase the volume of c
 # Describe the final profile format
 Combined = "No"  # Either 'Yes' or 'No'. If 'No', will print one file for each dwelling in the lists. If 'Yes', will combine the profiles for all dwellings into a single file
 Combined_LargeBuilding = "No"  # Either 'Yes' or 'No'. The script for combining profiles can be slow, take a long time to run. This function provides a less precise, faster version
+CSV_Precision = None  # Number of decimal places written to the .csv outputs. None writes full precision, identical to DataFrame.to_csv. A number (E.g. 6) writes faster and smaller files
+Output_Format = "CSV"  # Either 'CSV' or 'Parquet'. 'Parquet' writes the profiles to a partitioned dataset in Folder_Output\Parquet, which TimestepBased_Compiler.py and notebooks can read by column and partition. Requires the pyarrow package. See Columnar_Output.py
+Climate_Independent = "No"  # Either 'Yes' or 'No'. If 'Yes', individual hot water profiles are saved once for all climate zones, and the climate dependent columns are calculated when read. See Climate_Independent_Profiles.py
 Include_Faucet = "Yes"  # Either 'Yes' or 'No'. If 'Yes', entries to these fixtures will be included in the final draw profile. If 'No', they will be removed from the data set
 Include_Shower = "Yes"  # Either 'Yes' or 'No'. If 'Yes', entries to these fixtures will be included in the final draw profile. If 'No', they will be removed from the data set
 Include_Clothes = "Yes"  # Either 'Yes' or 'No'. If 'Yes', entries to these fixtures will be included in the final draw profile. If 'No', they will be removed from the data set
 Include_Dish = "Yes"  # Either 'Yes' or 'No'. If 'Yes', entries to these fixtures will be included in the final draw profile. If 'No', they will be removed from the data set
 Include_Bath = "Yes"  # Either 'Yes' or 'No'. If 'Yes', entries to these fixtures will be included in the final draw profile. If 'No', they will be removed from the data set
+Use_Cache = "No"  # Either 'Yes' or 'No'. If 'Yes', dwelling profiles are stored in Folder_Cache and reused by later runs with the same inputs instead of being recreated. See Result_Cache.py
+Cache_Size = 5 * 1024**3  # Bytes. The least recently used profiles are deleted from the cache once it is larger than this
 
 # Folder paths
 Folder = (
@@ -149,6 +168,9 @@ Folder_Output = (
 Folder_WeatherData = (
     Folder + os.sep + "WeatherFiles"
 )  # This states the folder that CBECC weather data files are stored in
+Folder_Cache = (
+    Folder_Output + os.sep + "Cache"
+)  # The folder holding the result cache. Can be shared by several processes
 
 # %%-----------------CONSTANTS---------------------------
 
@@ -161,33 +183,34 @@ Temperature_Supply_Hot_AtFixture = 115  # deg F. CSE assumes 115 deg F hot water
 
 # %%-----------------LOAD WEATHER DATA---------------------------
 # gather the climate zone's weaher data and create T_Mains - which only includes one temperature for each day of the year (is 365 long)
-start_text = (
-    "CTZ0" if len(str(ClimateZone)) == 1 else "CTZ"
-)  # Identifying the correct file is done differently if the climate zone number is less than 10
-File_WeatherData = (
-    os.sep + start_text + str(ClimateZone) + "S13b.CSW"
-)  # Create a string stating the location of the weather file. Note the 0 following CTZ in climate zones < 10
-Path_WeatherData = (
-    Folder_WeatherData + File_WeatherData
-)  # Combine Folder and File to create a path stating the location of the weather data
-
-WeatherData = pd.read_csv(
-    Path_WeatherData, header=26
-)  # Read the weather data, ignoring the first 26 lines of header
-WeatherData = pd.read_csv(
-    Path_WeatherData, header=26, usecols=["Hour", "T Ground", "31-day Avg lag DB"]
-)  # Read the weather data, ignoring the first 25 lines of header
-
-First_Hour = WeatherData[
-    WeatherData["Hour"] == 1
-]  # Creates a data frame containing only data from the first hour of each day in the weather file
-First_Hour = First_Hour.set_index(
-    [pd.Index(range(365))]  # type: ignore
-)  # Sets the index of First_Hour to be the number of days in the year/number of entries in First_Hour
-
-T_Mains = (
-    0.65 * First_Hour["T Ground"] + 0.35 * First_Hour["31-day Avg lag DB"]
-)  # Equation 10, ACM, Appendix B. Returns the mains water temperature as a function of the ground temper
+with Instrumentation.Stage("Load"):
+    start_text = (
+        "CTZ0" if len(str(ClimateZone)) == 1 else "CTZ"
+    )  # Identifying the correct file is done differently if the climate zone number is less than 10
+    File_WeatherData = (
+        os.sep + start_text + str(ClimateZone) + "S13b.CSW"
+    )  # Create a string stating the location of the weather file. Note the 0 following CTZ in climate zones < 10
+    Path_WeatherData = (
+        Folder_WeatherData + File_WeatherData
+    )  # Combine Folder and File to create a path stating the location of the weather data
+
+    WeatherData = pd.read_csv(
+        Path_WeatherData, header=26
+    )  # Read the weather data, ignoring the first 26 lines of header
+    WeatherData = pd.read_csv(
+        Path_WeatherData, header=26, usecols=["Hour", "T Ground", "31-day Avg lag DB"]
+    )  # Read the weather data, ignoring the first 25 lines of header
+
+    First_Hour = WeatherData[
+        WeatherData["Hour"] == 1
+    ]  # Creates a data frame containing only data from the first hour of each day in the weather file
+    First_Hour = First_Hour.set_index(
+        [pd.Index(range(365))]  # type: ignore
+    )  # Sets the index of First_Hour to be the number of days in the year/number of entries in First_Hour
+
+    T_Mains = (
+        0.65 * First_Hour["T Ground"] + 0.35 * First_Hour["31-day Avg lag DB"]
+    )  # Equation 10, ACM, Appendix B. Returns the mains water temperature as a function of the ground temper
 
 # %%-----------------------------ERROR CHECKING-------------------------------
 
@@ -207,6 +230,24 @@ if (
     )  # Return an error
     sys.exit()  # And exit the program
 
+if Climate_Independent == "Yes" and (
+    Water != "Hot" or Combined == "Yes" or Combined_LargeBuilding == "Yes"
+):
+    print(
+        "Climate_Independent only applies to individual hot water profiles. Mixed water profiles don't depend on the climate zone"
+    )  # Return an error
+    sys.exit()  # And exit the program
+
+if Output_Format != "CSV" and Output_Format != "Parquet":
+    print("Output_Format must be either 'CSV' or 'Parquet'")  # Return an error
+    sys.exit()  # And exit the program
+
+if Climate_Independent == "Yes" and Output_Format != "CSV":
+    print(
+        "Climate_Independent profiles are stored as .csv files. Set Output_Format to 'CSV'"
+    )  # Return an error
+    sys.exit()  # And exit the program
+
 if SDLM != "Yes" and SDLM != "No":
     print("SDLM must be either 'Yes' or 'No'")  # Return an error
     sys.exit()  # And exit the program
@@ -241,6 +282,7 @@ if (
 
 
 # This function creates the mixed hot water draw profile for a single dwelling
+@Instrumentation.Timed("Assemble")
 def Create_Mixed_Profile_NoSDLM(
     Building_Type,
     NumberBedrooms_Dwelling,
@@ -252,38 +294,28 @@ def Create_Mixed_Profile_NoSDLM(
     Include_Bath,
     Version,
     Reduce_Clothes=True,
+    T_Mains=None,
+    Multiplier_Clotheswasher=1,
 ):  # It needs the type of building, number of bedrooms in the dwelling, and current variant of the building as inputs
-    if Version == 2016:
-        if Building_Type == "Single":
-            Daily_Profiles = pd.read_csv(
-                Folder
-                + os.sep
-                + "SourceData"
-                + os.sep
-                + str(Version)
-                + os.sep
-                + "DailyProfilesSF.csv"
-            )  # Reads the .csv file containing information about the daily profiles used in CBECC-Res
-        elif Building_Type == "Multi":
-            Daily_Profiles = pd.read_csv(
-                Folder
-                + os.sep
-                + "SourceData"
-                + os.sep
-                + str(Version)
-                + os.sep
-                + "DailyProfilesMF.csv"
-            )  # Reads the .csv file containing information about the daily profiles used in CBECC-Res
-    elif Version == 2019:
-        Daily_Profiles = pd.read_csv(
-            Folder
-            + os.sep
-            + "SourceData"
-            + os.sep
-            + str(Version)
-            + os.sep
-            + "DailyProfiles.csv"
-        )  # Reads the .csv file containing information about the daily profiles used in CBECC-Res
+    if T_Mains is None:
+        T_Mains = globals()[
+            "T_Mains"
+        ]  # Use the mains water temperature of the ClimateZone in the INPUTS section unless another is passed (E.g. Weather_Data.Read_TMains(ClimateZone))
+
+    # The daily profiles used in CBECC-Res, read once per process. If Reduce_Clothes == True, CWSH draws outside 1.5 IQR are already replaced with average values, and the duration of CWSH draws already includes Multiplier_Clotheswasher. Corrections holds the bounds used. See Daily_Profile_Catalog.py
+    Daily_Profiles, Corrections = Daily_Profile_Catalog.Read_Clean_Daily_Profiles(
+        Version, Building_Type, Reduce_Clothes, Multiplier_Clotheswasher
+    )
+
+    Mask = Fixture_Filter.Fixture_Mask(
+        Include_Faucet, Include_Shower, Include_Clothes, Include_Dish, Include_Bath
+    )  # The bitmask of the fixtures the user wants to include
+    Included_Code = Fixture_Filter.Included_Code(
+        Mask
+    )  # A string of letters stating the fixtures included in the draw profile. E.g. 'FSCDB'
+    Daily_Profiles = Fixture_Filter.Filter_Daily_Profiles(
+        Daily_Profiles, Mask
+    )  # Remove the excluded fixtures from the daily profiles before building the annual profile, so no draws are assembled only to be removed later
 
     if Building_Type == "Single":  # If simulating a single family building
         Annual_Profiles = pd.read_csv(
@@ -392,57 +424,17 @@ def Create_Mixed_Profile_NoSDLM(
     )  # After appending the index will be messed up. These two lines fix that
     del Dwelling_Profile["index"]
 
-    if (
-        Include_Faucet == "No"
-        or Include_Shower == "No"
-        or Include_Clothes == "No"
-        or Include_Dish == "No"
-        or Include_Bath == "No"
-    ):  # Unless the user said they do not want to filter draws by fixture
-        Dwelling_Profile, Included_Code = Filter_DataSet_ByFixture(
-            Dwelling_Profile,
-            Include_Faucet,
-            Include_Shower,
-            Include_Clothes,
-            Include_Dish,
-            Include_Bath,
-        )  # Call the Filter_DataSet_ByFixture function to limit the resulting profile to only contain draws that match the specified filter
-    else:  # If everything is included
-        Included_Code = [
-            "F",
-            "S",
-            "C",
-            "D",
-            "B",
-        ]  # Use Included_Code to show that all are included, don't filter data set
-
     Dwelling_Profile = Dwelling_Profile.sort_values(
         ["Start Time of Year (hr)"]
     )  # Sorts the draws in chronological order
 
-    if Reduce_Clothes == True:
-        temp = Dwelling_Profile.loc[Dwelling_Profile["Fixture"] == "CWSH"]
-        ix = temp.loc[
-            temp["Flow Rate (gpm)"] > 2.9615
-        ].index  # 2.9615 is the upper bound defined by 1.5 IQR. See Draw Analysis in Source Data for details
-        for i in ix:
-            Dwelling_Profile.loc[
-                ix, "Flow Rate (gpm)"
-            ] = 1.2543  # Average value of CWSH draws within the 1.5 IQR range. See Draw Analysis in Source Data for details
-        ix = temp.loc[
-            temp["Duration (min)"] > 7.167
-        ].index  # 7.167 is the upper bound defined by 1.5 IQR. See Draw Analysis in Source Data for details
-        for i in ix:
-            Dwelling_Profile.loc[
-                ix, "Duration (min)"
-            ] = 1.9635  # Average value of CWSH draws within the 1.5 IQR range. See Draw Analysis in Source Data for details
-
     return (
         Dwelling_Profile,
         Included_Code,
     )  # Return the Dwelling_Profile data frame and the list of profiles when this function is finished
 
 
+@Instrumentation.Timed("Assemble")
 def Create_Hot_Profile_NoSDLM(
     Building_Type,
     NumberBedrooms_Dwelling,
@@ -455,38 +447,28 @@ def Create_Hot_Profile_NoSDLM(
     Include_Bath,
     Version,
     Reduce_Clothes=True,
+    T_Mains=None,
+    Multiplier_Clotheswasher=1,
 ):  # It needs the type of building, number of bedrooms in the dwelling, and current variant of the building as inputs
-    if Version == 2016:
-        if Building_Type == "Single":
-            Daily_Profiles = pd.read_csv(
-                Folder
-                + os.sep
-                + "SourceData"
-                + os.sep
-                + str(Version)
-                + os.sep
-                + "DailyProfilesSF.csv"
-            )  # Reads the .csv file containing information about the daily profiles used in CBECC-Res
-        elif Building_Type == "Multi":
-            Daily_Profiles = pd.read_csv(
-                Folder
-                + os.sep
-                + "SourceData"
-                + os.sep
-                + str(Version)
-                + os.sep
-                + "DailyProfilesMF.csv"
-            )  # Reads the .csv file containing information about the daily profiles used in CBECC-Res
-    elif Version == 2019:
-        Daily_Profiles = pd.read_csv(
-            Folder
-            + os.sep
-            + "SourceData"
-            + os.sep
-            + str(Version)
-            + os.sep
-            + "DailyProfiles.csv"
-        )  # Reads the .csv file containing information about the daily profiles used in CBECC-Res
+    if T_Mains is None:
+        T_Mains = globals()[
+            "T_Mains"
+        ]  # Use the mains water temperature of the ClimateZone in the INPUTS section unless another is passed (E.g. Weather_Data.Read_TMains(ClimateZone))
+
+    # The daily profiles used in CBECC-Res, read once per process. If Reduce_Clothes == True, CWSH draws outside 1.5 IQR are already replaced with average values, and the duration of CWSH draws already includes Multiplier_Clotheswasher. Corrections holds the bounds used. See Daily_Profile_Catalog.py
+    Daily_Profiles, Corrections = Daily_Profile_Catalog.Read_Clean_Daily_Profiles(
+        Version, Building_Type, Reduce_Clothes, Multiplier_Clotheswasher
+    )
+
+    Mask = Fixture_Filter.Fixture_Mask(
+        Include_Faucet, Include_Shower, Include_Clothes, Include_Dish, Include_Bath
+    )  # The bitmask of the fixtures the user wants to include
+    Included_Code = Fixture_Filter.Included_Code(
+        Mask
+    )  # A string of letters stating the fixtures included in the draw profile. E.g. 'FSCDB'
+    Daily_Profiles = Fixture_Filter.Filter_Daily_Profiles(
+        Daily_Profiles, Mask
+    )  # Remove the excluded fixtures from the daily profiles before building the annual profile, so no draws are assembled only to be removed later
 
     if Building_Type == "Single":  # If simulating a single family building
         Annual_Profiles = pd.read_csv(
@@ -597,51 +579,10 @@ def Create_Hot_Profile_NoSDLM(
     )  # After appending the index will be messed up. These two lines fix that
     del Dwelling_Profile["index"]
 
-    if (
-        Include_Faucet == "No"
-        or Include_Shower == "No"
-        or Include_Clothes == "No"
-        or Include_Dish == "No"
-        or Include_Bath == "No"
-    ):  # Unless the user said they do not want to filter draws by fixture
-        Dwelling_Profile, Included_Code = Filter_DataSet_ByFixture(
-            Dwelling_Profile,
-            Include_Faucet,
-            Include_Shower,
-            Include_Clothes,
-            Include_Dish,
-            Include_Bath,
-        )  # Call the Filter_DataSet_ByFixture function to limit the resulting profile to only contain draws that match the specified filter
-    else:  # If everything is included
-        Included_Code = [
-            "F",
-            "S",
-            "C",
-            "D",
-            "B",
-        ]  # Use Included_Code to show that all are included, don't filter data set
-
     Dwelling_Profile = Dwelling_Profile.sort_values(
         ["Start Time of Year (hr)"]
     )  # Sorts the draws in the in chronological order
 
-    if Reduce_Clothes == True:
-        temp = Dwelling_Profile.loc[Dwelling_Profile["Fixture"] == "CWSH"]
-        ix = temp.loc[
-            temp["Flow Rate (gpm)"] > 2.9615
-        ].index  # 2.9615 is the upper bound defined by 1.5 IQR. See Draw Analysis in Source Data for details
-        for i in ix:
-            Dwelling_Profile.loc[
-                ix, "Flow Rate (gpm)"
-            ] = 1.2543  # Average value of CWSH draws within the 1.5 IQR range. See Draw Analysis in Source Data for details
-        ix = temp.loc[
-            temp["Duration (min)"] > 7.167
-        ].index  # 7.167 is the upper bound defined by 1.5 IQR. See Draw Analysis in Source Data for details
-        for i in ix:
-            Dwelling_Profile.loc[
-                ix, "Duration (min)"
-            ] = 1.9635  # Average value of CWSH draws within the 1.5 IQR range. See Draw Analysis in Source Data for details
-
     Dwelling_Profile = Calculate_Fraction_HotWater(
         Temperature_Supply_Hot_AtFixture,
         Temperature_Bath,
@@ -658,44 +599,16 @@ def Create_Hot_Profile_NoSDLM(
     )  # Return the Dwelling_Profile data frame and the list of profiles when this function is finished
 
 
+@Instrumentation.Timed("SDLM")
 def Modify_Profile_SDLM(
     Dwelling_Profile, SquareFootage_Dwelling, Water, Distribution_System_Type
 ):  # This function calculates the total mixed water flow rate by taking SDLM into account
-    # Identify the distribution system multiplier per table B-1 in the ACM
-    if Distribution_System_Type == "Trunk and Branch":
-        Distribution_System_Multiplier = 1
-    elif Distribution_System_Type == "Central Parallel Piping":
-        Distribution_System_Multiplier = 1.1
-    elif Distribution_System_Type == "Point of Use":
-        Distribution_System_Multiplier = 0.3
-    elif Distribution_System_Type == "Recirculation - Non-Demand Control":
-        Distribution_System_Multiplier = 9.8
-    elif Distribution_System_Type == "Recirculation with Manual Demand Control":
-        Distribution_System_Multiplier = 1.75
-    elif Distribution_System_Type == "Recirculation with Motion Sensor Demand Control":
-        Distribution_System_Multiplier = 2.6
-    elif Distribution_System_Type == "Pipe Insulation":
-        Distribution_System_Multiplier = 0.85
-    elif Distribution_System_Type == "Central Parallel Piping with 5 ft Maximum Length":
-        Distribution_System_Multiplier = 1
-    elif Distribution_System_Type == "Compact Design":
-        Distribution_System_Multiplier = 0.7
-    elif Distribution_System_Type == "Recirculation with Manual Demand Control - HERS":
-        Distribution_System_Multiplier = 1.6
-    elif (
-        Distribution_System_Type
-        == "Recirculation with Motion Sensor Demand Control - HERS"
-    ):
-        Distribution_System_Multiplier = 2.4
-
-    Standard_Distribution_Loss_Multiplier = (
-        1.0032
-        + 0.0001864 * min(2500, SquareFootage_Dwelling)
-        - 0.00000002165 * min(2500, SquareFootage_Dwelling) ** 2
-    )  # Calculated per Equation 6 in the ACM. Believe that there is a typo in the ACM, and it should be +1.0032, not =1.0032. Based on both results of equation and comparing to previous versions
-    Distribution_Loss_Multiplier = (
-        1 + (Standard_Distribution_Loss_Multiplier - 1) * Distribution_System_Multiplier
-    )  # Combine the Distribution System Multiplier and Standard Distribution Loss Multiplier to get the Distribution Loss Multiplier per Eqn 5 of Appendix B in the ACM
+    # The distribution system multipliers of table B-1 and Eqn 5 and 6 of Appendix B in the ACM are held once, in Profile_Generator.py
+    import Profile_Generator  # Imported here because Profile_Generator imports this module
+
+    Distribution_Loss_Multiplier = Profile_Generator.Distribution_Loss_Multiplier(
+        SquareFootage_Dwelling, Distribution_System_Type
+    )
 
     # Creates new columns that identify whether or not the duration of the draw gets modified by distribution loss multipliers. All draws except the clotheswasher and dishwaser get modified
     Dwelling_Profile["Isnt CWSH"] = (
@@ -738,6 +651,7 @@ def Modify_Profile_SDLM(
     return Dwelling_Profile  # Return the modified Dwelling_Profile
 
 
+@Instrumentation.Timed("Hot Fraction")
 def Calculate_Fraction_HotWater(
     Temperature_Supply_Hot_AtFixture, Temperature_Bath, Temperature_Shower, Data
 ):
@@ -787,6 +701,7 @@ def Calculate_Fraction_HotWater(
     return Data
 
 
+@Instrumentation.Timed("Hot Fraction")
 def Calculate_FlowWater_Hot(DrawProfile):
     # This function calculates the flow of hot water using the provided draw profile and fraction of hot water
 
@@ -800,6 +715,7 @@ def Calculate_FlowWater_Hot(DrawProfile):
     return DrawProfile
 
 
+@Instrumentation.Timed("Combine")
 def Combine_Profiles(Profiles, Water):
     Combined_Profile = pd.concat(
         Profiles
@@ -831,8 +747,13 @@ def Combine_Profiles(Profiles, Water):
 
     Skip = 0  # Creates a new variable that will be used to skip lines of the dataframe if they have already been added elsewhere
 
+    Combine_Progress = Progress.Progress(
+        "Combine_Profiles", len(Combined_Profile.index) - 1, "draws"
+    )  # Reports the progress of the loop below
+
     # This code cycles through all of the draws in Combined_Profile and adds them to Result_Profile. It handles the draws in different ways depending on the situations. There are several situations. 1) The current draw ends before the next draw begins, 2) The next draw begins before the current draw ends, and ends after the current draw ends, 3) The next draw both begins and ends before the current draw ends, 4) The current and following draws both start and end at the same time
     for i in range(len(Combined_Profile.index) - 1):
+        Combine_Progress.Update()
         if (
             Skip > 0
         ):  # If this line has already been handled by one of the "overlapping draw" routines
@@ -985,6 +906,8 @@ def Combine_Profiles(Profiles, Water):
 
             Skip = 1
 
+    Combine_Progress.Close()
+
     Result_Profile = pd.concat(
         [Result_Profile, Combined_Profile.loc[Combined_Profile.index.max()]]
     )
@@ -1015,6 +938,7 @@ def Combine_Profiles(Profiles, Water):
     )  # Return the data frame as the result of the function
 
 
+@Instrumentation.Timed("Filter")
 def Filter_DataSet_ByFixture(
     Dwelling_Profile,
     Include_Faucet,
@@ -1022,57 +946,20 @@ def Filter_DataSet_ByFixture(
     Include_Clothes,
     Include_Dish,
     Include_Bath,
-):  # Filters the data set to only include the fixtures requested by the user. User requests a fixture by setting the appropriate input to 'Yes'
-    Included_Code = (
-        []
-    )  # Create an empty list to store information on what fixtures are included in this draw profile
-    Profile = pd.DataFrame(
-        columns=Dwelling_Profile.columns
-    )  # Create a new dataframe for the output draw profile that has the same columns as the input draw profile
-    if Include_Faucet == "Yes":  # If the user selects to include faucets
-        Included_Code.append("F")  # Add 'F' to the list of included fixtures
-        Profile = pd.concat(
-            [Profile, Dwelling_Profile[Dwelling_Profile["Fixture"] == "FAUC"]]
-        )
-        # Select the data for faucet draws, add it to the profile
-    if Include_Shower == "Yes":  # If the user selects to incldue shower draws
-        Included_Code.append("S")  # Add 'S' to the list of included fixtures
-        Profile = pd.concat(
-            [Profile, Dwelling_Profile[Dwelling_Profile["Fixture"] == "SHWR"]]
-        )
-        # Select the data for shower draws, add it to the profile
-    if (
-        Include_Clothes == "Yes"
-    ):  # If the user selects that they want to include draws for clothes washers
-        Included_Code.append("C")  # Add 'C' to the list of included fixtures
-        Profile = pd.concat(
-            [Profile, Dwelling_Profile[Dwelling_Profile["Fixture"] == "CWSH"]]
-        )
-        # Select the data for clothes washers, add it to the profile
-    if Include_Dish == "Yes":  # If the user selects to include dishwasher draws
-        Included_Code.append("D")  # Add 'D' to the list of included fixtures
-        Profile = pd.concat(
-            [Profile, Dwelling_Profile[Dwelling_Profile["Fixture"] == "DWSH"]]
-        )
-    # Select the data for dishwashers, add it to the profile
-    if Include_Bath == "Yes":  # If the user selects to include bath draws
-        Included_Code.append("B")  # Add 'B' to the list of included fixtures
-        Profile = pd.concat(
-            [Profile, Dwelling_Profile[Dwelling_Profile["Fixture"] == "BATH"]]
-        )
-    # Select the data for baths, add it to the profile
-
+):  # Filters the data set to only include the fixtures requested by the user. User requests a fixture by setting the appropriate input to 'Yes'. Returns the profile and a string of letters stating the included fixtures. E.g. 'FSCDB'
+    Mask = Fixture_Filter.Fixture_Mask(
+        Include_Faucet, Include_Shower, Include_Clothes, Include_Dish, Include_Bath
+    )  # The bitmask of the included fixtures
+    Profile = Dwelling_Profile[
+        Fixture_Filter.Select_Fixtures(Dwelling_Profile["Fixture"].to_numpy(), Mask)
+    ]  # Select the draws of every included fixture in one pass
     Profile = Profile.sort_values(
-        "Start Time of Year (hr)"
+        "Start Time of Year (hr)", kind="stable"
+    ).reset_index(
+        drop=True
     )  # Sort the dataframe such that the data is presented in chronological order
-    Profile = (
-        Profile.reset_index()
-    )  # Reset the index since it got out of order when resetting the index
-    del Profile[
-        "index"
-    ]  # Delete the new column called 'index' because that's a silly thing for pandas to do anyway
 
-    return Profile, Included_Code
+    return Profile, Fixture_Filter.Included_Code(Mask)
 
 
 def Determine_Next_Change(
@@ -1211,6 +1098,7 @@ def Active_Draw_Ending(
     return Result_Profile, Active_Draw_Indices
 
 
+@Instrumentation.Timed("Combine")
 def Combined_Profile_LargeBuilding(Profiles, Water):
     Combined_Profile = pd.concat(
         Profiles
@@ -1245,8 +1133,168 @@ def Combined_Profile_LargeBuilding(Profiles, Water):
     return Combined_Profile  # Return the data frame as the result of the function
 
 
+def Save_Profile(
+    Profile,
+    Profile_Parameters,
+    Folder_Output=Folder_Output,
+    Output_Format=Output_Format,
+    CSV_Precision=CSV_Precision,
+):
+    # Saves a draw profile in the requested Output_Format and records it in the catalog of the output folder. Uses the INPUTS unless others are passed (E.g. by Batch_Scheduler.py)
+    if Output_Format == "Parquet":
+        return Columnar_Output.Write_Profile_Dataset(
+            Profile, os.path.join(Folder_Output, "Parquet"), Profile_Parameters
+        )  # Saves the data to the partition matching the building, climate zone, water and version
+
+    Output_Path = os.path.join(
+        Folder_Output, Profile_Catalog.Create_Profile_FileName(Profile_Parameters)
+    )
+    Fast_CSV_Writer.Write_CSV(
+        Profile, Output_Path, Precision=CSV_Precision
+    )  # Saves the data to the correct folder with a descriptive file name
+    Profile_Catalog.Register_Profile(
+        Output_Path, Profile
+    )  # Record the profile in the catalog stored alongside the outputs
+
+    return Output_Path
+
+
+def Create_Dwelling_Profile(
+    Building_Type,
+    NumberBedrooms_Dwelling,
+    Variant,
+    SquareFootage_Dwelling,
+    ClimateZone,
+    Water,
+    SDLM,
+    Include_Faucet,
+    Include_Shower,
+    Include_Clothes,
+    Include_Dish,
+    Include_Bath,
+    Version,
+    Distribution_System_Type,
+    Multiplier_Clotheswasher,
+    T_Mains=None,
+):  # Creates the draw profile of one dwelling, including the clotheswasher multiplier and SDLM. Returns the profile and the code of the included fixtures. T_Mains is passed to Create_Hot_Profile_NoSDLM or Create_Mixed_Profile_NoSDLM
+    if Water == "Hot":  # If the user is requesting how water information
+        Dwelling_Profile, Included_Code = Create_Hot_Profile_NoSDLM(
+            Building_Type,
+            NumberBedrooms_Dwelling,
+            Variant,
+            ClimateZone,
+            Include_Faucet,
+            Include_Shower,
+            Include_Clothes,
+            Include_Dish,
+            Include_Bath,
+            Version,
+            T_Mains=T_Mains,
+            Multiplier_Clotheswasher=Multiplier_Clotheswasher,
+        )
+
+    elif (
+        Water == "Mixed"
+    ):  # If the user is requesting mixed water flow exiting the fixture
+        Dwelling_Profile, Included_Code = Create_Mixed_Profile_NoSDLM(
+            Building_Type,
+            NumberBedrooms_Dwelling,
+            Variant,
+            Include_Faucet,
+            Include_Shower,
+            Include_Clothes,
+            Include_Dish,
+            Include_Bath,
+            Version,
+            T_Mains=T_Mains,
+            Multiplier_Clotheswasher=Multiplier_Clotheswasher,
+        )  # Call the Create_Mixed_Profile_AtFixture function to create the draw profile for this dwelling. Note that this returns the mixed water profile without including SDLM
+
+    if (
+        SDLM == "Yes"
+    ):  # If SDLM == 'Yes' then  execute this code calcualting the SDLM and adding it to the flow rate in the draw profile
+        Dwelling_Profile = Modify_Profile_SDLM(
+            Dwelling_Profile,
+            SquareFootage_Dwelling,
+            Water,
+            Distribution_System_Type,
+        )  # Calls the Create_Mixed_Profile_SDLM to add the SDLM impacts into the draw profile. Note that this is still mixed temperature data
+
+    return Dwelling_Profile, Included_Code
+
+
+def Dwelling_Cache_Key(
+    Building_Type,
+    NumberBedrooms_Dwelling,
+    Variant,
+    SquareFootage_Dwelling,
+    ClimateZone,
+    Water,
+    SDLM,
+    Include_Faucet,
+    Include_Shower,
+    Include_Clothes,
+    Include_Dish,
+    Include_Bath,
+    Version,
+    Distribution_System_Type,
+    Multiplier_Clotheswasher,
+):  # Returns the key of a dwelling profile in the result cache. See Result_Cache.py
+    return Result_Cache.Cache_Key(
+        {
+            "Result": "Dwelling",
+            "Building_Type": Building_Type,
+            "NumberBedrooms_Dwelling": NumberBedrooms_Dwelling,
+            "Variant": Variant if Building_Type == "Multi" else None,
+            "SquareFootage_Dwelling": SquareFootage_Dwelling if SDLM == "Yes" else None,
+            "ClimateZone": ClimateZone,  # Mixed water profiles also state the mains water temperature
+            "Water": Water,
+            "SDLM": SDLM,
+            "Include": [
+                Include_Faucet,
+                Include_Shower,
+                Include_Clothes,
+                Include_Dish,
+                Include_Bath,
+            ],
+            "Version": Version,
+            "Distribution_System_Type": (
+                Distribution_System_Type if SDLM == "Yes" else None
+            ),
+            "Multiplier_Clotheswasher": Multiplier_Clotheswasher,
+            "Temperatures": [
+                Temperature_Supply_Hot_AtFixture,
+                Temperature_Bath,
+                Temperature_Shower,
+            ],
+        },  # Parameters that don't change the profile are left out, so e.g. single family profiles are shared by every variant
+        Files=Result_Cache.Source_Data_Files(Version)
+        + [
+            os.path.join(
+                Folder_WeatherData, Weather_Data.Weather_File_Name(ClimateZone)
+            )
+        ],
+        Functions=[
+            Create_Dwelling_Profile,
+            Create_Hot_Profile_NoSDLM,
+            Create_Mixed_Profile_NoSDLM,
+            Modify_Profile_SDLM,
+            Calculate_Fraction_HotWater,
+            Calculate_FlowWater_Hot,
+            Filter_DataSet_ByFixture,
+            Fixture_Filter.Select_Fixtures,
+            Fixture_Filter.Filter_Daily_Profiles,
+            Daily_Profile_Catalog.Clotheswasher_Bounds,
+            Daily_Profile_Catalog.Build_Daily_Profiles,
+        ],
+    )
+
+
 # %%---------------------------GENERATE AND SAVE REQUESTED DRAW PROFILE---------
 if __name__ == "__main__":
+    if Use_Cache == "Yes":
+        Cache = Result_Cache.Result_Cache(Folder_Cache, Cache_Size)
+
     NumberBedrooms_Dwellings.sort()  # Sorts the list of number of bedrooms in each dwelling to be from min to max
 
     Variants = [
@@ -1268,6 +1316,10 @@ if __name__ == "__main__":
         []
     )  # Creates an empty list that will hold profiles to be combined. Is only useful if Combied == 'Yes'
 
+    Dwelling_Progress = Progress.Progress(
+        "Dwellings", len(NumberBedrooms_Dwellings), "dwellings"
+    )  # Reports the progress of the dwelling loop
+
     for i in range(
         len(NumberBedrooms_Dwellings)
     ):  # For each entry in the list NumberBedrooms_Dwellings
@@ -1287,86 +1339,35 @@ if __name__ == "__main__":
                 else:  # If the previous entry did not have the same number of bedrooms, we know that the new dwelling has a different number of bedrooms and starts over at the new Variant
                     Variant = 0
 
-        if Water == "Hot":  # If the user is requesting how water information
-            Dwelling_Profile, Included_Code = Create_Hot_Profile_NoSDLM(
-                Building_Type,
-                NumberBedrooms_Dwellings[i],
-                Variants[Variant],
-                ClimateZone,
-                Include_Faucet,
-                Include_Shower,
-                Include_Clothes,
-                Include_Dish,
-                Include_Bath,
-                Version,
+        Dwelling_Parameters = [
+            Building_Type,
+            NumberBedrooms_Dwellings[i],
+            Variants[Variant],
+            SquareFootage_Dwellings[i],
+            ClimateZone,
+            Water,
+            SDLM,
+            Include_Faucet,
+            Include_Shower,
+            Include_Clothes,
+            Include_Dish,
+            Include_Bath,
+            Version,
+            Distribution_System_Type,
+            Multiplier_Clotheswasher,
+        ]
+        if (
+            Use_Cache == "Yes"
+        ):  # Return the stored profile if one was created with the same inputs
+            Dwelling_Profile, Included_Code = Cache.Get_Or_Calculate(
+                Dwelling_Cache_Key(*Dwelling_Parameters),
+                Create_Dwelling_Profile,
+                *Dwelling_Parameters,
             )
-
-        elif (
-            Water == "Mixed"
-        ):  # If the user is requesting mixed water flow exiting the fixture
-            Dwelling_Profile, Included_Code = Create_Mixed_Profile_NoSDLM(
-                Building_Type,
-                NumberBedrooms_Dwellings[i],
-                Variants[Variant],
-                Include_Faucet,
-                Include_Shower,
-                Include_Clothes,
-                Include_Dish,
-                Include_Bath,
-                Version,
-            )  # Call the Create_Mixed_Profile_AtFixture function to create the draw profile for this dwelling. Note that this returns the mixed water profile without including SDLM
-
-        # Increases the duration of clotheswasher draws based on the Multiplier_Clotheswasher specified above to match CBECC calculations
-        Dwelling_Profile["BooleanMask"] = (
-            Dwelling_Profile["Fixture"] == "CWSH"
-        )  # Resets BooleanMask = True if Fixture in that row = CWSH
-        Dwelling_Profile["Duration (min)"] = Dwelling_Profile[
-            "Duration (min)"
-        ] + Dwelling_Profile["BooleanMask"] * Dwelling_Profile["Duration (min)"] * (
-            Multiplier_Clotheswasher - 1
-        )
-
-        if Water == "Hot":
-            Dwelling_Profile["Hot Water Volume (gal)"] = Dwelling_Profile[
-                "Hot Water Volume (gal)"
-            ] + Dwelling_Profile["BooleanMask"] * Dwelling_Profile[
-                "Hot Water Volume (gal)"
-            ] * (
-                Multiplier_Clotheswasher - 1
+        else:
+            Dwelling_Profile, Included_Code = Create_Dwelling_Profile(
+                *Dwelling_Parameters
             )
-        del Dwelling_Profile[
-            "BooleanMask"
-        ]  # Delete the BooleanMask column because it is no longer useful
-
-        # Shorten the 'Included_Code' to reduce file path, make the draw profiles more user friendly. The end result is a series of letters stating the end uses included in the draw profile
-        Included_Code = str(
-            Included_Code
-        )  # Convert Included_Code from a list to a string
-        Included_Code = Included_Code.replace(
-            "[", ""
-        )  # Remove all [s from Included_Code
-        Included_Code = Included_Code.replace(
-            "]", ""
-        )  # Remove all ]s from Included_Code
-        Included_Code = Included_Code.replace(
-            "'", ""
-        )  # Remove all apostrophes from Included_Code
-        Included_Code = Included_Code.replace(
-            ",", ""
-        )  # Remove all commas from Included_Code
-        Included_Code = Included_Code.replace(
-            " ", ""
-        )  # Remove all spaces from Included_Code
-
-        if (
-            SDLM == "Yes"
-        ):  # If SDLM == 'Yes' then  execute this code calcualting the SDLM and adding it to the flow rate in the draw profile
-            Dwelling_Profile = Modify_Profile_SDLM(
-                Dwelling_Profile,
-                SquareFootage_Dwellings[i],
-                Water,
-                Distribution_System_Type,
-            )  # Calls the Create_Mixed_Profile_SDLM to add the SDLM impacts into the draw profile. Note that this is still mixed temperature data
 
         if (
             Combined == "No" and Combined_LargeBuilding == "No"
@@ -1376,130 +1377,45 @@ if __name__ == "__main__":
             ):
                 os.makedirs(Folder_Output + os.sep + Building_Type + os.sep + Water)
 
-            if Building_Type == "Multi":  # If it's a multi-family building
-                if SDLM == "Yes":
-                    Dwelling_Profile.to_csv(
-                        Folder_Output
-                        + os.sep
-                        + "Bldg="
-                        + Building_Type
-                        + "_CZ="
-                        + str(ClimateZone)
-                        + "_Wat="
-                        + Water
-                        + "_Prof="
-                        + str(NumberBedrooms_Dwellings[i])
-                        + str(Variants[Variant])
-                        + "_SDLM="
-                        + SDLM
-                        + "_CFA="
-                        + str(SquareFootage_Dwellings[i])
-                        + "_Inc="
-                        + str(Included_Code)
-                        + "_Ver="
-                        + str(Version)
-                        + ".csv",
-                        index=False,
-                    )  # Saves the data to the correct folder with a descriptive file name
-                elif SDLM == "No":
-                    Dwelling_Profile.to_csv(
-                        Folder_Output
-                        + os.sep
-                        + "Bldg="
-                        + Building_Type
-                        + "_CZ="
-                        + str(ClimateZone)
-                        + "_Wat="
-                        + Water
-                        + "_Prof="
-                        + str(NumberBedrooms_Dwellings[i])
-                        + str(Variants[Variant])
-                        + "_Inc="
-                        + str(Included_Code)
-                        + "_Ver="
-                        + str(Version)
-                        + ".csv",
-                        index=False,
-                    )  # Saves the data to the correct folder with a descriptive file name
-
-                print(
-                    "Finished processing {}".format(
-                        "Bldg="
-                        + Building_Type
-                        + "_CZ="
-                        + str(ClimateZone)
-                        + "_Wat="
-                        + Water
-                        + "_Prof="
-                        + str(NumberBedrooms_Dwellings[i])
-                        + str(Variants[Variant])
-                        + "_Inc="
-                        + str(Included_Code)
-                        + "_Ver="
-                        + str(Version)
-                    )
+            Profile_Parameters = {
+                "Bldg": Building_Type,
+                "CZ": ClimateZone,
+                "Wat": Water,
+                "Prof": str(NumberBedrooms_Dwellings[i])
+                + (
+                    str(Variants[Variant]) if Building_Type == "Multi" else ""
+                ),  # Multi-family profiles also state the variant
+                "SDLM": SDLM,
+                "CFA": SquareFootage_Dwellings[i],
+                "Inc": Included_Code,
+                "Ver": Version,
+            }  # Describes the profile. Used to create the file name and the catalog entry
+            if Climate_Independent == "Yes":  # Save one copy of the profile for every climate zone
+                Climate_Independent_Profiles.Save_Profile(
+                    Dwelling_Profile,
+                    Folder_Output,
+                    Profile_Parameters,
+                    Precision=CSV_Precision,
                 )
-
-            elif Building_Type == "Single":  # If it's a single family building
-                if SDLM == "Yes":
-                    Dwelling_Profile.to_csv(
-                        Folder_Output
-                        + os.sep
-                        + "Bldg="
-                        + Building_Type
-                        + "_CZ="
-                        + str(ClimateZone)
-                        + "_Wat="
-                        + Water
-                        + "_Prof="
-                        + str(NumberBedrooms_Dwellings[i])
-                        + "_SDLM="
-                        + SDLM
-                        + "_CFA="
-                        + str(SquareFootage_Dwellings[i])
-                        + "_Inc="
-                        + str(Included_Code)
-                        + "_Ver="
-                        + str(Version)
-                        + ".csv",
-                        index=False,
-                    )  # Saves the data to the correct folder with a descriptive file name
-                elif SDLM == "No":
-                    Dwelling_Profile.to_csv(
-                        Folder_Output
-                        + os.sep
-                        + "Bldg="
-                        + Building_Type
-                        + "_CZ="
-                        + str(ClimateZone)
-                        + "_Wat="
-                        + Water
-                        + "_Prof="
-                        + str(NumberBedrooms_Dwellings[i])
-                        + "_Inc="
-                        + str(Included_Code)
-                        + "_Ver="
-                        + str(Version)
-                        + ".csv",
-                        index=False,
-                    )  # Saves the data to the correct folder with a descriptive file name
-
-                print(
-                    "Finished processing {}".format(
-                        "Bldg="
-                        + Building_Type
-                        + "_CZ="
-                        + str(ClimateZone)
-                        + "_Wat="
-                        + Water
-                        + "_Prof="
-                        + str(NumberBedrooms_Dwellings[i])
-                        + "_Inc="
-                        + str(Included_Code)
-                        + "_Ver="
-                        + str(Version)
-                    )
+            else:
+                Save_Profile(Dwelling_Profile, Profile_Parameters)
+
+            print(
+                "Finished processing {}".format(
+                    "Bldg="
+                    + Building_Type
+                    + "_CZ="
+                    + str(ClimateZone)
+                    + "_Wat="
+                    + Water
+                    + "_Prof="
+                    + Profile_Parameters["Prof"]
+                    + "_Inc="
+                    + str(Included_Code)
+                    + "_Ver="
+                    + str(Version)
                 )
+            )
 
         elif (
             Combined == "Yes" or Combined_LargeBuilding == "Yes"
@@ -1508,6 +1424,10 @@ if __name__ == "__main__":
                 Dwelling_Profile
             )  # Add the draw profile to the list of draw profiles that we need to combine
 
+        Dwelling_Progress.Update(Rows=len(Dwelling_Profile))
+
+    Dwelling_Progress.Close()
+
     if (
         Combined == "Yes"
     ):  # If the user wants the draw profiles to be combined into one then execute this code
@@ -1518,48 +1438,17 @@ if __name__ == "__main__":
         if not os.path.exists(Folder_Output + os.sep + Building_Type + os.sep + Water):
             os.makedirs(Folder_Output + os.sep + Building_Type + os.sep + Water)
 
-        if SDLM == "Yes":
-            Dwelling_Profile.to_csv(
-                Folder_Output
-                + os.sep
-                + "Bldg="
-                + Building_Type
-                + "_CZ="
-                + str(ClimateZone)
-                + "_Wat="
-                + Water
-                + "_Prof="
-                + str(NumberBedrooms_Dwellings)
-                + "_SDLM="
-                + SDLM
-                + "_CFA="
-                + str(SquareFootage_Dwellings)
-                + "_Inc="
-                + str(Included_Code)
-                + "_Ver="
-                + str(Version)
-                + ".csv",
-                index=False,
-            )  # Saves the data to the correct folder with a descriptive file name
-        elif SDLM == "No":
-            Dwelling_Profile.to_csv(
-                Folder_Output
-                + os.sep
-                + "Bldg="
-                + Building_Type
-                + "_CZ="
-                + str(ClimateZone)
-                + "_Wat="
-                + Water
-                + "_Prof="
-                + str(NumberBedrooms_Dwellings)
-                + "_Inc="
-                + str(Included_Code)
-                + "_Ver="
-                + str(Version)
-                + ".csv",
-                index=False,
-            )  # Saves the data to the correct folder with a descriptive file name
+        Profile_Parameters = {
+            "Bldg": Building_Type,
+            "CZ": ClimateZone,
+            "Wat": Water,
+            "Prof": str(NumberBedrooms_Dwellings),
+            "SDLM": SDLM,
+            "CFA": str(SquareFootage_Dwellings),
+            "Inc": Included_Code,
+            "Ver": Version,
+        }  # Describes the combined profile. Used to create the file name and the catalog entry
+        Save_Profile(Dwelling_Profile, Profile_Parameters)
 
     if (
         Combined_LargeBuilding == "Yes"
@@ -1571,54 +1460,16 @@ if __name__ == "__main__":
         if not os.path.exists(Folder_Output + os.sep + Building_Type + os.sep + Water):
             os.makedirs(Folder_Output + os.sep + Building_Type + os.sep + Water)
 
-        if SDLM == "Yes":
-            Dwelling_Profile.to_csv(
-                Folder_Output
-                + os.sep
-                + "Bldg="
-                + Building_Type
-                + "_CZ="
-                + str(ClimateZone)
-                + "_Wat="
-                + Water
-                + "_Prof="
-                + str(NumberBedrooms_Dwellings)
-                + "_SDLM="
-                + SDLM
-                + "_CFA="
-                + str(SquareFootage_Dwellings)
-                + "_Inc="
-                + str(Included_Code)
-                + "_Ver="
-                + str(Version)
-                + ".csv",
-                index=False,
-            )  # Saves the data to the correct folder with a descriptive file name
-        elif SDLM == "No":
-            Dwelling_Profile.to_csv(
-                Folder_Output
-                + os.sep
-                + "Bldg="
-                + Building_Type
-                + "_CZ="
-                + str(ClimateZone)
-                + "_Wat="
-                + Water
-                + "_Prof="
-                + str(NumberBedrooms_Dwellings)
-                + "_Inc="
-                + str(Included_Code)
-                + "_Ver="
-                + str(Version)
-                + ".csv",
-                index=False,
-            )  # Saves the data to the correct folder with a descriptive file name
-
-    end_time = time.time()
-    print(
-        "total = {}, mixed = {}, hot = {}".format(
-            end_time - start_time,
-            end_laggard_mixed - start_laggard_mixed,
-            end_laggard_hot - start_laggard_hot,
-        )
-    )
+        Profile_Parameters = {
+            "Bldg": Building_Type,
+            "CZ": ClimateZone,
+            "Wat": Water,
+            "Prof": str(NumberBedrooms_Dwellings),
+            "SDLM": SDLM,
+            "CFA": str(SquareFootage_Dwellings),
+            "Inc": Included_Code,
+            "Ver": Version,
+        }  # Describes the combined profile. Used to create the file name and the catalog entry
+        Save_Profile(Dwelling_Profile, Profile_Parameters)
+
+    Instrumentation.Print_Summary()
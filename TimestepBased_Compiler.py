@@ -6,6 +6,11 @@ This script combines multiple timestep-based T24 draw profiles into a single fil
 It creates a column for each draw profile (named using the number of bedrooms and variant)
 then sums the columns to find the total
 
+The hot water volume of every dwelling in a climate zone is loaded once into a
+(dwellings x timesteps) array. Each building in Building_Compositions selects
+its dwellings by variant (or includes all of them), and the building totals of every composition are
+calculated together as a single masked sum over that array
+
 CAUTION: This script is currently written for a specific project, and probably needs to be edited
 prior to use for other projects
 
@@ -13,40 +18,74 @@ prior to use for other projects
 """
 
 import pandas as pd
-import glob
+import numpy as np
 import os
 import datetime
-import matplotlib.pyplot as plt
+
+import Profile_Catalog
+import Fast_CSV_Writer
+import Columnar_Output
+import Dymola_Tables
+import Design_Days
+import Day_Index
+import Instrumentation
+import Profile_Plots
 
 # %%------------------------INPUTS---------------------------------
 
 Dymola_Export = True
+Dymola_Extension = ".txt"  # Either '.txt' or '.mat'. '.mat' writes MATLAB v4 tables, which Dymola reads much faster than text. See Dymola_Tables.py
+Dymola_Precision = None  # Number of decimal places written to text tables. None writes full precision, a number (E.g. 6) writes faster
+Dymola_Columns = [
+    "Mains Temperature (deg C)",
+    "Timestep (min)",
+    "Building Hot Water Draw Volume (L)",
+]  # The columns of the CombiTimeTable tables, after time
+Plot_Output = "Files"  # Either 'Files', 'Screen', 'HTML' or 'None'. 'Files' saves .png plots of each building to Compiled\Plots in parallel without a display, 'HTML' saves zoomable plots (requires bokeh)
+Plot_Method = "MinMax"  # Either 'MinMax' or 'LTTB'. How the year of timesteps is downsampled before plotting. See Profile_Plots.py
+Input_Format = "CSV"  # Either 'CSV' or 'Parquet'. 'Parquet' reads the dataset written by Event_To_Timestep_Converter.py with Output_Format = 'Parquet'
 
 cwd = os.getcwd()
 Folder = os.path.join(cwd, "DrawProfiles", "Timestep_Based")
-Files = glob.glob(Folder + "/*.csv")
-
-Dates_Four = {
-    "Low": datetime.date(2022, 5, 10),
-    "Medium": datetime.date(2022, 1, 29),
-    "High": datetime.date(2022, 1, 26),
-}
-
-Dates_Six = {
-    "Low": datetime.date(2022, 8, 14),
-    "Medium": datetime.date(2022, 10, 1),
-    "High": datetime.date(2022, 11, 13),
-}
-
-Dates_Eight = {
-    "Low": datetime.date(2022, 6, 1),
-    "Medium": datetime.date(2022, 2, 9),
-    "High": datetime.date(2022, 3, 31),
-}
+if Input_Format == "Parquet":
+    Catalog = Profile_Catalog.Query_Catalog(
+        Profile_Catalog.Build_Catalog(os.path.join(Folder, "Parquet"), "**/*.parquet"),
+        Format="Timestep",
+    )
+else:
+    Catalog = Profile_Catalog.Query_Catalog(
+        Profile_Catalog.Build_Catalog(Folder, "*.csv"), Format="Timestep"
+    )  # Index the timestep-based profiles once, instead of re-parsing the file names below
+
+Design_Day_Percentiles = {
+    "Low": 10,
+    "Medium": 50,
+    "High": 90,
+}  # The design days exported for each building, and the percentile of days each represents. See Design_Days.py
+Design_Day_Metric = "Daily"  # Either 'Daily' or 'Peak_Hour'. The building volume design days are ranked by
+
+Building_Compositions = {
+    "Eight": {"Variants": None},
+    "Six": {"Variants": ["a", "b", "c"]},
+    "Four": {"Variants": ["a", "b"]},
+}  # The buildings to compile. Each includes every dwelling whose profile variant is in "Variants", or every compiled dwelling if "Variants" is None (E.g. "Eight", the sum of all dwellings). Design days are selected automatically unless "Dates" is given, E.g. "Dates": {"Low": datetime.date(2022, 6, 1)}
 
 # %%----------------FUNCTIONS--------------------------------------
 
 
+@Instrumentation.Timed("Load")
+def Read_Profile(File, Columns=None):
+    # Reads a timestep-based profile with a datetime index. Parquet profiles only read Columns (and keep their typed timestamps), .csv profiles are read in full
+    if Input_Format == "Parquet":
+        return Columnar_Output.Read_Profile_File(
+            File, ["Timestamp"] + Columns if Columns is not None else None
+        )
+
+    Profile = pd.read_csv(File, index_col=0)
+    Profile.index = pd.to_datetime(Profile.index)
+    return Profile
+
+
 def Change_Mains_Temperature():
     """
 
@@ -86,148 +125,198 @@ def Convert_To_Dymola(Draw_Profile):
     return temp
 
 
-def Save_Result(Draw_Profile, Dymola_Export, Dates):
-    Cols = [col for col in Draw_Profile.columns if "(L)" in col]
-    if len(Cols) == 9:
-        Size = "Eight"
-        Variants = "[abcd]"
-    elif len(Cols) == 7:
-        Size = "Six"
-        Variants = "[abc]"
-    elif len(Cols) == 5:
-        Size = "Four"
-        Variants = "[ab]"
-    else:
-        print("Unkown number of dwellings, len(cols) == {}".format(len(Cols)))
-        Size = "Unknown"
+@Instrumentation.Timed("Combine")
+def Compose_Building(Shared, Names, Volumes, Mask, Total):
+    """
+    Returns the compiled profile of one building: the dwelling volume columns
+    selected by Mask, the columns shared by all dwellings (Mains temperature,
+    etc.) and the building's total volume. The first dwelling's column comes
+    first, matching the layout of the source profiles
+    """
+
+    Dwellings = pd.DataFrame(
+        Volumes[Mask].T,
+        index=Shared.index,
+        columns=["{} (L)".format(Name) for Name in Names[Mask]],
+    )
+    Draw_Profile = pd.concat(
+        [Dwellings.iloc[:, :1], Shared, Dwellings.iloc[:, 1:]], axis=1
+    )
+    Draw_Profile["Building Hot Water Draw Volume (L)"] = Total
+
+    return Draw_Profile
+
+
+def Save_Result(Draw_Profile, Dymola_Export, Dates, Size, Variants, Days):
+    Variants = "[{}]".format("".join(Variants))
     print(Size)
 
     if Dymola_Export == True:
         for Date in Dates.keys():
             print(Date)
             print(Dates[Date])
-            Day_Profile = Draw_Profile.loc[Draw_Profile.index.date == Dates[Date]]
+            Day_Profile = Draw_Profile.iloc[Day_Index.Day_Slice(Days, Dates[Date])]
             print(Day_Profile["Building Hot Water Draw Volume (L)"].sum())
-            Day_Profile = Convert_To_Dymola(Day_Profile)
 
             # @Weiping - Please add some content to the filename describing the charge/discharge times
 
-            Day_Profile.to_csv(
+            Dymola_Tables.Write_Profile(
                 os.path.join(
                     Folder,
                     "Compiled",
-                    "CZ={}_CECPrototype_6960ft2_2008_{}Dwellings_Variants={}_{}_Cold.txt".format(
-                        CZ, Size, Variants, Date
+                    "CZ={}_CECPrototype_6960ft2_2008_{}Dwellings_Variants={}_{}_Cold{}".format(
+                        CZ, Size, Variants, Date, Dymola_Extension
                     ),
                 ),
-                sep="\t",
-                header=False,
+                Day_Profile,
+                Dymola_Columns,
+                Precision=Dymola_Precision,
             )
 
-        Draw_Profile = Convert_To_Dymola(Draw_Profile)
-        Draw_Profile.to_csv(
+        Dymola_Tables.Write_Profile(
             os.path.join(
                 Folder,
                 "Compiled",
-                "CZ={}_CECPrototype_6960ft2_2008_{}Dwellings_Variants={}_Cold.txt".format(
-                    CZ, Size, Variants
+                "CZ={}_CECPrototype_6960ft2_2008_{}Dwellings_Variants={}_Cold{}".format(
+                    CZ, Size, Variants, Dymola_Extension
                 ),
             ),
-            sep="\t",
-            header=False,
+            Draw_Profile,
+            Dymola_Columns,
+            Precision=Dymola_Precision,
         )
     else:
-        Draw_Profile.to_csv(
+        Fast_CSV_Writer.Write_CSV(
+            Draw_Profile,
             os.path.join(
                 Folder,
                 "Compiled",
                 "CZ={}_CECPrototype_6960ft2_2008_{}Dwellings_Variants={}_Cold.csv".format(
                     CZ, Size, Variants
                 ),
-            )
+            ),
+            Index=True,
         )
         for Date in Dates.keys():
-            Day_Profile = Profile.loc[Profile.index.date == Dates[Date]]
+            Day_Profile = Draw_Profile.iloc[Day_Index.Day_Slice(Days, Dates[Date])]
             Day_Profile = Convert_To_Dymola(Day_Profile)
-            Day_Profile.to_csv(
+            Fast_CSV_Writer.Write_CSV(
+                Day_Profile,
                 os.path.join(
                     Folder,
                     "Compiled",
                     "CZ={}_CECPrototype_6960ft2_2008_{}Dwellings_Variants={}_{}_Cold.txt".format(
                         CZ, Size, Variants, Date
                     ),
-                )
+                ),
+                Index=True,
             )
 
 
 # %%--------------------EXECUTE CODE--------------------
 
-CZs = []
-for File in Files:
-    CZ = File.split("M_")[-1].split("_")[0]
-    CZs.append(CZ)
-
-CZs = list(set(CZs))
-
-print(CZs)
-
-# CZ = '03'
-# if True:
-for CZ in CZs:
-    print(CZ)
-    Files_CZ = [File for File in Files if File.split("M_")[-1].split("_")[0] == CZ]
-    File = [File for File in Files_CZ if "_1a_" in File][0]
-    Files_CZ.remove(File)
-
-    Profile = pd.read_csv(File, index_col=0)
-    Profile.index = pd.to_datetime(Profile.index)
-    Profile_Name = File.split("_")[7]
-    Profile = Profile.rename(
-        columns={"Hot Water Draw Volume (L)": "{} (L)".format(Profile_Name)}
-    )
-
-    Four_Dwellings = Profile.copy(deep=True)
-    Six_Dwellings = Profile.copy(deep=True)
-
-    for File in Files_CZ:
-        df = pd.read_csv(File, index_col=0)
-        df.index = pd.to_datetime(df.index)
-        Profile_Name = File.split("_")[7]
-        Profile["{} (L)".format(Profile_Name)] = df["Hot Water Draw Volume (L)"]
-        if "a" in Profile_Name or "b" in Profile_Name:
-            Four_Dwellings["{} (L)".format(Profile_Name)] = df[
-                "Hot Water Draw Volume (L)"
-            ]
-        if "a" in Profile_Name or "b" in Profile_Name or "c" in Profile_Name:
-            Six_Dwellings["{} (L)".format(Profile_Name)] = df[
-                "Hot Water Draw Volume (L)"
+if __name__ == "__main__":  # Render_Plots starts worker processes, which import this script
+    CZs = sorted(Catalog["CZ"].unique())
+
+    print(CZs)
+
+    Plots = []  # Downsampled building totals, rendered together once every climate zone is compiled
+    if Plot_Output in ["Files", "HTML"]:
+        os.makedirs(os.path.join(Folder, "Compiled", "Plots"), exist_ok=True)
+
+    # CZ = 3
+    # if True:
+    for CZ in CZs:
+        print(CZ)
+        Files_CZ = Catalog[Catalog["CZ"] == CZ].sort_values(
+            "Prof", key=lambda Prof: Prof != "1a", kind="stable"
+        )  # 1a first, as its non-volume columns are shared by every building
+        CZ = "{:02d}".format(CZ)  # Output file names use the two digit climate zone
+
+        Shared = Read_Profile(Files_CZ["Full_Path"].iloc[0])
+        Shared = Shared.drop(columns=["Hot Water Draw Volume (L)"])
+        Days = Day_Index.Read_Day_Index(
+            Files_CZ["Full_Path"].iloc[0], Shared.index
+        )  # Position of each day in the compiled profiles, used to slice design days
+        Names = Files_CZ["Prof"].to_numpy()
+
+        Volumes = np.zeros((len(Files_CZ.index), len(Shared.index)))
+        for Row, File in enumerate(Files_CZ["Full_Path"]):
+            df = Read_Profile(File, ["Hot Water Draw Volume (L)"])
+            Volumes[Row] = (
+                df["Hot Water Draw Volume (L)"].reindex(Shared.index).fillna(0).to_numpy()
+            )  # One row per dwelling, aligned to the shared timestamps
+
+        Masks = np.array(
+            [
+                (
+                    np.ones(len(Files_CZ), dtype=bool)
+                    if Composition["Variants"] is None
+                    else Files_CZ["Variant"].isin(Composition["Variants"]).to_numpy()
+                )
+                for Composition in Building_Compositions.values()
             ]
+        )  # (compositions x dwellings)
+        Totals = Masks.astype(float) @ Volumes  # Building total of every composition in one pass
+
+        Dates, Summary = Design_Days.Select_Design_Days(
+            Shared.index, Totals, Design_Day_Percentiles, Design_Day_Metric, Days
+        )  # Design days of every composition from one pass over the building totals
+        Summary["Building"] = np.array(list(Building_Compositions.keys()))[
+            Summary["Building"]
+        ]
+        print(Summary)
+        Fast_CSV_Writer.Write_CSV(
+            Summary, os.path.join(Folder, "Compiled", "CZ={}_Design_Days.csv".format(CZ))
+        )
 
-    cols = [col for col in Profile.columns if "(L)" in col]
-    Profile["Building Hot Water Draw Volume (L)"] = Profile[cols].sum(axis=1)
-    cols = [col for col in Six_Dwellings.columns if "(L)" in col]
-    Six_Dwellings["Building Hot Water Draw Volume (L)"] = Six_Dwellings[cols].sum(
-        axis=1
-    )
-    cols = [col for col in Four_Dwellings.columns if "(L)" in col]
-    Four_Dwellings["Building Hot Water Draw Volume (L)"] = Four_Dwellings[cols].sum(
-        axis=1
-    )
-
-    # @Weiping - Please run Change_Mains_Temperature on [Profile, Six_Dwellings, Foud_Dwellings] here
-
-    Save_Result(Profile, Dymola_Export, Dates_Eight)
-    Save_Result(Six_Dwellings, Dymola_Export, Dates_Six)
-    Save_Result(Four_Dwellings, Dymola_Export, Dates_Four)
+        # @Weiping - Please run Change_Mains_Temperature on Shared here
 
-    fig = plt.figure()
-    plt.plot(Profile.index, Profile["Building Hot Water Draw Volume (L)"])
-    plt.title("CZ={} - All".format(CZ))
+        for Number, (Size, Composition) in enumerate(Building_Compositions.items()):
+            Draw_Profile = Compose_Building(
+                Shared, Names, Volumes, Masks[Number], Totals[Number]
+            )
+            Save_Result(
+                Draw_Profile,
+                Dymola_Export,
+                Composition.get("Dates", Dates[Number]),
+                Size,
+                (
+                    Composition["Variants"]
+                    if Composition["Variants"] is not None
+                    else sorted(Files_CZ["Variant"].dropna().unique())
+                ),  # Buildings of every dwelling are named by the variants present
+                Days,
+            )
 
-    fig = plt.figure()
-    plt.plot(Profile.index, Six_Dwellings["Building Hot Water Draw Volume (L)"])
-    plt.title("CZ={} - Six".format(CZ))
+            Title = "CZ={} - {}".format(CZ, Size)
+            if Plot_Output == "HTML":  # Zoomable plots keep finer levels, so they are written from the full series
+                Profile_Plots.Write_HTML(
+                    os.path.join(Folder, "Compiled", "Plots", Title + ".html"),
+                    Shared.index.to_numpy(),
+                    Totals[Number],
+                    Title,
+                    Method=Plot_Method,
+                )
+            elif Plot_Output in ["Files", "Screen"]:
+                X, Y = Profile_Plots.Downsample(
+                    Shared.index.to_numpy(), Totals[Number], Plot_Method
+                )  # Keep only the downsampled series until the plots are drawn
+                Plots.append(
+                    {
+                        "X": X,
+                        "Y": Y,
+                        "Title": Title,
+                        "Path": os.path.join(Folder, "Compiled", "Plots", Title + ".png")
+                        if Plot_Output == "Files"
+                        else None,
+                        "Method": "None",
+                        "Y_Label": "Building Hot Water Draw Volume (L)",
+                    }
+                )
 
-    fig = plt.figure()
-    plt.plot(Profile.index, Four_Dwellings["Building Hot Water Draw Volume (L)"])
-    plt.title("CZ={} - Four".format(CZ))
+    if Plot_Output == "Files":
+        Profile_Plots.Render_Plots(Plots)
+    elif Plot_Output == "Screen":
+        for Plot in Plots:
+            Profile_Plots.Plot_Profile(**Plot)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Wed Oct 14 10:02:51 2026
+
+This script is the shared store for the CBECC weather data used by the other
+scripts in this repository. Each script previously read the weather file for
+its climate zone and recalculated the mains water temperature on its own.
+
+The functions in this script read each weather file once per process and keep
+the results in memory:
+    -Weather_File_Name - Returns the name of the weather file for a climate
+        zone. Note the 0 following CTZ in climate zones < 10
+    -Read_TMains - Returns the mains water temperature for each day of the
+        year (365 entries) in one climate zone. Equation 10, ACM, Appendix B
+    -Read_TMains_AllZones - Returns a (16 x 365) array of the mains water
+        temperature on each day of the year in every climate zone. Row 0 is
+        climate zone 1
+    -Read_Outdoor_Temperature - Returns the hourly dry bulb temperature (8760
+        entries) in one climate zone
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import pandas as pd
+import numpy as np
+import os
+from functools import lru_cache
+
+import Instrumentation
+
+try:
+    root = os.path.dirname(os.path.abspath(__file__))
+except:
+    root = os.getcwd()
+
+# %%--------------------CONSTANTS------------------------
+
+Folder_WeatherData = os.path.join(
+    root, "WeatherFiles"
+)  # This states the folder that CBECC weather data files are stored in
+Climate_Zones = list(range(1, 17))  # list of all possible climate zones
+
+# %%--------------------DEFINE FUNCTIONS-----------------------------------
+
+
+def Weather_File_Name(ClimateZone):
+    return "CTZ{:02d}S13b.CSW".format(int(ClimateZone))
+
+
+@lru_cache(maxsize=None)
+@Instrumentation.Timed("Load")
+def _Read_TMains_Array(ClimateZone, Folder):
+    WeatherData = pd.read_csv(
+        os.path.join(Folder, Weather_File_Name(ClimateZone)),
+        header=26,
+        usecols=["Hour", "T Ground", "31-day Avg lag DB"],
+    )  # Read the weather data, ignoring the first 26 lines of header
+
+    First_Hour = WeatherData[
+        WeatherData["Hour"] == 1
+    ]  # filter data to only include the fist hour of every day
+    T_Mains = (
+        0.65 * First_Hour["T Ground"].to_numpy()
+        + 0.35 * First_Hour["31-day Avg lag DB"].to_numpy()
+    )  # Equation 10, ACM, Appendix B. Returns the mains water temperature as a function of the ground temper
+    T_Mains.setflags(write=False)  # The cached array is shared between callers
+
+    return T_Mains
+
+
+def Read_TMains(ClimateZone, Folder=Folder_WeatherData):
+    """
+    Returns a series of the mains water temperature (deg F) on each day of the
+    year, indexed by the zero-based day of year. Reads the weather file the
+    first time a climate zone is requested.
+    """
+
+    return pd.Series(_Read_TMains_Array(int(ClimateZone), Folder), index=range(365))
+
+
+def Read_TMains_AllZones(Folder=Folder_WeatherData):
+    # Returns a (16 x 365) array of the mains water temperature (deg F). Index with [ClimateZone - 1, Day_Of_Year - 1]
+    return np.vstack(
+        [_Read_TMains_Array(ClimateZone, Folder) for ClimateZone in Climate_Zones]
+    )
+
+
+@lru_cache(maxsize=None)
+@Instrumentation.Timed("Load")
+def _Read_DryBulb_Array(ClimateZone, Folder):
+    Dry_Bulb = pd.read_csv(
+        os.path.join(Folder, Weather_File_Name(ClimateZone)),
+        header=26,
+        usecols=["Dry Bulb"],
+    )["Dry Bulb"].to_numpy(dtype=float)
+    Dry_Bulb.setflags(write=False)  # The cached array is shared between callers
+
+    return Dry_Bulb
+
+
+def Read_Outdoor_Temperature(ClimateZone, Folder=Folder_WeatherData):
+    # Returns an array of the outdoor dry bulb temperature (deg F) in each hour of the year. Entry 0 is the hour ending at 1 AM on Jan 1
+    return _Read_DryBulb_Array(int(ClimateZone), Folder)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Tue Oct 20 09:12:37 2026
+
+Regression tests for Fast_CSV_Writer.py. Run with python -m pytest.
+"""
+
+# %%--------------------IMPORT STATEMENTS----------------
+
+import numpy as np
+import pandas as pd
+
+import Fast_CSV_Writer
+
+# %%--------------------TESTS-----------------------------------
+
+
+def test_Weekend_Day_Codes_Stay_Text(tmp_path):
+    # Weekend day codes look like numbers ('1E1' = 10). They must be written as text in every chunk
+    Profile = pd.DataFrame(
+        {
+            "Day": ["1E0", "1E1", "5E4", "2E2", "3E1", "6E3", "4E9"],
+            "Fixture": ["FAUC", "SHWR", "CWSH", "DWSH", "BATH", "FAUC", "SHWR"],
+            "Duration (min)": [0.124, 0.622, 1.5, 2.0, 3.25, 0.5, 1.0],
+        }
+    )
+    Path = str(tmp_path / "Weekend.csv")
+    Fast_CSV_Writer.Write_CSV(Profile, Path, Chunk_Size=3)
+
+    Written = pd.read_csv(Path, dtype={"Day": str, "Fixture": str})
+    assert Written["Day"].tolist() == Profile["Day"].tolist()
+    assert Written["Fixture"].tolist() == Profile["Fixture"].tolist()
+    assert np.array_equal(Written["Duration (min)"], Profile["Duration (min)"])
+
+
+def test_Output_Does_Not_Depend_On_Chunk_Size(tmp_path):
+    # Object columns are typed once from the whole data frame, so every chunk size writes the same file
+    Profile = pd.DataFrame(
+        {
+            "Day": ["1D0", "1D0", "1E1", "1E1", "1H2"],
+            "Volume (gal)": pd.Series([0.1, 0.25, 1.0, 2.5, 3.75], dtype=object),
+        }
+    )
+    Paths = []
+    for Chunk_Size in [1, 2, 3, 100]:
+        Paths.append(str(tmp_path / "Chunk_{}.csv".format(Chunk_Size)))
+        Fast_CSV_Writer.Write_CSV(Profile, Paths[-1], Chunk_Size=Chunk_Size)
+
+    Expected = Profile.infer_objects().to_csv(index=False, lineterminator="\n")
+    for Path in Paths:
+        with open(Path) as File:
+            assert File.read() == Expected